@@ -0,0 +1,89 @@
+"""
+Benchmark of the construction time and memory of the descriptors.
+
+Run from the root of the repository::
+
+    python benchmarks/descriptor.py
+"""
+
+# Standard library modules.
+import argparse
+import timeit
+import tracemalloc
+
+# Third party modules.
+import tabulate
+
+# Local modules.
+from pyxray.descriptor import Element, AtomicSubshell, XrayTransition
+
+# Globals and constants variables.
+K = AtomicSubshell(1, 0, 1)
+L3 = AtomicSubshell(2, 1, 3)
+
+CONSTRUCTIONS = [
+    ("Element", Element, (26,)),
+    ("AtomicSubshell", AtomicSubshell, (2, 1, 3)),
+    ("XrayTransition", XrayTransition, (2, 1, 3, 1, 0, 1)),
+    ("XrayTransition", XrayTransition, (L3, K)),
+]
+
+
+def measure(func, number):
+    # Warm up, e.g. interned instance
+    func()
+
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def measure_memory(func, count):
+    tracemalloc.start()
+    try:
+        objs = [func(i) for i in range(count)]
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del objs
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "-n", "--number", type=int, default=100000, help="number of calls"
+    )
+    args = parser.parse_args()
+
+    rows = []
+    for name, clasz, clasz_args in CONSTRUCTIONS:
+        constructor_s = measure(lambda: clasz(*clasz_args), args.number)
+        of_s = measure(lambda: clasz.of(*clasz_args), args.number)
+        rows.append(
+            ["{}{!r}".format(name, clasz_args), constructor_s * 1e6, of_s * 1e6]
+        )
+
+    transition = XrayTransition(L3, K)
+    accessor_s = measure(lambda: transition.source_subshell, args.number)
+    rows.append(["XrayTransition.source_subshell", accessor_s * 1e6, None])
+
+    header = ["Construction", "constructor (us)", "of (us)"]
+    print(tabulate.tabulate(rows, header, floatfmt=".2f"))
+    print()
+
+    # Distinct objects, as many lookup results are
+    constructor_bytes = measure_memory(
+        lambda i: XrayTransition(2, 1, 3, 1, 0, 1), args.number
+    )
+    of_bytes = measure_memory(
+        lambda i: XrayTransition.of(2, 1, 3, 1, 0, 1), args.number
+    )
+    rows = [["XrayTransition", constructor_bytes, of_bytes]]
+
+    header = ["Memory", "constructor (bytes/obj)", "of (bytes/obj)"]
+    print(tabulate.tabulate(rows, header, floatfmt=".0f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark of the parser of the Evaluated Atomic Data Library (EADL).
+
+Run from the root of the repository with a local copy of ``eadl.all``::
+
+    python benchmarks/eadl.py eadl.all
+
+Without argument, the file is fetched (see :mod:`pyxray.parser.fetch`).
+"""
+
+# Standard library modules.
+import argparse
+import os
+import tempfile
+import timeit
+
+# Third party modules.
+import tabulate
+
+# Local modules.
+from pyxray.parser.fetch import fetch
+from pyxray.parser.perkins1991 import (
+    Perkins1991Parser,
+    EADL_URL,
+    FIELD_WIDTH,
+    REACTION_DESCRIPTOR_TRANSITION,
+    REACTION_PROPERTY_NONRADIATIVE_PROBABILITY,
+    float_,
+    parse_fields,
+)
+
+# Globals and constants variables.
+
+
+def measure(func, repeat):
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=1))
+
+
+def read_data_lines(parser):
+    """
+    Returns the data lines of the blocks parsed by the parser,
+    grouped by number of fields.
+    """
+    lines = {}
+
+    with open(parser.filepath, "rb") as fp:
+        buffer = fp.read()
+
+    for block in parser._iter_blocks(buffer):
+        header0, header1, data = block.split(b"\n", 2)
+        descriptor = int(header1[0:2])
+        key = (descriptor, int(header1[2:5]), int(header1[5:8]), int(header0[10:12]))
+        if key not in parser.HANDLERS:
+            continue
+
+        if key[1] == REACTION_PROPERTY_NONRADIATIVE_PROBABILITY:
+            ncolumn = 4
+        elif descriptor == REACTION_DESCRIPTOR_TRANSITION:
+            ncolumn = 3
+        else:
+            ncolumn = 2
+        lines.setdefault(ncolumn, []).extend(data.splitlines())
+
+    return lines
+
+
+def parse_fields_one_by_one(lines, ncolumn):
+    width = FIELD_WIDTH * ncolumn
+    return [
+        [
+            float_(line[i : i + FIELD_WIDTH].decode("ascii"))
+            for i in range(0, width, FIELD_WIDTH)
+        ]
+        for line in lines
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("filepath", nargs="?", help="path of eadl.all")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="number of repetitions"
+    )
+    args = parser.parse_args()
+
+    filepath = args.filepath
+    if filepath is None:
+        fd, filepath = tempfile.mkstemp(suffix=".all")
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(fetch(EADL_URL, verify=False))
+
+    eadl_parser = Perkins1991Parser(filepath)
+    nprop = sum(1 for _ in eadl_parser)
+    lines = read_data_lines(eadl_parser)
+    nfield = sum(ncolumn * len(lines[ncolumn]) for ncolumn in lines)
+
+    rows = [
+        [
+            "parse file ({} properties)".format(nprop),
+            measure(lambda: list(eadl_parser), args.repeat),
+        ],
+        [
+            "numeric fields in bulk ({} fields)".format(nfield),
+            measure(
+                lambda: [parse_fields(lines[n], n) for n in lines],
+                args.repeat,
+            ),
+        ],
+        [
+            "numeric fields one by one ({} fields)".format(nfield),
+            measure(
+                lambda: [parse_fields_one_by_one(lines[n], n) for n in lines],
+                args.repeat,
+            ),
+        ],
+    ]
+
+    print("File: {} ({:.1f} MB)".format(filepath, os.path.getsize(filepath) / 1e6))
+    print(tabulate.tabulate(rows, headers=["Step", "Time (s)"], floatfmt=".3f"))
+
+    if args.filepath is None:
+        os.remove(filepath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark of the per-call latency of database lookups.
+
+Run from the root of the repository, once the database is built::
+
+    python benchmarks/lookup.py
+"""
+
+# Standard library modules.
+import argparse
+import timeit
+
+# Third party modules.
+import tabulate
+
+# Local modules.
+import pyxray
+from pyxray.base import NotFound
+from pyxray.sql.data import SqlDatabase
+from pyxray.sql.memory import MemoryDatabase
+from pyxray.cache import CachedDatabase
+
+# Globals and constants variables.
+LOOKUPS = [
+    ("element_atomic_weight", (26,)),
+    ("element_atomic_weight", ("Fe",)),
+    ("element_symbol", (26,)),
+    ("atomic_subshell_binding_energy_eV", (26, (1, 0, 1))),
+    ("atomic_subshell_binding_energy_eV", (26, "K")),
+    ("xray_transition_energy_eV", (26, ((2, 1, 3), (1, 0, 1)))),
+    ("xray_transition_energy_eV", (26, "Ka1")),
+    ("xray_transition_energy_eV", ("Fe", "Ka1")),
+    ("xray_transition_energy_eV", (26, "Ka1", "dtsa1992")),
+    ("xray_transition_relative_weight", (26, "Ka1")),
+    ("element_xray_transitions", (26,)),
+]
+
+
+def create_databases():
+    engine = pyxray.data.database.engine
+    return [
+        ("sql", SqlDatabase(engine)),
+        ("memory", MemoryDatabase(engine)),
+        ("cached sql", CachedDatabase(SqlDatabase(engine))),
+    ]
+
+
+def measure(func, args, number):
+    """
+    Returns the duration of one call, ``None`` if the lookup is not found
+    (e.g. reference missing from the database).
+    """
+    # Warm up, e.g. statement cache
+    try:
+        func(*args)
+    except NotFound:
+        return None
+
+    timer = timeit.Timer(lambda: func(*args))
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "-n", "--number", type=int, default=200, help="number of calls per lookup"
+    )
+    args = parser.parse_args()
+
+    databases = create_databases()
+
+    rows = []
+    for method, method_args in LOOKUPS:
+        row = ["{}{!r}".format(method, method_args)]
+        for _name, database in databases:
+            duration_s = measure(getattr(database, method), method_args, args.number)
+            row.append(None if duration_s is None else duration_s * 1e6)
+        rows.append(row)
+
+    header = ["Lookup"] + ["{} (us)".format(name) for name, _ in databases]
+    print(tabulate.tabulate(rows, header, floatfmt=".1f", missingval="n/a"))
+
+
+if __name__ == "__main__":
+    main()
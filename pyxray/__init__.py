@@ -2,12 +2,18 @@
 pyxray - Definitions and properties of X-ray transitions
 """
 
-from ._version import get_versions
-
-__version__ = get_versions()["version"]
-del get_versions
-
 from pyxray.base import NotFound
 from pyxray.descriptor import *
 from pyxray.data import *
 from pyxray.composition import *
+
+
+def __getattr__(name):
+    # The version is only computed when requested, since it may have to
+    # query git in a development checkout
+    if name == "__version__":
+        from ._version import get_versions
+
+        return get_versions()["version"]
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -4,11 +4,13 @@ Base database
 
 # Standard library modules.
 import abc
+import dataclasses
 import sys
 import operator
+import numbers
+from collections.abc import Sequence
 
 # Third party modules.
-import tabulate
 
 # Local modules.
 from pyxray.cbook import formatdoc
@@ -21,6 +23,16 @@ class NotFound(Exception):
     pass
 
 
+def _freeze(value):
+    """
+    Returns the value with its lists converted to tuples, recursively, so that
+    it can be a key of a :class:`dict` (e.g. ``[[2, 1, 3], [1, 0, 1]]``).
+    """
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 _docextras = {
     "element": """:arg element: either
             * :class:`Element <pyxray.descriptor.Element>` object
@@ -41,6 +53,9 @@ _docextras = {
             * :class:`XrayTransition <pyxray.descriptor.XrayTransition>` object
             * a :class:`tuple` of source and destination subshells
             * any notation (case insensitive)""",
+    "nonradiative_transition": """:arg nonradiative_transition: either
+            * :class:`NonRadiativeTransition <pyxray.descriptor.NonRadiativeTransition>` object
+            * a :class:`tuple` of source, destination and secondary destination subshells""",
     "language": """:arg language: language code (e.g. ``en``, ``fr``, ``de``)""",
     "notation": """:arg notation: name of a notation (case insensitive),
                 ``iupac``, ``siegbahn`` and ``orbital`` are usually supported""",
@@ -51,10 +66,83 @@ _docextras = {
             * BibTeX key of a reference
             * ``None``, the default reference will be used or the first reference found""",
     "exception": """:raise NotFound:""",
+    "elements": """:arg elements: sequence of elements, each one either
+            * :class:`Element <pyxray.descriptor.Element>` object
+            * atomic number
+            * symbol or name""",
+    "atomic_subshells": """:arg atomic_subshells: sequence of atomic subshells, one for each element,
+            each one either
+            * :class:`AtomicSubshell <pyxray.descriptor.AtomicSubshell>` object
+            * a :class:`tuple` of quantum numbers
+            * any notation""",
+    "xray_transitions": """:arg xray_transitions: sequence of X-ray transitions, one for each element,
+            each one either
+            * :class:`XrayTransition <pyxray.descriptor.XrayTransition>` object
+            * a :class:`tuple` of source and destination subshells
+            * any notation""",
+    "values": """:return: values aligned with the input sequences,
+            ``nan`` where no value is found
+        :rtype: :class:`numpy.ndarray`
+        :raise ValueError: if the input sequences do not have the same length""",
 }
 
 
 class _DatabaseMixin(metaclass=abc.ABCMeta):
+    def _expand_atomic_subshell(self, atomic_subshell):
+        if (
+            hasattr(atomic_subshell, "principal_quantum_number")
+            and hasattr(atomic_subshell, "azimuthal_quantum_number")
+            and hasattr(atomic_subshell, "total_angular_momentum_nominator")
+        ):
+            n = atomic_subshell.atomic_shell.principal_quantum_number
+            l = atomic_subshell.azimuthal_quantum_number
+            j_n = atomic_subshell.total_angular_momentum_nominator
+
+        elif isinstance(atomic_subshell, Sequence) and len(atomic_subshell) == 3:
+            n = atomic_subshell[0]
+            l = atomic_subshell[1]
+            j_n = atomic_subshell[2]
+
+        else:
+            raise NotFound("Cannot parse atomic subshell: {}".format(atomic_subshell))
+
+        return n, l, j_n
+
+    def _expand_xray_transition(self, xray_transition):
+        if isinstance(xray_transition, descriptor.XrayTransition):
+            src_n = xray_transition.source_principal_quantum_number
+            src_l = xray_transition.source_azimuthal_quantum_number
+            src_j_n = xray_transition.source_total_angular_momentum_nominator
+            dst_n = xray_transition.destination_principal_quantum_number
+            dst_l = xray_transition.destination_azimuthal_quantum_number
+            dst_j_n = xray_transition.destination_total_angular_momentum_nominator
+
+        elif isinstance(xray_transition, Sequence) and len(xray_transition) >= 2:
+            src_n, src_l, src_j_n = self._expand_atomic_subshell(xray_transition[0])
+            dst_n, dst_l, dst_j_n = self._expand_atomic_subshell(xray_transition[1])
+
+        else:
+            raise NotFound("Cannot parse X-ray transition: {}".format(xray_transition))
+
+        return src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n
+
+    def _expand_nonradiative_transition(self, nonradiative_transition):
+        if isinstance(nonradiative_transition, descriptor.NonRadiativeTransition):
+            return dataclasses.astuple(nonradiative_transition)
+
+        elif (
+            isinstance(nonradiative_transition, Sequence)
+            and len(nonradiative_transition) == 3
+        ):
+            return sum(map(self._expand_atomic_subshell, nonradiative_transition), ())
+
+        else:
+            raise NotFound(
+                "Cannot parse non-radiative transition: {}".format(
+                    nonradiative_transition
+                )
+            )
+
     @abc.abstractmethod
     @formatdoc(**_docextras)
     def element(self, element):  # pragma: no cover
@@ -251,6 +339,9 @@ class _DatabaseMixin(metaclass=abc.ABCMeta):
 
         if tabulate_kwargs is None:
             tabulate_kwargs = {}
+
+        import tabulate
+
         file.write(tabulate.tabulate(rows, header, **tabulate_kwargs))
 
     @abc.abstractmethod
@@ -478,6 +569,44 @@ class _DatabaseMixin(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    @formatdoc(**_docextras)
+    def nonradiative_transition_energy_eV(
+        self, element, nonradiative_transition, reference=None
+    ):  # pragma: no cover
+        """
+        Returns energy of the electron ejected by a non-radiative
+        (Auger or Coster-Kronig) transition of an element (in eV).
+
+        {element}
+        {nonradiative_transition}
+        {reference}
+
+        :return: energy (in eV)
+        :rtype: :class:`float`
+        {exception}
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    @formatdoc(**_docextras)
+    def nonradiative_transition_probability(
+        self, element, nonradiative_transition, reference=None
+    ):  # pragma: no cover
+        """
+        Returns probability of a non-radiative (Auger or Coster-Kronig)
+        transition of an element.
+
+        {element}
+        {nonradiative_transition}
+        {reference}
+
+        :return: probability
+        :rtype: :class:`float`
+        {exception}
+        """
+        raise NotImplementedError
+
     @formatdoc(**_docextras)
     def xray_line(self, element, xray_transition):
         """
@@ -530,3 +659,295 @@ class _DatabaseMixin(metaclass=abc.ABCMeta):
             probability,
             relative_weight,
         )
+
+    @formatdoc(**_docextras)
+    def element_table(self, reference=None):
+        """
+        Returns the table of the atomic weights and symbols of all elements.
+        The table is created on the first call for a reference and then kept,
+        so it is discarded with the database, e.g. when another database is
+        selected with :func:`set_database <pyxray.data.set_database>`.
+
+        {reference}
+
+        :rtype: :class:`ElementTable <pyxray.elementtable.ElementTable>`
+        """
+        from pyxray.elementtable import ElementTable
+
+        if isinstance(reference, descriptor.Reference):
+            reference = reference.bibtexkey
+        if reference:
+            reference = reference.lower()
+
+        tables = self.__dict__.setdefault("_element_tables", {})
+        table = tables.get(reference)
+        if table is None:
+            table = tables[reference] = ElementTable.from_database(self, reference)
+
+        return table
+
+    @formatdoc(**_docextras)
+    def xray_line_index(self, reference=None):
+        """
+        Returns the index of the X-ray lines of all elements, sorted by energy.
+        The index is created on the first call for a reference and then kept.
+
+        {reference}
+
+        :rtype: :class:`XrayLineIndex <pyxray.lineindex.XrayLineIndex>`
+        """
+        from pyxray.lineindex import XrayLineIndex
+
+        if isinstance(reference, descriptor.Reference):
+            reference = reference.bibtexkey
+        if reference:
+            reference = reference.lower()
+
+        indexes = self.__dict__.setdefault("_xray_line_indexes", {})
+        index = indexes.get(reference)
+        if index is None:
+            index = indexes[reference] = XrayLineIndex.from_database(self, reference)
+
+        return index
+
+    @formatdoc(**_docextras)
+    def xray_lines_in_energy_range(
+        self, emin_eV, emax_eV, elements=None, reference=None, min_probability=0.0
+    ):
+        """
+        Returns the X-ray lines with an energy between *emin_eV* and *emax_eV*
+        (inclusive), sorted by energy.
+        The lines are found by bisection in the index of all X-ray lines
+        (see :meth:`xray_line_index`).
+
+        Examples::
+
+            # Lines within 20 eV of a peak at 1740 eV
+            pyxray.xray_lines_in_energy_range(1720, 1760, ["Si", "Ta", "W"])
+
+        :arg emin_eV: minimum energy (in eV)
+        :arg emax_eV: maximum energy (in eV)
+        :arg elements: sequence of elements, each one either
+            an :class:`Element <pyxray.descriptor.Element>` object, an atomic
+            number, a symbol or a name.
+            If ``None``, the lines of all elements are returned.
+        {reference}
+        :arg min_probability: minimum probability of the lines.
+            If greater than 0, lines without probability are excluded.
+
+        :return: X-ray lines
+        :rtype: :class:`list` of :class:`XrayLine <pyxray.descriptor.XrayLine>`
+        """
+        from pyxray.lineindex import resolve_atomic_numbers
+
+        atomic_numbers = None
+        if elements is not None:
+            atomic_numbers = resolve_atomic_numbers(self, elements)
+
+        return self.xray_line_index(reference).find(
+            emin_eV, emax_eV, atomic_numbers, min_probability
+        )
+
+    @formatdoc(**_docextras)
+    def identify_peaks(
+        self, energies_eV, tolerance_eV, elements=None, k=5, reference=None
+    ):
+        """
+        Returns the candidate X-ray lines of measured peaks, i.e. the *k* lines
+        nearest to each peak energy within *tolerance_eV*.
+        The candidates of each peak are ranked by energy distance, then by
+        decreasing relative weight.
+        Transition sets (e.g. Kα) are excluded, as their lines are candidates.
+
+        All peaks are searched at once in the index of all X-ray lines
+        (see :meth:`XrayLineIndex.nearest <pyxray.lineindex.XrayLineIndex.nearest>`,
+        which returns the positions of the candidates as an array).
+
+        Examples::
+
+            pyxray.identify_peaks([1740.0, 6400.0], 10.0, k=3)
+
+        :arg energies_eV: sequence of peak energies (in eV)
+        :arg tolerance_eV: maximum distance between a peak and its candidates
+            (in eV)
+        :arg elements: sequence of elements, each one either
+            an :class:`Element <pyxray.descriptor.Element>` object, an atomic
+            number, a symbol or a name.
+            If ``None``, the lines of all elements are candidates.
+        :arg k: maximum number of candidates per peak
+        {reference}
+
+        :return: candidates of each peak
+        :rtype: :class:`list` of :class:`list` of :class:`XrayLine <pyxray.descriptor.XrayLine>`
+        """
+        from pyxray.lineindex import resolve_atomic_numbers
+
+        atomic_numbers = None
+        if elements is not None:
+            atomic_numbers = resolve_atomic_numbers(self, elements)
+
+        index = self.xray_line_index(reference)
+        candidates = index.nearest(energies_eV, tolerance_eV, atomic_numbers, k)
+
+        xraylines = index.xraylines
+        return [
+            [xraylines[position] for position in positions if position >= 0]
+            for positions in candidates.tolist()
+        ]
+
+    def _check_same_length(self, elements, others):
+        if others is not None and len(elements) != len(others):
+            raise ValueError(
+                "Sequences must have the same length: {} != {}".format(
+                    len(elements), len(others)
+                )
+            )
+
+    def _lookup_many(self, method, elements, others=None, reference=None):
+        """
+        Calls *method* for each element (and each item of *others*)
+        and returns the values in an array, ``nan`` where no value is found.
+        """
+        # NumPy is only imported when needed to keep "import pyxray" fast
+        import numpy
+
+        self._check_same_length(elements, others)
+
+        values = numpy.full(len(elements), numpy.nan)
+
+        for index, element in enumerate(elements):
+            # Atomic numbers may come from a NumPy array
+            if isinstance(element, numbers.Integral):
+                element = int(element)
+
+            args = (element,) if others is None else (element, others[index])
+            try:
+                values[index] = method(*args, reference=reference)
+            except NotFound:
+                pass
+
+        return values
+
+    @formatdoc(**_docextras)
+    def element_atomic_weights(self, elements, reference=None):
+        """
+        Returns atomic weights of many elements.
+
+        {elements}
+        {reference}
+
+        {values}
+        """
+        return self._lookup_many(
+            self.element_atomic_weight, elements, reference=reference
+        )
+
+    @formatdoc(**_docextras)
+    def atomic_subshell_binding_energies_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        """
+        Returns binding energies (in eV) of many pairs of element and
+        atomic subshell.
+
+        {elements}
+        {atomic_subshells}
+        {reference}
+
+        {values}
+        """
+        return self._lookup_many(
+            self.atomic_subshell_binding_energy_eV,
+            elements,
+            atomic_subshells,
+            reference,
+        )
+
+    @formatdoc(**_docextras)
+    def atomic_subshell_radiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        """
+        Returns radiative widths (in eV) of many pairs of element and
+        atomic subshell.
+
+        {elements}
+        {atomic_subshells}
+        {reference}
+
+        {values}
+        """
+        return self._lookup_many(
+            self.atomic_subshell_radiative_width_eV,
+            elements,
+            atomic_subshells,
+            reference,
+        )
+
+    @formatdoc(**_docextras)
+    def atomic_subshell_nonradiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        """
+        Returns nonradiative widths (in eV) of many pairs of element and
+        atomic subshell.
+
+        {elements}
+        {atomic_subshells}
+        {reference}
+
+        {values}
+        """
+        return self._lookup_many(
+            self.atomic_subshell_nonradiative_width_eV,
+            elements,
+            atomic_subshells,
+            reference,
+        )
+
+    @formatdoc(**_docextras)
+    def xray_transition_energies_eV(self, elements, xray_transitions, reference=None):
+        """
+        Returns energies (in eV) of many pairs of element and X-ray transition.
+
+        {elements}
+        {xray_transitions}
+        {reference}
+
+        {values}
+        """
+        return self._lookup_many(
+            self.xray_transition_energy_eV, elements, xray_transitions, reference
+        )
+
+    @formatdoc(**_docextras)
+    def xray_transition_probabilities(self, elements, xray_transitions, reference=None):
+        """
+        Returns probabilities of many pairs of element and X-ray transition.
+
+        {elements}
+        {xray_transitions}
+        {reference}
+
+        {values}
+        """
+        return self._lookup_many(
+            self.xray_transition_probability, elements, xray_transitions, reference
+        )
+
+    @formatdoc(**_docextras)
+    def xray_transition_relative_weights(
+        self, elements, xray_transitions, reference=None
+    ):
+        """
+        Returns relative weights of many pairs of element and X-ray transition.
+
+        {elements}
+        {xray_transitions}
+        {reference}
+
+        {values}
+        """
+        return self._lookup_many(
+            self.xray_transition_relative_weight, elements, xray_transitions, reference
+        )
@@ -0,0 +1,499 @@
+"""
+Database wrapper caching the results of another database.
+"""
+
+__all__ = ["CachedDatabase", "CacheInfo"]
+
+# Standard library modules.
+import collections
+import threading
+
+# Third party modules.
+
+# Local modules.
+from pyxray.base import _DatabaseMixin, NotFound
+import pyxray.descriptor as descriptor
+
+# Globals and constants variables.
+DEFAULT_MAXSIZE = 16384
+
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+_MISSING = object()
+
+
+class CachedDatabase(_DatabaseMixin):
+    """
+    Database which caches the results of another database in a least
+    recently used (LRU) cache.
+
+    The arguments are normalized before being used as key of the cache,
+    so that equivalent arguments share the same entry, e.g.
+    ``Element(26)``, ``26`` and ``"Fe"`` for an element or
+    ``AtomicSubshell(1, 0, 1)``, ``(1, 0, 1)`` and ``"K"`` for an atomic subshell.
+    :class:`NotFound <pyxray.base.NotFound>` results are also cached.
+
+    Example::
+
+        import pyxray
+        from pyxray.cache import CachedDatabase
+
+        pyxray.set_database(CachedDatabase(pyxray.database))
+
+    :arg database: database to cache
+    :arg maxsize: maximum number of entries in the cache.
+        If ``None``, the cache can grow without bound.
+    """
+
+    def __init__(self, database, maxsize=DEFAULT_MAXSIZE):
+        self.database = database
+        self.maxsize = maxsize
+
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def cache_info(self):
+        """
+        Returns the statistics of the cache.
+
+        :rtype: :class:`CacheInfo`
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._cache),
+            )
+
+    def cache_clear(self):
+        """
+        Clears the cache and its statistics.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _lookup(self, key, func, *args):
+        with self._lock:
+            result = self._cache.get(key, _MISSING)
+            if result is _MISSING:
+                self._misses += 1
+            else:
+                self._cache.move_to_end(key)
+                self._hits += 1
+
+        if result is _MISSING:
+            try:
+                result = func(*args)
+            except NotFound as ex:
+                result = ex
+
+            with self._lock:
+                self._cache[key] = result
+                if self.maxsize is not None and len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+                    self._evictions += 1
+
+        if isinstance(result, NotFound):
+            raise NotFound(*result.args)
+
+        return result
+
+    def _normalize_element(self, element):
+        if hasattr(element, "atomic_number"):
+            element = element.atomic_number
+
+        if isinstance(element, str):
+            return self._lookup(
+                ("element", element), self.database.element_atomic_number, element
+            )
+
+        elif isinstance(element, int):
+            return element
+
+        else:
+            raise NotFound("Cannot parse element: {}".format(element))
+
+    def _normalize_atomic_shell(self, atomic_shell):
+        if hasattr(atomic_shell, "principal_quantum_number"):
+            atomic_shell = atomic_shell.principal_quantum_number
+
+        if isinstance(atomic_shell, str):
+            return self._lookup(
+                ("atomic_shell", atomic_shell),
+                self.database.atomic_shell,
+                atomic_shell,
+            ).principal_quantum_number
+
+        elif isinstance(atomic_shell, int):
+            return atomic_shell
+
+        else:
+            raise NotFound("Cannot parse atomic shell: {}".format(atomic_shell))
+
+    def _normalize_atomic_subshell(self, atomic_subshell):
+        if isinstance(atomic_subshell, str):
+            atomic_subshell = self._lookup(
+                ("atomic_subshell", atomic_subshell),
+                self.database.atomic_subshell,
+                atomic_subshell,
+            )
+
+        return self._expand_atomic_subshell(atomic_subshell)
+
+    def _normalize_xray_transition(self, xray_transition):
+        if isinstance(xray_transition, str):
+            xray_transition = self._lookup(
+                ("xray_transition", xray_transition),
+                self.database.xray_transition,
+                xray_transition,
+            )
+
+        src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n = self._expand_xray_transition(
+            xray_transition
+        )
+        return (src_n, src_l, src_j_n), (dst_n, dst_l, dst_j_n)
+
+    def _normalize_nonradiative_transition(self, nonradiative_transition):
+        quantum_numbers = self._expand_nonradiative_transition(nonradiative_transition)
+        return quantum_numbers[0:3], quantum_numbers[3:6], quantum_numbers[6:9]
+
+    def _normalize_reference(self, reference):
+        if isinstance(reference, descriptor.Reference):
+            reference = reference.bibtexkey
+        if reference:
+            reference = reference.lower()
+        return reference
+
+    def _normalize_key(self, value):
+        if isinstance(value, (descriptor.Language, descriptor.Notation)):
+            value = value.key
+        return value.lower()
+
+    def element(self, element):
+        z = self.element_atomic_number(element)
+        return descriptor.Element.of(z)
+
+    def element_atomic_number(self, element):
+        z = self._normalize_element(element)
+        return self._lookup(
+            ("element_atomic_number", z), self.database.element_atomic_number, z
+        )
+
+    def element_symbol(self, element, reference=None):
+        z = self._normalize_element(element)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("element_symbol", z, reference),
+            self.database.element_symbol,
+            z,
+            reference,
+        )
+
+    def element_name(self, element, language="en", reference=None):
+        z = self._normalize_element(element)
+        language = self._normalize_key(language)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("element_name", z, language, reference),
+            self.database.element_name,
+            z,
+            language,
+            reference,
+        )
+
+    def element_atomic_weight(self, element, reference=None):
+        z = self._normalize_element(element)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("element_atomic_weight", z, reference),
+            self.database.element_atomic_weight,
+            z,
+            reference,
+        )
+
+    def element_mass_density_kg_per_m3(self, element, reference=None):
+        z = self._normalize_element(element)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("element_mass_density_kg_per_m3", z, reference),
+            self.database.element_mass_density_kg_per_m3,
+            z,
+            reference,
+        )
+
+    def element_xray_transitions(self, element, xray_transition=None, reference=None):
+        z = self._normalize_element(element)
+        reference = self._normalize_reference(reference)
+
+        # A notation only matches its own x-ray transition whereas
+        # an x-ray transition with undefined quantum numbers matches all
+        # x-ray transitions with these quantum numbers defined.
+        # The notation can therefore not be normalized.
+        if xray_transition is not None and not isinstance(xray_transition, str):
+            xray_transition = self._normalize_xray_transition(xray_transition)
+
+        return self._lookup(
+            ("element_xray_transitions", z, xray_transition, reference),
+            self.database.element_xray_transitions,
+            z,
+            xray_transition,
+            reference,
+        )
+
+    def element_xray_transition(self, element, xray_transition, reference=None):
+        z = self._normalize_element(element)
+        xray_transition = self._normalize_xray_transition(xray_transition)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("element_xray_transition", z, xray_transition, reference),
+            self.database.element_xray_transition,
+            z,
+            xray_transition,
+            reference,
+        )
+
+    def atomic_shell(self, atomic_shell):
+        n = self._normalize_atomic_shell(atomic_shell)
+        return self._lookup(("atomic_shell", n), self.database.atomic_shell, n)
+
+    def atomic_shell_notation(
+        self, atomic_shell, notation, encoding="utf16", reference=None
+    ):
+        n = self._normalize_atomic_shell(atomic_shell)
+        notation = self._normalize_key(notation)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("atomic_shell_notation", n, notation, encoding, reference),
+            self.database.atomic_shell_notation,
+            n,
+            notation,
+            encoding,
+            reference,
+        )
+
+    def atomic_subshell(self, atomic_subshell):
+        key = self._normalize_atomic_subshell(atomic_subshell)
+        return self._lookup(
+            ("atomic_subshell", key), self.database.atomic_subshell, key
+        )
+
+    def atomic_subshell_notation(
+        self, atomic_subshell, notation, encoding="utf16", reference=None
+    ):
+        key = self._normalize_atomic_subshell(atomic_subshell)
+        notation = self._normalize_key(notation)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("atomic_subshell_notation", key, notation, encoding, reference),
+            self.database.atomic_subshell_notation,
+            key,
+            notation,
+            encoding,
+            reference,
+        )
+
+    def atomic_subshell_binding_energy_eV(
+        self, element, atomic_subshell, reference=None
+    ):
+        z = self._normalize_element(element)
+        key = self._normalize_atomic_subshell(atomic_subshell)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("atomic_subshell_binding_energy_eV", z, key, reference),
+            self.database.atomic_subshell_binding_energy_eV,
+            z,
+            key,
+            reference,
+        )
+
+    def atomic_subshell_radiative_width_eV(
+        self, element, atomic_subshell, reference=None
+    ):
+        z = self._normalize_element(element)
+        key = self._normalize_atomic_subshell(atomic_subshell)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("atomic_subshell_radiative_width_eV", z, key, reference),
+            self.database.atomic_subshell_radiative_width_eV,
+            z,
+            key,
+            reference,
+        )
+
+    def atomic_subshell_nonradiative_width_eV(
+        self, element, atomic_subshell, reference=None
+    ):
+        z = self._normalize_element(element)
+        key = self._normalize_atomic_subshell(atomic_subshell)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("atomic_subshell_nonradiative_width_eV", z, key, reference),
+            self.database.atomic_subshell_nonradiative_width_eV,
+            z,
+            key,
+            reference,
+        )
+
+    def atomic_subshell_occupancy(self, element, atomic_subshell, reference=None):
+        z = self._normalize_element(element)
+        key = self._normalize_atomic_subshell(atomic_subshell)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("atomic_subshell_occupancy", z, key, reference),
+            self.database.atomic_subshell_occupancy,
+            z,
+            key,
+            reference,
+        )
+
+    def xray_transition(self, xray_transition):
+        key = self._normalize_xray_transition(xray_transition)
+        return self._lookup(
+            ("xray_transition", key), self.database.xray_transition, key
+        )
+
+    def xray_transition_notation(
+        self, xray_transition, notation, encoding="utf16", reference=None
+    ):
+        key = self._normalize_xray_transition(xray_transition)
+        notation = self._normalize_key(notation)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("xray_transition_notation", key, notation, encoding, reference),
+            self.database.xray_transition_notation,
+            key,
+            notation,
+            encoding,
+            reference,
+        )
+
+    def xray_transition_energy_eV(self, element, xray_transition, reference=None):
+        z = self._normalize_element(element)
+        key = self._normalize_xray_transition(xray_transition)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("xray_transition_energy_eV", z, key, reference),
+            self.database.xray_transition_energy_eV,
+            z,
+            key,
+            reference,
+        )
+
+    def xray_transition_probability(self, element, xray_transition, reference=None):
+        z = self._normalize_element(element)
+        key = self._normalize_xray_transition(xray_transition)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("xray_transition_probability", z, key, reference),
+            self.database.xray_transition_probability,
+            z,
+            key,
+            reference,
+        )
+
+    def xray_transition_relative_weight(self, element, xray_transition, reference=None):
+        z = self._normalize_element(element)
+        key = self._normalize_xray_transition(xray_transition)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("xray_transition_relative_weight", z, key, reference),
+            self.database.xray_transition_relative_weight,
+            z,
+            key,
+            reference,
+        )
+
+    def nonradiative_transition_energy_eV(
+        self, element, nonradiative_transition, reference=None
+    ):
+        z = self._normalize_element(element)
+        key = self._normalize_nonradiative_transition(nonradiative_transition)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("nonradiative_transition_energy_eV", z, key, reference),
+            self.database.nonradiative_transition_energy_eV,
+            z,
+            key,
+            reference,
+        )
+
+    def nonradiative_transition_probability(
+        self, element, nonradiative_transition, reference=None
+    ):
+        z = self._normalize_element(element)
+        key = self._normalize_nonradiative_transition(nonradiative_transition)
+        reference = self._normalize_reference(reference)
+        return self._lookup(
+            ("nonradiative_transition_probability", z, key, reference),
+            self.database.nonradiative_transition_probability,
+            z,
+            key,
+            reference,
+        )
+
+    def xray_line(self, element, xray_transition):
+        z = self._normalize_element(element)
+        key = self._normalize_xray_transition(xray_transition)
+        return self._lookup(("xray_line", z, key), super().xray_line, z, key)
+
+    def element_table(self, reference=None):
+        # The table is kept by the wrapped database
+        return self.database.element_table(reference)
+
+    def xray_line_index(self, reference=None):
+        # The index is kept by the wrapped database
+        return self.database.xray_line_index(reference)
+
+    # Bulk lookups are delegated to the wrapped database, which can look up
+    # all the values at once, e.g. in a single query.
+
+    def element_atomic_weights(self, elements, reference=None):
+        return self.database.element_atomic_weights(elements, reference)
+
+    def atomic_subshell_binding_energies_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self.database.atomic_subshell_binding_energies_eV(
+            elements, atomic_subshells, reference
+        )
+
+    def atomic_subshell_radiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self.database.atomic_subshell_radiative_widths_eV(
+            elements, atomic_subshells, reference
+        )
+
+    def atomic_subshell_nonradiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self.database.atomic_subshell_nonradiative_widths_eV(
+            elements, atomic_subshells, reference
+        )
+
+    def xray_transition_energies_eV(self, elements, xray_transitions, reference=None):
+        return self.database.xray_transition_energies_eV(
+            elements, xray_transitions, reference
+        )
+
+    def xray_transition_probabilities(self, elements, xray_transitions, reference=None):
+        return self.database.xray_transition_probabilities(
+            elements, xray_transitions, reference
+        )
+
+    def xray_transition_relative_weights(
+        self, elements, xray_transitions, reference=None
+    ):
+        return self.database.xray_transition_relative_weights(
+            elements, xray_transitions, reference
+        )
@@ -34,6 +34,9 @@ class ProgressReportMixin(ProgressMixin):
             self._reporthooks = set()
         self._reporthooks.add(hook)
 
+    def remove_reporthook(self, hook):
+        getattr(self, "_reporthooks", set()).discard(hook)
+
     def clear_reporthooks(self):
         self._reporthooks = set()
 
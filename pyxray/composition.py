@@ -4,9 +4,11 @@ __all__ = ["Composition"]
 
 # Standard library modules.
 import math
+import numbers
 from types import MappingProxyType
 import itertools
 from fractions import Fraction
+import functools
 import re
 
 # Third party modules.
@@ -15,8 +17,38 @@ import pyxray
 # Local modules.
 
 # Globals and constants variables.
+#: Pattern of the element symbols and numbers of atoms of a simple chemical
+#: formula. Kept for backward compatibility: formulas are parsed with
+#: :func:`parse_formula`, which supports groups and hydrates.
 CHEMICAL_FORMULA_PATTERN = re.compile(r"([A-Z][a-z]?)([0-9\.]*)")
 
+FORMULA_TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<symbol>[A-Z][a-z]{0,2})"
+    r"|(?P<open>[(\[{])"
+    r"|(?P<close>[)\]}])"
+    r"|(?P<hydrate>[\u00b7\u2022\u2219*])"
+    r")"
+)
+FORMULA_NUMBER_PATTERN = re.compile(r"\s*(\d+(?:\.\d*)?|\.\d+)")
+#: Integer count followed by a dot used as hydrate separator, e.g. ``CuSO4.5H2O``
+FORMULA_HYDRATE_DOT_PATTERN = re.compile(r"\s*([1-9]\d*)\.(?=[1-9]\d*[A-Z(\[{])")
+FORMULA_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+#: Maximum number of formulas kept in the cache of
+#: :func:`convert_formula_to_atomic_fractions`
+FORMULA_CACHE_MAXSIZE = 16384
+
+
+def _get_element_table():
+    """
+    Returns the table of the atomic weights and symbols of the current
+    database.
+    The table is kept by the database, so it is replaced when another
+    database is selected.
+    """
+    return pyxray.data.database.element_table()
+
 
 def process_wildcard(fractions):
     """
@@ -51,10 +83,11 @@ def convert_mass_to_atomic_fractions(mass_fractions):
             The keys are atomic numbers and the values weight fractions.
             No wildcard are accepted.
     """
+    table = _get_element_table()
     atomic_fractions = {}
 
     for z, mass_fraction in mass_fractions.items():
-        atomic_fractions[z] = mass_fraction / pyxray.element_atomic_weight(z)
+        atomic_fractions[z] = mass_fraction / table.atomic_weight(z)
 
     total_fraction = sum(atomic_fractions.values())
 
@@ -77,11 +110,13 @@ def convert_atomic_to_mass_fractions(atomic_fractions):
             The keys are atomic numbers and the values atomic fractions.
             No wildcard are accepted.
     """
+    table = _get_element_table()
+
     # Calculate total atomic mass
     atomic_masses = {}
     total_atomic_mass = 0.0
     for z, atomic_fraction in atomic_fractions.items():
-        atomic_mass = pyxray.element_atomic_weight(z)
+        atomic_mass = table.atomic_weight(z)
         atomic_masses[z] = atomic_mass
         total_atomic_mass += atomic_fraction * atomic_mass
 
@@ -93,54 +128,250 @@ def convert_atomic_to_mass_fractions(atomic_fractions):
     return mass_fractions
 
 
-def convert_formula_to_atomic_fractions(formula):
+def _get_atomic_weights(zs):
     """
-    Converts a chemical formula to an atomic fraction :class:`dict`.
+    Returns the atomic weights of many elements in an array.
+    """
+    # NumPy is only imported when needed to keep "import pyxray" fast
+    import numpy
+
+    table = _get_element_table()
+    return numpy.array([table.atomic_weight(z) for z in zs], dtype=float)
+
+
+def _check_batch(zs, fractions):
+    import numpy
+
+    fractions = numpy.asarray(fractions, dtype=float)
+    if fractions.ndim != 2 or fractions.shape[1] != len(zs):
+        raise ValueError(
+            "Fractions must be a 2-D array with {} columns, not shape {}".format(
+                len(zs), fractions.shape
+            )
+        )
+
+    return fractions
+
+
+def _normalize_rows(values):
+    import numpy
+
+    totals = values.sum(axis=1, keepdims=True)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        fractions = values / totals
+    fractions[(totals == 0.0).ravel()] = 0.0
+    return fractions
+
+
+def convert_mass_to_atomic_fractions_batch(zs, mass_fractions):
+    """
+    Converts the mass fractions of many compositions to atomic fractions
+    at once.
+    The atomic weights of the elements are looked up once for all
+    compositions.
 
     Args:
-        formula (str): chemical formula, like Al2O3. No wildcard are accepted.
+        zs (sequence): atomic numbers of the elements, one per column of
+            *mass_fractions*
+        mass_fractions (array_like): 2-D array of mass fractions, with one
+            row per composition and one column per element.
+
+    Returns:
+        numpy.ndarray: atomic fractions, with the same shape as
+        *mass_fractions*. Rows without mass fraction are all 0.0.
     """
-    mole_fractions = {}
-    total_mole_fraction = 0.0
+    mass_fractions = _check_batch(zs, mass_fractions)
+    atomic_weights = _get_atomic_weights(zs)
+    return _normalize_rows(mass_fractions / atomic_weights)
 
-    for match in CHEMICAL_FORMULA_PATTERN.finditer(formula):
-        symbol, mole_fraction = match.groups()
 
-        z = pyxray.element_atomic_number(symbol.strip())
+def convert_atomic_to_mass_fractions_batch(zs, atomic_fractions):
+    """
+    Converts the atomic fractions of many compositions to mass fractions
+    at once.
+    The atomic weights of the elements are looked up once for all
+    compositions.
 
-        if mole_fraction == "":
-            mole_fraction = 1.0
-        mole_fraction = float(mole_fraction)
+    Args:
+        zs (sequence): atomic numbers of the elements, one per column of
+            *atomic_fractions*
+        atomic_fractions (array_like): 2-D array of atomic fractions, with one
+            row per composition and one column per element.
+
+    Returns:
+        numpy.ndarray: mass fractions, with the same shape as
+        *atomic_fractions*. Rows without atomic fraction are all 0.0.
+    """
+    atomic_fractions = _check_batch(zs, atomic_fractions)
+    atomic_weights = _get_atomic_weights(zs)
+    return _normalize_rows(atomic_fractions * atomic_weights)
 
-        mole_fraction = float(mole_fraction)
-        mole_fractions[z] = mole_fraction
-        total_mole_fraction += mole_fraction
 
-    # Calculate atomic fractions
-    atomic_fractions = {}
-    for z, mole_fraction in mole_fractions.items():
-        atomic_fractions[z] = mole_fraction / total_mole_fraction
+def _read_number(formula, position, default=1.0):
+    match = FORMULA_NUMBER_PATTERN.match(formula, position)
+    if match is None:
+        return default, position
+    return float(match.group(1)), match.end()
+
+
+def _read_count(formula, position):
+    match = FORMULA_HYDRATE_DOT_PATTERN.match(formula, position)
+    if match is not None:
+        return float(match.group(1)), match.end(), True
+    count, position = _read_number(formula, position)
+    return count, position, False
 
-    return atomic_fractions
 
+def _add_counts(counts, other, multiplier):
+    for symbol, count in other.items():
+        counts[symbol] = counts.get(symbol, 0.0) + count * multiplier
 
-def generate_name(atomic_fractions):
+
+def parse_formula(formula):
+    """
+    Parses a chemical formula in a single pass and returns the number of
+    atoms of each element.
+
+    The formula may contain:
+
+        - decimal numbers of atoms, e.g. ``Fe0.5Ni0.5``
+        - nested groups in parentheses, brackets or braces,
+          e.g. ``Ca3(PO4)2`` or ``K4[Fe(CN)6]``
+        - hydrates (or adducts) separated by ``·``, ``•``, ``∙`` or ``*``,
+          with an optional leading number, e.g. ``CuSO4·5H2O``.
+          A dot (``.``) between two integers, directly followed by an element
+          or a group, is also a hydrate separator, e.g. ``CuSO4.5H2O``.
+          Otherwise it is a decimal point, e.g. ``Fe0.5Ni0.5``.
+          Use a space to keep a decimal point in the ambiguous cases,
+          e.g. ``Fe1.5 Ni0.5``.
+        - spaces between the tokens, e.g. ``Al2 O3``
+
+    Args:
+        formula (str): chemical formula
+
+    Returns:
+        dict: number of atoms, where the keys are the symbols of the elements
+        (in the order of their first occurrence)
+
+    Raises:
+        ValueError: if the formula is not valid
+    """
+    counts = {}
+    length = len(formula.rstrip())
+    position = 0
+
+    while True:
+        # Part of the formula, e.g. 5H2O of a hydrate
+        multiplier, position = _read_number(formula, position)
+        stack = [{}]
+        closings = []
+        separated = False
+
+        while position < length:
+            match = FORMULA_TOKEN_PATTERN.match(formula, position)
+            if match is None or match.end() == position:
+                raise ValueError(
+                    "Invalid character at position {} of formula: {}".format(
+                        position, formula
+                    )
+                )
+            position = match.end()
+
+            kind = match.lastgroup
+            if kind == "symbol":
+                count, position, separated = _read_count(formula, position)
+                group = stack[-1]
+                symbol = match.group("symbol")
+                group[symbol] = group.get(symbol, 0.0) + count
+
+            elif kind == "open":
+                stack.append({})
+                closings.append(FORMULA_BRACKETS[match.group("open")])
+
+            elif kind == "close":
+                if not closings or closings.pop() != match.group("close"):
+                    raise ValueError(
+                        "Unbalanced brackets in formula: {}".format(formula)
+                    )
+                count, position, separated = _read_count(formula, position)
+                group = stack.pop()
+                _add_counts(stack[-1], group, count)
+
+            else:  # Hydrate separator
+                separated = True
+
+            if separated:
+                break
+
+        if closings:
+            raise ValueError("Unbalanced brackets in formula: {}".format(formula))
+        if not stack[0]:
+            raise ValueError("Empty part in formula: {}".format(formula))
+
+        _add_counts(counts, stack[0], multiplier)
+
+        if not separated:
+            break
+
+    return counts
+
+
+@functools.lru_cache(maxsize=FORMULA_CACHE_MAXSIZE)
+def _convert_formula(formula, table):
+    # The cache is also keyed on the element table, which is replaced with
+    # the database
+    counts = {}
+    for symbol, count in parse_formula(formula).items():
+        z = table.atomic_number(symbol)
+        counts[z] = counts.get(z, 0.0) + count
+
+    total = sum(counts.values())
+    if total <= 0.0:
+        raise ValueError("No atom in formula: {}".format(formula))
+
+    return tuple((z, count / total) for z, count in counts.items())
+
+
+def convert_formula_to_atomic_fractions(formula):
+    """
+    Converts a chemical formula to an atomic fraction :class:`dict`.
+    See :func:`parse_formula` for the syntax of the formula.
+
+    The symbols are resolved with the table of elements of the current
+    database and the atomic fractions of the last formulas
+    (up to :data:`FORMULA_CACHE_MAXSIZE`) are cached.
+
+    Args:
+        formula (str): chemical formula, like Al2O3 or Ca3(PO4)2.
+            No wildcard are accepted.
+    """
+    return dict(_convert_formula(formula, _get_element_table()))
+
+
+def generate_name(atomic_fractions, symbols=None):
     """
     Generates a name from the composition.
     The name is generated on the basis of a classical chemical formula.
+
+    Args:
+        atomic_fractions (dict): atomic fraction :class:`dict`.
+        symbols (dict): optional symbols of the elements, where the keys are
+            atomic numbers. If ``None``, the symbols are looked up.
     """
     if not atomic_fractions:
         return ""
 
+    if symbols is None:
+        table = _get_element_table()
+        symbols = {z: table.symbol(z) for z in atomic_fractions}
+
     if len(atomic_fractions) == 1:
         z = list(atomic_fractions.keys())[0]
-        return pyxray.element_symbol(z)
+        return symbols[z]
 
-    symbols = []
-    fractions = []
-    for z in sorted(atomic_fractions.keys(), reverse=True):
-        symbols.append(pyxray.element_symbol(z))
-        fractions.append(Fraction(atomic_fractions[z]).limit_denominator())
+    zs = sorted(atomic_fractions.keys(), reverse=True)
+    fractions = [Fraction(atomic_fractions[z]).limit_denominator() for z in zs]
+    symbols = [symbols[z] for z in zs]
 
     # Find gcd of the fractions
     gcds = []
@@ -173,6 +404,11 @@ class Composition:
         - :meth:`from_mass_fractions`
         - :meth:`from_atomic_fractions`
 
+    To create many compositions at once from 2-D arrays of fractions, use:
+
+        - :meth:`from_mass_fractions_batch`
+        - :meth:`from_atomic_fractions_batch`
+
     Use the following attributes to access the composition values:
 
         - :attr:`mass_fractions`: :class:`dict` where the keys are atomic numbers and the values weight fractions.
@@ -207,9 +443,16 @@ class Composition:
         Creates a pure composition.
 
         Args:
-            z (int): atomic number
+            z (int): atomic number, or an element, symbol or name looked up
+                in the database (e.g. ``Element(26)``, ``"Fe"``)
         """
-        return cls(cls._key, {z: 1.0}, {z: 1.0}, pyxray.element_symbol(z))
+        z = getattr(z, "atomic_number", z)
+        if isinstance(z, numbers.Integral):
+            z = int(z)
+        else:
+            z = pyxray.data.database.element_atomic_number(z)
+        symbol = _get_element_table().symbol(z)
+        return cls(cls._key, {z: 1.0}, {z: 1.0}, symbol)
 
     @classmethod
     def from_formula(cls, formula):
@@ -260,6 +503,94 @@ class Composition:
             formula = generate_name(atomic_fractions)
         return cls(cls._key, mass_fractions, atomic_fractions, formula)
 
+    @classmethod
+    def _from_batch(cls, zs, mass_fractions, atomic_fractions, formulas):
+        import numpy
+
+        if formulas is not None and len(formulas) != len(mass_fractions):
+            raise ValueError("One formula per composition is required")
+
+        zs = [int(z) for z in zs]
+        symbols = None
+        if formulas is None:
+            table = _get_element_table()
+            symbols = {z: table.symbol(z) for z in zs}
+
+        # Identical rows (e.g. pixels of the same phase) share one composition
+        if formulas is None and len(mass_fractions) > 1:
+            _unique, indexes, inverse = numpy.unique(
+                mass_fractions, axis=0, return_index=True, return_inverse=True
+            )
+        else:
+            indexes = range(len(mass_fractions))
+            inverse = range(len(mass_fractions))
+
+        compositions = []
+        for index in indexes:
+            row_mass_fractions = dict(zip(zs, mass_fractions[index].tolist()))
+            row_atomic_fractions = dict(zip(zs, atomic_fractions[index].tolist()))
+
+            if formulas is None:
+                formula = generate_name(row_atomic_fractions, symbols)
+            else:
+                formula = formulas[index]
+
+            compositions.append(
+                cls(cls._key, row_mass_fractions, row_atomic_fractions, formula)
+            )
+
+        return [compositions[index] for index in numpy.ravel(inverse)]
+
+    @classmethod
+    def from_mass_fractions_batch(cls, zs, mass_fractions, formulas=None):
+        """
+        Creates many compositions from a 2-D array of mass fractions.
+        The mass fractions are converted with
+        :func:`convert_mass_to_atomic_fractions_batch` and the symbols of the
+        elements are looked up once for all compositions.
+        Identical rows share the same (immutable) composition.
+
+        Args:
+            zs (sequence): atomic numbers of the elements, one per column of
+                *mass_fractions*
+            mass_fractions (array_like): 2-D array of mass fractions, with one
+                row per composition and one column per element.
+                No wildcard are accepted.
+            formulas (sequence): optional chemical formula of each composition.
+                If ``None``, formulas will be generated.
+
+        Returns:
+            list: compositions, one per row
+        """
+        mass_fractions = _check_batch(zs, mass_fractions)
+        atomic_fractions = convert_mass_to_atomic_fractions_batch(zs, mass_fractions)
+        return cls._from_batch(zs, mass_fractions, atomic_fractions, formulas)
+
+    @classmethod
+    def from_atomic_fractions_batch(cls, zs, atomic_fractions, formulas=None):
+        """
+        Creates many compositions from a 2-D array of atomic fractions.
+        The atomic fractions are converted with
+        :func:`convert_atomic_to_mass_fractions_batch` and the symbols of the
+        elements are looked up once for all compositions.
+        Identical rows share the same (immutable) composition.
+
+        Args:
+            zs (sequence): atomic numbers of the elements, one per column of
+                *atomic_fractions*
+            atomic_fractions (array_like): 2-D array of atomic fractions, with
+                one row per composition and one column per element.
+                No wildcard are accepted.
+            formulas (sequence): optional chemical formula of each composition.
+                If ``None``, formulas will be generated.
+
+        Returns:
+            list: compositions, one per row
+        """
+        atomic_fractions = _check_batch(zs, atomic_fractions)
+        mass_fractions = convert_atomic_to_mass_fractions_batch(zs, atomic_fractions)
+        return cls._from_batch(zs, mass_fractions, atomic_fractions, formulas)
+
     def __len__(self):
         return len(self.mass_fractions)
 
@@ -320,8 +651,9 @@ class Composition:
         )
 
     def inner_repr(self):
+        table = _get_element_table()
         return ", ".join(
-            "{}: {:.4f}".format(pyxray.element_symbol(z), mass_fraction)
+            "{}: {:.4f}".format(table.symbol(z), mass_fraction)
             for z, mass_fraction in self.mass_fractions.items()
         )
 
@@ -26,19 +26,32 @@ __all__ = [
     "xray_transition_energy_eV",
     "xray_transition_probability",
     "xray_transition_relative_weight",
+    "nonradiative_transition_energy_eV",
+    "nonradiative_transition_probability",
     "xray_line",
+    "xray_lines_in_energy_range",
+    "identify_peaks",
+    "element_atomic_weights",
+    "atomic_subshell_binding_energies_eV",
+    "atomic_subshell_radiative_widths_eV",
+    "atomic_subshell_nonradiative_widths_eV",
+    "xray_transition_energies_eV",
+    "xray_transition_probabilities",
+    "xray_transition_relative_weights",
+    "set_database",
 ]
 
 # Standard library modules.
 import os
+import sys
 import logging
+import functools
+import threading
 
 # Third party modules.
-import sqlalchemy
 
 # Local modules.
 from pyxray.base import _DatabaseMixin, NotFound
-from pyxray.sql.data import SqlDatabase
 
 # Globals and constants variables.
 logger = logging.getLogger(__name__)
@@ -137,47 +150,125 @@ class _EmptyDatabase(_DatabaseMixin):
     ):  # pragma: no cover
         raise NotFound
 
+    def nonradiative_transition_energy_eV(
+        self, element, nonradiative_transition, reference=None
+    ):  # pragma: no cover
+        raise NotFound
+
+    def nonradiative_transition_probability(
+        self, element, nonradiative_transition, reference=None
+    ):  # pragma: no cover
+        raise NotFound
+
     def xray_line(self, element, xray_transition):  # pragma: no cover
         raise NotFound
 
 
-def _init_sql_database():
+def _create_engine():
+    # SQLAlchemy is only imported when the database is first accessed
+    import sqlalchemy
+
     basedir = os.path.abspath(os.path.dirname(__file__))
     filepath = os.path.join(basedir, "data", "pyxray.db")
     if not os.path.exists(filepath):
         raise RuntimeError("Cannot find SQL database at location {0}".format(filepath))
 
-    engine = sqlalchemy.create_engine("sqlite:///" + filepath)
-    return SqlDatabase(engine)
-
-
-try:
-    database = _init_sql_database()
-except:
-    logger.error("No SQL database found")
-    database = _EmptyDatabase()
-
-element = database.element
-element_atomic_number = database.element_atomic_number
-element_symbol = database.element_symbol
-element_name = database.element_name
-element_atomic_weight = database.element_atomic_weight
-element_mass_density_kg_per_m3 = database.element_mass_density_kg_per_m3
-element_mass_density_g_per_cm3 = database.element_mass_density_g_per_cm3
-element_xray_transitions = database.element_xray_transitions
-element_xray_transition = database.element_xray_transition
-print_element_xray_transitions = database.print_element_xray_transitions
-atomic_shell = database.atomic_shell
-atomic_shell_notation = database.atomic_shell_notation
-atomic_subshell = database.atomic_subshell
-atomic_subshell_notation = database.atomic_subshell_notation
-atomic_subshell_binding_energy_eV = database.atomic_subshell_binding_energy_eV
-atomic_subshell_radiative_width_eV = database.atomic_subshell_radiative_width_eV
-atomic_subshell_nonradiative_width_eV = database.atomic_subshell_nonradiative_width_eV
-atomic_subshell_occupancy = database.atomic_subshell_occupancy
-xray_transition = database.xray_transition
-xray_transition_notation = database.xray_transition_notation
-xray_transition_energy_eV = database.xray_transition_energy_eV
-xray_transition_probability = database.xray_transition_probability
-xray_transition_relative_weight = database.xray_transition_relative_weight
-xray_line = database.xray_line
+    return sqlalchemy.create_engine("sqlite:///" + filepath)
+
+
+def _init_sql_database():
+    from pyxray.sql.data import SqlDatabase
+
+    return SqlDatabase(_create_engine())
+
+
+def _init_memory_database():
+    from pyxray.sql.memory import MemoryDatabase
+
+    return MemoryDatabase(_create_engine())
+
+
+class _LazyDatabase:
+    """
+    Proxy of a database which is only created on first access,
+    so that importing :mod:`pyxray` neither imports SQLAlchemy nor opens
+    the database file.
+
+    The methods listed in :data:`__all__` can be retrieved without creating
+    the database.
+    Once created, the database replaces the proxy as the current database
+    (see :func:`set_database`), if the proxy is still the current database.
+
+    :arg factory: callable returning the database
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._database = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # Fast path, without lock, once the database is created
+        loaded = self._database
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            if self._database is None:
+                try:
+                    self._database = self._factory()
+                except:
+                    logger.error("No SQL database found")
+                    self._database = _EmptyDatabase()
+
+                if database is self:
+                    set_database(self._database)
+
+            return self._database
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if name in __all__ and self._database is None:
+
+            @functools.wraps(getattr(_DatabaseMixin, name))
+            def method(*args, **kwargs):
+                return getattr(self._load(), name)(*args, **kwargs)
+
+            return method
+
+        return getattr(self._load(), name)
+
+
+def set_database(database):
+    """
+    Sets the database used by the functions of this module
+    (e.g. :func:`xray_transition_energy_eV`).
+
+    Examples::
+
+        import pyxray
+        from pyxray.sql.memory import MemoryDatabase
+
+        pyxray.set_database(MemoryDatabase(pyxray.data.database.engine))
+
+    :arg database: instance of a database, e.g.
+        :class:`SqlDatabase <pyxray.sql.data.SqlDatabase>` or
+        :class:`MemoryDatabase <pyxray.sql.memory.MemoryDatabase>`
+    """
+    namespaces = [globals()]
+
+    # Functions are also imported in the package namespace
+    package = sys.modules.get("pyxray")
+    if package is not None:
+        namespaces.append(vars(package))
+
+    for namespace in namespaces:
+        namespace["database"] = database
+        for name in __all__:
+            if name != "set_database":
+                namespace[name] = getattr(database, name)
+
+
+set_database(_LazyDatabase(_init_sql_database))
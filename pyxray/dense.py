@@ -0,0 +1,453 @@
+"""
+Dense arrays of the properties of the atomic subshells and X-ray transitions
+of all elements, for numerical kernels (e.g. Monte Carlo simulations) where
+even a dictionary lookup per value is too slow.
+
+The arrays are indexed by atomic number and by the integer index of an
+atomic subshell or an X-ray transition, e.g.
+``tables.binding_energies_eV[z, atomic_subshell_index(K)]``.
+The indexes only depend on the quantum numbers, so they are stable between
+versions of the database and can be computed in NumPy or Numba code:
+
+* atomic subshells are ordered K, L1, L2, L3, M1, ..., up to the
+  principal quantum number :data:`MAX_N`
+  (see :data:`ATOMIC_SUBSHELLS`);
+* the index of an X-ray transition is
+  ``source_index * len(ATOMIC_SUBSHELLS) + destination_index``.
+
+Missing values are ``nan``.
+Transition sets (e.g. Kα) are not included.
+
+The arrays are built once from a database, with
+:meth:`DenseTables.from_database`, and cached on disk with
+:func:`load_dense_tables`.
+"""
+
+__all__ = [
+    "ATOMIC_SUBSHELLS",
+    "atomic_subshell_index",
+    "xray_transition_index",
+    "DenseTables",
+    "load_dense_tables",
+]
+
+# Standard library modules.
+import os
+import json
+import hashlib
+import logging
+import tempfile
+
+# Third party modules.
+import numpy
+
+# Local modules.
+from pyxray.base import NotFound
+from pyxray.lineindex import MAX_Z
+import pyxray.descriptor as descriptor
+
+# Globals and constants variables.
+logger = logging.getLogger(__name__)
+
+#: Version of the arrays, increased when the indexes or arrays change
+FORMAT_VERSION = 1
+
+#: Maximum principal quantum number of the atomic subshells
+MAX_N = 7
+
+
+def _get_default_dirpath():
+    """
+    Returns the folder of the cache: the environment variable
+    ``PYXRAY_DENSE_DIR`` or the ``pyxray/dense`` folder of the user cache
+    (``$XDG_CACHE_HOME``, ``~/.cache`` if not set).
+    The package folder is often read-only once installed.
+    """
+    dirpath = os.environ.get("PYXRAY_DENSE_DIR")
+    if dirpath:
+        return dirpath
+
+    cachedir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cachedir, "pyxray", "dense")
+
+
+def _create_atomic_subshells():
+    atomic_subshells = []
+    for n in range(1, MAX_N + 1):
+        for l in range(n):
+            for j_n in (2 * l - 1, 2 * l + 1):
+                if j_n > 0:
+                    atomic_subshells.append(descriptor.AtomicSubshell(n, l, j_n))
+    return tuple(atomic_subshells)
+
+
+#: Atomic subshells in the order of their index
+ATOMIC_SUBSHELLS = _create_atomic_subshells()
+
+_ATOMIC_SUBSHELL_INDEXES = {
+    (
+        atomic_subshell.principal_quantum_number,
+        atomic_subshell.azimuthal_quantum_number,
+        atomic_subshell.total_angular_momentum_nominator,
+    ): index
+    for index, atomic_subshell in enumerate(ATOMIC_SUBSHELLS)
+}
+
+NATOMIC_SUBSHELL = len(ATOMIC_SUBSHELLS)
+NXRAY_TRANSITION = NATOMIC_SUBSHELL * NATOMIC_SUBSHELL
+
+ATOMIC_SUBSHELL_ARRAYS = {
+    "binding_energies_eV": "atomic_subshell_binding_energies_eV",
+    "radiative_widths_eV": "atomic_subshell_radiative_widths_eV",
+    "nonradiative_widths_eV": "atomic_subshell_nonradiative_widths_eV",
+}
+
+XRAY_TRANSITION_ARRAYS = {
+    "xray_transition_energies_eV": "xray_transition_energies_eV",
+    "xray_transition_probabilities": "xray_transition_probabilities",
+    "xray_transition_relative_weights": "xray_transition_relative_weights",
+}
+
+
+def atomic_subshell_index(atomic_subshell):
+    """
+    Returns the index of an atomic subshell in the arrays of
+    :class:`DenseTables`.
+
+    :arg atomic_subshell: :class:`AtomicSubshell <pyxray.descriptor.AtomicSubshell>`
+        or :class:`tuple` of its quantum numbers ``(n, l, j_n)``
+
+    :raises ValueError: if the atomic subshell is not in the arrays
+    """
+    if isinstance(atomic_subshell, descriptor.AtomicSubshell):
+        atomic_subshell = (
+            atomic_subshell.principal_quantum_number,
+            atomic_subshell.azimuthal_quantum_number,
+            atomic_subshell.total_angular_momentum_nominator,
+        )
+
+    try:
+        return _ATOMIC_SUBSHELL_INDEXES[tuple(atomic_subshell)]
+    except KeyError:
+        raise ValueError("Unknown atomic subshell: {}".format(atomic_subshell))
+
+
+def xray_transition_index(xray_transition):
+    """
+    Returns the index of an X-ray transition in the arrays of
+    :class:`DenseTables`.
+
+    :arg xray_transition: :class:`XrayTransition <pyxray.descriptor.XrayTransition>`
+
+    :raises ValueError: if the X-ray transition is a transition set or
+        is not in the arrays
+    """
+    source = atomic_subshell_index(
+        (
+            xray_transition.source_principal_quantum_number,
+            xray_transition.source_azimuthal_quantum_number,
+            xray_transition.source_total_angular_momentum_nominator,
+        )
+    )
+    destination = atomic_subshell_index(
+        (
+            xray_transition.destination_principal_quantum_number,
+            xray_transition.destination_azimuthal_quantum_number,
+            xray_transition.destination_total_angular_momentum_nominator,
+        )
+    )
+    return source * NATOMIC_SUBSHELL + destination
+
+
+def _normalize_references(references):
+    if references is None or isinstance(references, (str, descriptor.Reference)):
+        references = [references]
+
+    normalized = []
+    for reference in references:
+        if isinstance(reference, descriptor.Reference):
+            reference = reference.bibtexkey
+        normalized.append(reference.lower() if reference else None)
+
+    return tuple(normalized)
+
+
+def _find_xray_transitions(database, references):
+    """
+    Returns the pairs of atomic number and X-ray transition (index) of
+    the X-ray transitions of all elements, for any of the references.
+    """
+    pairs = set()
+    for reference in references:
+        for z in range(1, MAX_Z + 1):
+            try:
+                xray_transitions = database.element_xray_transitions(
+                    z, reference=reference
+                )
+            except NotFound:
+                continue
+
+            for xray_transition in xray_transitions:
+                try:
+                    pairs.add((z, xray_transition_index(xray_transition)))
+                except ValueError:  # Transition set
+                    continue
+
+    return sorted(pairs)
+
+
+def _fill(array, zs, indexes, lookup, references, others):
+    # Values of the first reference found, following the order of references
+    for reference in references:
+        missing = numpy.isnan(array[zs, indexes])
+        if not missing.any():
+            break
+
+        zs_missing = zs[missing]
+        indexes_missing = indexes[missing]
+        values = lookup(
+            zs_missing.tolist(), [others[i] for i in indexes_missing], reference
+        )
+        array[zs_missing, indexes_missing] = values
+
+
+class DenseTables:
+    """
+    Dense arrays of the properties of the atomic subshells and X-ray
+    transitions of all elements, following a priority of references.
+
+    Arrays of shape ``(MAX_Z + 1, len(ATOMIC_SUBSHELLS))``, indexed by
+    atomic number and :func:`atomic_subshell_index`:
+
+    * :attr:`binding_energies_eV`
+    * :attr:`radiative_widths_eV`
+    * :attr:`nonradiative_widths_eV`
+    * :attr:`fluorescence_yields`: radiative width over total width
+
+    Arrays of shape ``(MAX_Z + 1, len(ATOMIC_SUBSHELLS) ** 2)``, indexed by
+    atomic number and :func:`xray_transition_index`:
+
+    * :attr:`xray_transition_energies_eV`
+    * :attr:`xray_transition_probabilities`
+    * :attr:`xray_transition_relative_weights`
+
+    The row of atomic number 0 is ``nan``.
+
+    :arg references: bibtex keys of the references in order of priority,
+        where ``None`` stands for the default order of the database
+        (newest reference first)
+    :arg arrays: :class:`dict` of the arrays, by attribute name
+    """
+
+    def __init__(self, references, arrays):
+        self.references = tuple(references)
+
+        for name in list(ATOMIC_SUBSHELL_ARRAYS) + list(XRAY_TRANSITION_ARRAYS):
+            setattr(self, name, numpy.ascontiguousarray(arrays[name], dtype=float))
+
+        total_widths_eV = self.radiative_widths_eV + self.nonradiative_widths_eV
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            self.fluorescence_yields = self.radiative_widths_eV / total_widths_eV
+
+    @classmethod
+    def from_database(cls, database, references=None):
+        """
+        Builds the arrays from a database.
+        For each value, the references are searched in order and the value
+        of the first reference found is kept.
+
+        The X-ray transitions are those returned by
+        :meth:`element_xray_transitions <pyxray.base._DatabaseMixin.element_xray_transitions>`
+        for any of the references.
+
+        :arg database: database (e.g. :data:`pyxray.data.database`)
+        :arg references: bibtex key or sequence of bibtex keys in order of
+            priority, where ``None`` stands for the default order of the
+            database
+        """
+        references = _normalize_references(references)
+        arrays = {}
+
+        zs, indexes = numpy.meshgrid(
+            numpy.arange(1, MAX_Z + 1), numpy.arange(NATOMIC_SUBSHELL), indexing="ij"
+        )
+        zs = zs.ravel()
+        indexes = indexes.ravel()
+        for name, method in ATOMIC_SUBSHELL_ARRAYS.items():
+            array = numpy.full((MAX_Z + 1, NATOMIC_SUBSHELL), numpy.nan)
+            lookup = getattr(database, method)
+            _fill(array, zs, indexes, lookup, references, ATOMIC_SUBSHELLS)
+            arrays[name] = array
+
+        pairs = _find_xray_transitions(database, references)
+        zs = numpy.array([z for z, _index in pairs], dtype=int)
+        indexes = numpy.array([index for _z, index in pairs], dtype=int)
+        xray_transitions = {
+            index: descriptor.XrayTransition(
+                ATOMIC_SUBSHELLS[index // NATOMIC_SUBSHELL],
+                ATOMIC_SUBSHELLS[index % NATOMIC_SUBSHELL],
+            )
+            for index in set(indexes.tolist())
+        }
+        for name, method in XRAY_TRANSITION_ARRAYS.items():
+            array = numpy.full((MAX_Z + 1, NXRAY_TRANSITION), numpy.nan)
+            lookup = getattr(database, method)
+            _fill(array, zs, indexes, lookup, references, xray_transitions)
+            arrays[name] = array
+
+        return cls(references, arrays)
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Loads the arrays saved with :meth:`save`.
+        """
+        with numpy.load(filepath) as data:
+            metadata = json.loads(str(data["metadata"]))
+            if metadata["version"] != FORMAT_VERSION:
+                raise ValueError(
+                    "Unsupported version of dense arrays: {}".format(
+                        metadata["version"]
+                    )
+                )
+
+            arrays = {name: data[name] for name in data.files if name != "metadata"}
+
+        return cls(metadata["references"], arrays)
+
+    def save(self, filepath, fingerprint=None):
+        """
+        Saves the arrays in a NumPy ``.npz`` file.
+        The file is first written under a temporary name and then renamed,
+        so that concurrent processes never load a partial file.
+
+        :arg filepath: path of the file
+        :arg fingerprint: fingerprint of the database, to check that a cached
+            file is still valid (see :func:`load_dense_tables`)
+        """
+        metadata = {
+            "version": FORMAT_VERSION,
+            "references": list(self.references),
+            "fingerprint": fingerprint,
+        }
+        arrays = {
+            name: getattr(self, name)
+            for name in list(ATOMIC_SUBSHELL_ARRAYS) + list(XRAY_TRANSITION_ARRAYS)
+        }
+
+        dirpath = os.path.dirname(os.path.abspath(filepath))
+        fd, tmpfilepath = tempfile.mkstemp(suffix=".npz", dir=dirpath)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                numpy.savez(fp, metadata=json.dumps(metadata), **arrays)
+            os.replace(tmpfilepath, filepath)
+        except BaseException:
+            os.remove(tmpfilepath)
+            raise
+
+
+def _read_fingerprint(filepath):
+    """
+    Returns the fingerprint of the database saved with the arrays of
+    a ``.npz`` file, ``None`` if the file cannot be read.
+    """
+    try:
+        with numpy.load(filepath) as data:
+            return json.loads(str(data["metadata"]))["fingerprint"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _compute_fingerprint(database):
+    """
+    Returns a fingerprint of the content of a SQL database, from the
+    fingerprints of the parsers recorded when the database was built,
+    ``None`` if the database has no such record.
+    """
+    database = getattr(database, "database", database)  # Cached database
+    engine = getattr(database, "engine", None)
+    if engine is None:
+        return None
+
+    import sqlalchemy
+
+    with engine.connect() as conn:
+        if not sqlalchemy.inspect(conn).has_table("build_fingerprint"):
+            return None
+
+        statement = sqlalchemy.text(
+            "SELECT name, fingerprint FROM build_fingerprint ORDER BY name"
+        )
+        rows = conn.execute(statement).all()
+
+    hasher = hashlib.sha256()
+    for name, fingerprint in rows:
+        hasher.update("{}={};".format(name, fingerprint).encode("utf8"))
+    return hasher.hexdigest()
+
+
+def load_dense_tables(references=None, database=None, dirpath=None):
+    """
+    Returns the dense arrays of a database, loaded from the cache on disk if
+    the database did not change since they were saved.
+    Otherwise, the arrays are built (see :meth:`DenseTables.from_database`)
+    and saved in the cache.
+
+    The content of the database is identified by the fingerprints of its
+    parsers, recorded when it was built
+    (see :class:`SqlDatabaseBuilder <pyxray.sql.build.SqlDatabaseBuilder>`).
+    Databases without fingerprint are not cached.
+
+    Examples::
+
+        from pyxray.dense import load_dense_tables, atomic_subshell_index
+
+        tables = load_dense_tables()
+        K = atomic_subshell_index((1, 0, 1))
+        tables.binding_energies_eV[26, K] #=> 7112.0
+
+    :arg references: bibtex key or sequence of bibtex keys in order of
+        priority, where ``None`` stands for the default order of the database
+    :arg database: database, the current database of :mod:`pyxray.data`
+        if ``None``
+    :arg dirpath: folder of the cache, defaults to the environment variable
+        ``PYXRAY_DENSE_DIR`` or ``$XDG_CACHE_HOME/pyxray/dense``
+        (``~/.cache/pyxray/dense`` if ``XDG_CACHE_HOME`` is not set)
+
+    :rtype: :class:`DenseTables`
+    """
+    if database is None:
+        import pyxray.data
+
+        database = pyxray.data.database
+
+    if dirpath is None:
+        dirpath = _get_default_dirpath()
+
+    references = _normalize_references(references)
+
+    fingerprint = _compute_fingerprint(database)
+    if fingerprint is None:
+        logger.debug("Database without fingerprint, dense arrays are not cached")
+        return DenseTables.from_database(database, references)
+
+    key = json.dumps([FORMAT_VERSION, references])
+    filename = hashlib.sha256(key.encode("utf8")).hexdigest()[:16] + ".npz"
+    filepath = os.path.join(dirpath, filename)
+
+    if _read_fingerprint(filepath) == fingerprint:
+        logger.debug("Load dense arrays from {}".format(filepath))
+        return DenseTables.load(filepath)
+
+    tables = DenseTables.from_database(database, references)
+
+    try:
+        os.makedirs(dirpath, exist_ok=True)
+        tables.save(filepath, fingerprint)
+        logger.debug("Save dense arrays in {}".format(filepath))
+    except OSError as exc:
+        logger.warning("Cannot save dense arrays in {}: {}".format(dirpath, exc))
+
+    return tables
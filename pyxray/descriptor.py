@@ -8,6 +8,7 @@ __all__ = [
     "AtomicSubshell",
     "XrayTransition",
     "XrayLine",
+    "NonRadiativeTransition",
     "Language",
     "Notation",
     "Reference",
@@ -23,9 +24,142 @@ from collections.abc import Sequence
 
 # Globals and constants variables.
 
+# Interned instances, by class and arguments or by instance
+_INSTANCES = {}
+
+
+# Number of bits of each quantum number in a packed key
+KEY_BITS = 8
+
+
+def pack_quantum_numbers(values):
+    """
+    Returns the quantum numbers packed in one integer, e.g. the key of an
+    :class:`AtomicSubshell` or :class:`XrayTransition`.
+    Each quantum number takes :data:`KEY_BITS` bits, the first one being the
+    most significant.
+    A quantum number is stored plus one, so that an undefined quantum number
+    (``None``, a wildcard) is stored as zero.
+
+    :arg values: quantum numbers, ``None`` if undefined
+    :raises ValueError: if a quantum number is negative or too large
+    """
+    key = 0
+    for value in values:
+        if value is None:
+            value = -1
+        elif not 0 <= value < (1 << KEY_BITS) - 1:
+            raise ValueError("Cannot pack quantum number: {}".format(value))
+        key = (key << KEY_BITS) | (value + 1)
+    return key
+
+
+def pack_quantum_numbers_mask(values):
+    """
+    Returns the mask of the defined quantum numbers in a packed key
+    (see :func:`pack_quantum_numbers`): all the bits of a defined quantum
+    number are set, whereas the bits of an undefined one are zero.
+    A packed key ``key`` matches the quantum numbers ``values``, where the
+    undefined quantum numbers are wildcards, if
+    ``key & pack_quantum_numbers_mask(values) == pack_quantum_numbers(values)``.
+
+    :arg values: quantum numbers, ``None`` if undefined
+    """
+    mask = 0
+    for value in values:
+        mask <<= KEY_BITS
+        if value is not None:
+            mask |= (1 << KEY_BITS) - 1
+    return mask
+
+
+def _field_values(obj):
+    return tuple(getattr(obj, field.name) for field in dataclasses.fields(obj))
+
+
+class _InternedMixin:
+    """
+    Mixin of the descriptors which can be interned with :meth:`of`.
+    The descriptors define ``__slots__`` with the names of their fields,
+    so their instances have no ``__dict__``.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, *args):
+        """
+        Returns the unique (interned) instance of this descriptor with these
+        arguments, which are the same as the arguments of the constructor
+        (e.g. ``Element.of(26)``).
+        The instance is created on the first call and returned by all the
+        following calls, so the same object can be reused in many results.
+        """
+        key = (cls, args)
+        try:
+            return _INSTANCES[key]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable arguments, e.g. a list
+            key = None
+
+        obj = cls(*args)
+        obj = _INSTANCES.setdefault(obj, obj)
+        if key is not None:
+            _INSTANCES[key] = obj
+        return obj
+
+    def __reduce__(self):
+        # Unpickled and copied instances are also interned
+        return (self.__class__.of, _field_values(self))
+
+
+class _PackedKeyMixin:
+    """
+    Mixin of the descriptors identified by a packed integer key of their
+    quantum numbers (see :func:`pack_quantum_numbers`).
+    The key is computed on first access and kept in the slot ``_key``.
+    """
+
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """
+        Quantum numbers packed in one integer, where an undefined quantum
+        number is zero (see :func:`pack_quantum_numbers`).
+        Equal descriptors have the same key.
+        """
+        try:
+            return self._key
+        except AttributeError:
+            key = pack_quantum_numbers(_field_values(self))
+            object.__setattr__(self, "_key", key)
+            return key
+
+    @property
+    def key_mask(self):
+        """
+        Mask of the defined quantum numbers in :attr:`key`
+        (see :func:`pack_quantum_numbers_mask`).
+        """
+        return pack_quantum_numbers_mask(_field_values(self))
+
+    def matches(self, other):
+        """
+        Returns whether the quantum numbers of *other* (a descriptor of the
+        same type) are equal to the defined quantum numbers of this
+        descriptor, i.e. whether *other* belongs to the family of this
+        descriptor when some of its quantum numbers are undefined
+        (e.g. a transition set).
+        """
+        return other.key & self.key_mask == self.key
+
 
 @dataclasses.dataclass(frozen=True, order=True)
-class Element:
+class Element(_InternedMixin):
+    __slots__ = ("atomic_number",)
+
     atomic_number: int
 
     def __post_init__(self):
@@ -43,7 +177,9 @@ class Element:
 
 
 @dataclasses.dataclass(frozen=True, order=True)
-class AtomicShell:
+class AtomicShell(_InternedMixin):
+    __slots__ = ("principal_quantum_number",)
+
     principal_quantum_number: int
 
     def __post_init__(self):
@@ -63,7 +199,14 @@ class AtomicShell:
 
 
 @dataclasses.dataclass(frozen=True, order=True)
-class AtomicSubshell:
+class AtomicSubshell(_PackedKeyMixin, _InternedMixin):
+    __slots__ = (
+        "principal_quantum_number",
+        "azimuthal_quantum_number",
+        "total_angular_momentum_nominator",
+        "_key",
+    )
+
     principal_quantum_number: int
     azimuthal_quantum_number: int
     total_angular_momentum_nominator: int
@@ -117,7 +260,7 @@ class AtomicSubshell:
 
     @property
     def atomic_shell(self):
-        return AtomicShell(self.principal_quantum_number)
+        return AtomicShell.of(self.principal_quantum_number)
 
     @property
     def n(self):
@@ -143,13 +286,23 @@ class AtomicSubshell:
 
 
 @dataclasses.dataclass(frozen=True)
-class XrayTransition:
-    source_principal_quantum_number: int = None
-    source_azimuthal_quantum_number: int = None
-    source_total_angular_momentum_nominator: int = None
-    destination_principal_quantum_number: int = None
-    destination_azimuthal_quantum_number: int = None
-    destination_total_angular_momentum_nominator: int = None
+class XrayTransition(_PackedKeyMixin, _InternedMixin):
+    __slots__ = (
+        "source_principal_quantum_number",
+        "source_azimuthal_quantum_number",
+        "source_total_angular_momentum_nominator",
+        "destination_principal_quantum_number",
+        "destination_azimuthal_quantum_number",
+        "destination_total_angular_momentum_nominator",
+        "_key",
+    )
+
+    source_principal_quantum_number: int
+    source_azimuthal_quantum_number: int
+    source_total_angular_momentum_nominator: int
+    destination_principal_quantum_number: int
+    destination_azimuthal_quantum_number: int
+    destination_total_angular_momentum_nominator: int
 
     def __init__(self, *args):
         if len(args) == 6:
@@ -262,7 +415,7 @@ class XrayTransition:
 
     @property
     def source_subshell(self):
-        return AtomicSubshell(
+        return AtomicSubshell.of(
             self.source_principal_quantum_number,
             self.source_azimuthal_quantum_number,
             self.source_total_angular_momentum_nominator,
@@ -270,7 +423,7 @@ class XrayTransition:
 
     @property
     def destination_subshell(self):
-        return AtomicSubshell(
+        return AtomicSubshell.of(
             self.destination_principal_quantum_number,
             self.destination_azimuthal_quantum_number,
             self.destination_total_angular_momentum_nominator,
@@ -289,6 +442,13 @@ class XrayTransition:
         return self.destination_total_angular_momentum_nominator / 2.0
 
 
+# The quantum numbers of a transition set are undefined (None). The defaults
+# cannot be class attributes as they would conflict with the slots.
+for _field in dataclasses.fields(XrayTransition):
+    _field.default = None
+del _field
+
+
 @dataclasses.dataclass(frozen=True)
 class XrayLine:
     element: Element
@@ -301,7 +461,7 @@ class XrayLine:
 
     def __post_init__(self):
         if not isinstance(self.element, Element):
-            object.__setattr__(self, "element", Element(self.element))
+            object.__setattr__(self, "element", Element.of(self.element))
         if not isinstance(self.transition, XrayTransition):
             object.__setattr__(self, "transition", XrayTransition(self.transition))
 
@@ -317,6 +477,115 @@ class XrayLine:
         return self.element.atomic_number
 
 
+@dataclasses.dataclass(frozen=True)
+class NonRadiativeTransition(_InternedMixin):
+    """
+    Non-radiative (Auger or Coster-Kronig) transition, where a vacancy in the
+    destination subshell is filled by an electron of the source subshell and
+    an electron of the secondary destination subshell is ejected.
+
+    The transition can be created from three atomic subshells
+    (:class:`AtomicSubshell` or tuples of quantum numbers) or from their
+    nine quantum numbers.
+    Its quantum numbers are stored as integers, without atomic subshell
+    objects, as there are many more non-radiative than radiative transitions.
+    """
+
+    __slots__ = (
+        "source_principal_quantum_number",
+        "source_azimuthal_quantum_number",
+        "source_total_angular_momentum_nominator",
+        "destination_principal_quantum_number",
+        "destination_azimuthal_quantum_number",
+        "destination_total_angular_momentum_nominator",
+        "secondary_destination_principal_quantum_number",
+        "secondary_destination_azimuthal_quantum_number",
+        "secondary_destination_total_angular_momentum_nominator",
+    )
+
+    source_principal_quantum_number: int
+    source_azimuthal_quantum_number: int
+    source_total_angular_momentum_nominator: int
+    destination_principal_quantum_number: int
+    destination_azimuthal_quantum_number: int
+    destination_total_angular_momentum_nominator: int
+    secondary_destination_principal_quantum_number: int
+    secondary_destination_azimuthal_quantum_number: int
+    secondary_destination_total_angular_momentum_nominator: int
+
+    def __init__(self, *args):
+        if len(args) == 3:
+            values = []
+            for arg in args:
+                if isinstance(arg, AtomicSubshell):
+                    values.extend((arg.n, arg.l, arg.j_n))
+                elif isinstance(arg, Sequence) and len(arg) == 3:
+                    values.extend(arg)
+                else:
+                    raise ValueError("Unknown argument: {}".format(arg))
+
+        elif len(args) == 9:
+            values = args
+
+        else:
+            raise ValueError("Unsupported number of arguments: {}".format(len(args)))
+
+        for field, value in zip(dataclasses.fields(self), values):
+            if value is None:
+                raise ValueError("Quantum numbers must be defined")
+            object.__setattr__(self, field.name, value)
+
+    def __repr__(self):
+        return (
+            "{}([n={}, l={}, j={}] -> [n={}, l={}, j={}], [n={}, l={}, j={}])".format(
+                self.__class__.__name__,
+                self.source_principal_quantum_number,
+                self.source_azimuthal_quantum_number,
+                self.source_total_angular_momentum_nominator / 2.0,
+                self.destination_principal_quantum_number,
+                self.destination_azimuthal_quantum_number,
+                self.destination_total_angular_momentum_nominator / 2.0,
+                self.secondary_destination_principal_quantum_number,
+                self.secondary_destination_azimuthal_quantum_number,
+                self.secondary_destination_total_angular_momentum_nominator / 2.0,
+            )
+        )
+
+    @property
+    def source_subshell(self):
+        return AtomicSubshell.of(
+            self.source_principal_quantum_number,
+            self.source_azimuthal_quantum_number,
+            self.source_total_angular_momentum_nominator,
+        )
+
+    @property
+    def destination_subshell(self):
+        return AtomicSubshell.of(
+            self.destination_principal_quantum_number,
+            self.destination_azimuthal_quantum_number,
+            self.destination_total_angular_momentum_nominator,
+        )
+
+    @property
+    def secondary_destination_subshell(self):
+        return AtomicSubshell.of(
+            self.secondary_destination_principal_quantum_number,
+            self.secondary_destination_azimuthal_quantum_number,
+            self.secondary_destination_total_angular_momentum_nominator,
+        )
+
+    @property
+    def is_coster_kronig(self):
+        """
+        Whether the vacancy is filled by an electron of the same shell.
+        """
+        return (
+            self.source_principal_quantum_number
+            == self.destination_principal_quantum_number
+        )
+
+
 @dataclasses.dataclass(frozen=True)
 class Language:
     key: str
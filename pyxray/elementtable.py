@@ -0,0 +1,119 @@
+"""
+Table of the atomic weights and symbols of all elements, indexed by atomic
+number.
+"""
+
+__all__ = ["ElementTable"]
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pyxray.base import NotFound
+from pyxray.lineindex import MAX_Z
+
+# Globals and constants variables.
+
+
+class ElementTable:
+    """
+    Immutable table of the atomic weights and symbols of all elements,
+    for computations on many elements or compositions without a query to
+    the database per element.
+
+    The atomic weights are also available as a read-only NumPy array
+    indexed by atomic number, :attr:`atomic_weights`, where a missing
+    atomic weight is ``nan``.
+    The symbols are available as a :class:`tuple` indexed by atomic number,
+    :attr:`symbols`, where a missing symbol is an empty string.
+
+    A table is usually retrieved with
+    :meth:`element_table <pyxray.base._DatabaseMixin.element_table>`,
+    which keeps one table per database.
+
+    :arg atomic_weights: :class:`dict` of the atomic weights, where the keys
+        are atomic numbers
+    :arg symbols: :class:`dict` of the symbols, where the keys are atomic
+        numbers
+    """
+
+    def __init__(self, atomic_weights, symbols):
+        # NumPy is only imported when needed to keep "import pyxray" fast
+        import numpy
+
+        # Dictionaries are faster than arrays to look up one element
+        self._atomic_weights = dict(atomic_weights)
+        self._symbols = dict(symbols)
+        self._atomic_numbers = {symbol: z for z, symbol in self._symbols.items()}
+
+        self.atomic_weights = numpy.full(MAX_Z + 1, numpy.nan)
+        for z, atomic_weight in self._atomic_weights.items():
+            self.atomic_weights[z] = atomic_weight
+        self.atomic_weights.flags.writeable = False
+
+        self.symbols = tuple(self._symbols.get(z, "") for z in range(MAX_Z + 1))
+
+    @classmethod
+    def from_database(cls, database, reference=None):
+        """
+        Creates the table of all elements of a database.
+        The atomic weights are looked up in bulk.
+
+        :arg database: database (e.g. :data:`pyxray.data.database`)
+        :arg reference: reference of the atomic weights and symbols,
+            ``None`` for the default reference
+        """
+        zs = list(range(1, MAX_Z + 1))
+        values = database.element_atomic_weights(zs, reference)
+        atomic_weights = {
+            z: float(value) for z, value in zip(zs, values) if value == value
+        }
+
+        symbols = {}
+        for z in zs:
+            try:
+                symbols[z] = database.element_symbol(z, reference)
+            except NotFound:
+                continue
+
+        return cls(atomic_weights, symbols)
+
+    def __repr__(self):
+        return "<{}({:d} elements)>".format(self.__class__.__name__, len(self._symbols))
+
+    def atomic_weight(self, z):
+        """
+        Returns the atomic weight of an element.
+
+        :arg z: atomic number
+        :raises NotFound: if the element has no atomic weight
+        """
+        try:
+            return self._atomic_weights[z]
+        except (KeyError, TypeError):
+            raise NotFound("No atomic weight for element: {}".format(z))
+
+    def symbol(self, z):
+        """
+        Returns the symbol of an element.
+
+        :arg z: atomic number
+        :raises NotFound: if the element has no symbol
+        """
+        try:
+            return self._symbols[z]
+        except (KeyError, TypeError):
+            raise NotFound("No symbol for element: {}".format(z))
+
+    def atomic_number(self, symbol):
+        """
+        Returns the atomic number of an element from its symbol
+        (case sensitive, e.g. ``"Co"`` but not ``"CO"``).
+
+        :raises NotFound: if no element has this symbol
+        """
+        try:
+            return self._atomic_numbers[symbol]
+        except (KeyError, TypeError):
+            raise NotFound("Cannot find element: {}".format(symbol))
@@ -0,0 +1,318 @@
+"""
+Index of the X-ray lines of all elements, sorted by energy.
+"""
+
+__all__ = ["XrayLineIndex"]
+
+# Standard library modules.
+import bisect
+import numbers
+import operator
+
+# Third party modules.
+
+# Local modules.
+from pyxray.base import NotFound
+import pyxray.descriptor as descriptor
+
+# Globals and constants variables.
+MAX_Z = 118
+
+
+def _notation(database, xray_transition, notation):
+    try:
+        return database.xray_transition_notation(xray_transition, notation, "utf16")
+    except NotFound:
+        return None
+
+
+def _read_xray_lines(database, reference=None):
+    """
+    Returns the X-ray lines of all elements with an energy, i.e. the
+    X-ray transitions returned by
+    :meth:`element_xray_transitions <pyxray.base._DatabaseMixin.element_xray_transitions>`.
+    The energies, probabilities and relative weights are looked up in bulk.
+    """
+    zs = []
+    xray_transitions = []
+    for z in range(1, MAX_Z + 1):
+        try:
+            transitions = database.element_xray_transitions(z, reference=reference)
+        except NotFound:
+            continue
+
+        zs.extend([z] * len(transitions))
+        xray_transitions.extend(transitions)
+
+    if not zs:
+        return []
+
+    energies_eV = database.xray_transition_energies_eV(zs, xray_transitions, reference)
+    probabilities = database.xray_transition_probabilities(
+        zs, xray_transitions, reference
+    )
+    relative_weights = database.xray_transition_relative_weights(
+        zs, xray_transitions, reference
+    )
+
+    # Symbols and notations are shared by many lines
+    symbols = {}
+    notations = {}
+
+    xraylines = []
+    for index, (z, xray_transition) in enumerate(zip(zs, xray_transitions)):
+        energy_eV = energies_eV[index]
+        if energy_eV != energy_eV:  # No energy (nan)
+            continue
+
+        if z not in symbols:
+            symbols[z] = database.element_symbol(z)
+
+        if xray_transition not in notations:
+            iupac = _notation(database, xray_transition, "iupac")
+            siegbahn = _notation(database, xray_transition, "siegbahn") or iupac
+            notations[xray_transition] = (iupac, siegbahn)
+
+        iupac, siegbahn = notations[xray_transition]
+        if iupac is None:
+            continue
+
+        probability = probabilities[index]
+        relative_weight = relative_weights[index]
+
+        xraylines.append(
+            descriptor.XrayLine(
+                descriptor.Element.of(z),
+                xray_transition,
+                "{} {}".format(symbols[z], iupac),
+                "{} {}".format(symbols[z], siegbahn),
+                float(energy_eV),
+                None if probability != probability else float(probability),
+                None if relative_weight != relative_weight else float(relative_weight),
+            )
+        )
+
+    return xraylines
+
+
+def _is_transition_set(xray_transition):
+    return (
+        xray_transition.source_total_angular_momentum_nominator is None
+        or xray_transition.destination_total_angular_momentum_nominator is None
+    )
+
+
+class XrayLineIndex:
+    """
+    X-ray lines of all elements, sorted by energy, to find the lines within
+    an energy range by bisection.
+
+    The energies, atomic numbers, probabilities and relative weights of the
+    lines are also available as NumPy arrays, in the same order as the lines,
+    for vectorized searches (e.g. with :func:`numpy.searchsorted`).
+    A missing probability or relative weight is ``nan``.
+    The array :attr:`transition_sets` flags the lines of transition sets
+    (e.g. Kα), whose lines are also in the index.
+
+    An index is usually created from a database with :meth:`from_database`
+    or retrieved with
+    :meth:`xray_line_index <pyxray.base._DatabaseMixin.xray_line_index>`.
+
+    :arg xraylines: iterable of :class:`XrayLine <pyxray.descriptor.XrayLine>`
+        with an energy
+    """
+
+    def __init__(self, xraylines):
+        # NumPy is only imported when needed to keep "import pyxray" fast
+        import numpy
+
+        self.xraylines = tuple(
+            sorted(xraylines, key=operator.attrgetter("energy_eV", "atomic_number"))
+        )
+
+        # Plain lists are faster than arrays to bisect and filter a few lines
+        self._energies_eV = [xrayline.energy_eV for xrayline in self.xraylines]
+        self._atomic_numbers = [xrayline.atomic_number for xrayline in self.xraylines]
+
+        def _array(values):
+            return numpy.array(
+                [numpy.nan if value is None else value for value in values],
+                dtype=float,
+            )
+
+        self.energies_eV = numpy.array(self._energies_eV, dtype=float)
+        self.atomic_numbers = numpy.array(self._atomic_numbers, dtype=int)
+        self.probabilities = _array(xrayline.probability for xrayline in self.xraylines)
+        self.relative_weights = _array(
+            xrayline.relative_weight for xrayline in self.xraylines
+        )
+        self.transition_sets = numpy.array(
+            [_is_transition_set(xrayline.transition) for xrayline in self.xraylines],
+            dtype=bool,
+        )
+
+    @classmethod
+    def from_database(cls, database, reference=None):
+        """
+        Creates the index of the X-ray lines of all elements of a database.
+
+        :arg database: database (e.g. :data:`pyxray.data.database`)
+        :arg reference: reference of the energies, probabilities and
+            relative weights, ``None`` for the default reference
+        """
+        return cls(_read_xray_lines(database, reference))
+
+    def __len__(self):
+        return len(self.xraylines)
+
+    def __iter__(self):
+        return iter(self.xraylines)
+
+    def bounds(self, emin_eV, emax_eV):
+        """
+        Returns the first and last (exclusive) positions of the lines with
+        an energy between *emin_eV* and *emax_eV* (inclusive).
+
+        :rtype: :class:`tuple` of two :class:`int`
+        """
+        start = bisect.bisect_left(self._energies_eV, emin_eV)
+        stop = bisect.bisect_right(self._energies_eV, emax_eV, start)
+        return start, stop
+
+    def find(self, emin_eV, emax_eV, atomic_numbers=None, min_probability=0.0):
+        """
+        Returns the lines with an energy between *emin_eV* and *emax_eV*
+        (inclusive), sorted by energy.
+
+        :arg atomic_numbers: atomic numbers of the elements of the lines,
+            ``None`` for all elements
+        :arg min_probability: minimum probability of the lines.
+            If greater than 0, lines without probability are excluded.
+
+        :rtype: :class:`list` of :class:`XrayLine <pyxray.descriptor.XrayLine>`
+        """
+        start, stop = self.bounds(emin_eV, emax_eV)
+
+        if atomic_numbers is None:
+            xraylines = self.xraylines[start:stop]
+        else:
+            atomic_numbers = frozenset(atomic_numbers)
+            xraylines = [
+                self.xraylines[position]
+                for position in range(start, stop)
+                if self._atomic_numbers[position] in atomic_numbers
+            ]
+
+        if min_probability > 0.0:
+            xraylines = [
+                xrayline
+                for xrayline in xraylines
+                if xrayline.probability is not None
+                and xrayline.probability >= min_probability
+            ]
+
+        return list(xraylines)
+
+    def nearest(self, energies_eV, tolerance_eV, atomic_numbers=None, k=5):
+        """
+        Returns the positions of the *k* lines nearest to each energy,
+        within *tolerance_eV*.
+        The candidates of each energy are ranked by energy distance, then by
+        decreasing relative weight.
+        Transition sets (see :attr:`transition_sets`) are excluded.
+
+        All energies are searched at once: the distance of the *k*-th nearest
+        line of an energy is found among the *k* lines on each side of its
+        position in the sorted energies (see :func:`numpy.searchsorted`),
+        then the candidates are ranked among all the lines within this
+        distance, including the lines tied with the *k*-th one.
+
+        :arg energies_eV: energies to identify (in eV)
+        :arg tolerance_eV: maximum distance between an energy and its
+            candidates (in eV)
+        :arg atomic_numbers: atomic numbers of the elements of the candidates,
+            ``None`` for all elements
+        :arg k: maximum number of candidates per energy
+
+        :return: positions of the candidates in :attr:`xraylines`, an array
+            of shape ``(len(energies_eV), k)`` padded with -1
+        :rtype: :class:`numpy.ndarray`
+        """
+        import numpy
+
+        energies_eV = numpy.asarray(energies_eV, dtype=float).reshape(-1)
+
+        mask = ~self.transition_sets
+        if atomic_numbers is not None:
+            mask &= numpy.isin(self.atomic_numbers, list(atomic_numbers))
+        (positions,) = numpy.nonzero(mask)
+
+        if len(positions) == 0 or k <= 0:
+            return numpy.full((len(energies_eV), max(k, 0)), -1, dtype=int)
+
+        line_energies_eV = self.energies_eV[positions]
+        relative_weights = numpy.nan_to_num(self.relative_weights[positions], nan=0.0)
+
+        def window(starts, stops):
+            width = max(int(numpy.max(stops - starts, initial=0)), k)
+            columns = starts[:, numpy.newaxis] + numpy.arange(width)
+            valid = (columns >= 0) & (columns < stops[:, numpy.newaxis])
+            columns = numpy.clip(columns, 0, len(positions) - 1)
+
+            distances = line_energies_eV[columns] - energies_eV[:, numpy.newaxis]
+            distances = numpy.abs(distances)
+            distances[~valid | (distances > tolerance_eV)] = numpy.inf
+            return columns, distances
+
+        # The k lines on each side of each energy give the distance of
+        # the k-th nearest line
+        centers = numpy.searchsorted(line_energies_eV, energies_eV)
+        _columns, distances = window(
+            centers - k, numpy.minimum(centers + k, len(positions))
+        )
+        max_distances = numpy.sort(distances, axis=-1)[:, k - 1]
+        max_distances = numpy.where(
+            numpy.isfinite(max_distances), max_distances, tolerance_eV
+        )
+
+        # All the lines within this distance, with some slack for the
+        # rounding of the bounds, as lines tied with the k-th one may be
+        # further than k lines away
+        slack = 1e-9 * (numpy.abs(energies_eV) + max_distances)
+        starts = numpy.searchsorted(
+            line_energies_eV, energies_eV - max_distances - slack, side="left"
+        )
+        stops = numpy.searchsorted(
+            line_energies_eV, energies_eV + max_distances + slack, side="right"
+        )
+        columns, distances = window(starts, stops)
+
+        # Sort by distance, then by decreasing relative weight
+        order = numpy.lexsort((-relative_weights[columns], distances), axis=-1)[:, :k]
+        rows = numpy.arange(len(energies_eV))[:, numpy.newaxis]
+        found = numpy.isfinite(distances[rows, order])
+
+        return numpy.where(found, positions[columns[rows, order]], -1)
+
+
+def resolve_atomic_numbers(database, elements):
+    """
+    Returns the atomic numbers of elements, each one either an atomic number,
+    an object with an attribute :attr:`atomic_number` or a name or symbol
+    looked up in the database.
+    """
+    atomic_numbers = []
+    for element in elements:
+        if type(element) is int:  # Fast path
+            atomic_numbers.append(element)
+            continue
+
+        if hasattr(element, "atomic_number"):
+            element = element.atomic_number
+
+        if isinstance(element, numbers.Integral):
+            atomic_numbers.append(int(element))
+        else:
+            atomic_numbers.append(database.element_atomic_number(element))
+
+    return atomic_numbers
@@ -0,0 +1,266 @@
+"""
+Detection of the overlaps (interferences) between the X-ray lines of the
+elements of a sample, for a detector of given energy resolution.
+
+The lines are taken from the index of all X-ray lines sorted by energy
+(see :meth:`xray_line_index <pyxray.base._DatabaseMixin.xray_line_index>`).
+The overlapping pairs are found in a single sweep over the sorted energies,
+with :func:`numpy.searchsorted`, instead of comparing every pair of lines.
+"""
+
+__all__ = [
+    "ConstantResolution",
+    "EdsResolution",
+    "Overlap",
+    "Overlaps",
+    "find_overlapping_pairs",
+    "find_overlaps",
+]
+
+# Standard library modules.
+import collections
+
+# Third party modules.
+import numpy
+
+# Local modules.
+from pyxray.lineindex import MAX_Z, resolve_atomic_numbers
+
+# Globals and constants variables.
+MN_KA_ENERGY_eV = 5898.7
+
+Overlap = collections.namedtuple(
+    "Overlap", ["xrayline1", "xrayline2", "separation_eV", "fwhm_eV", "weight"]
+)
+Overlap.__doc__ = """
+Pair of overlapping X-ray lines, where *xrayline1* has the lower energy.
+*fwhm_eV* is the FWHM of the detector at the energy of *xrayline2* and
+*weight* the product of the intensities of the lines.
+"""
+
+
+class ConstantResolution:
+    """
+    Detector resolution independent of the energy, e.g. of a WDS spectrometer
+    over a narrow energy range.
+
+    :arg fwhm_eV: full width at half maximum (in eV)
+    """
+
+    def __init__(self, fwhm_eV):
+        self.fwhm_eV = fwhm_eV
+
+    def __repr__(self):
+        return "{}(fwhm={:g} eV)".format(self.__class__.__name__, self.fwhm_eV)
+
+    def __call__(self, energies_eV):
+        return numpy.full(numpy.shape(energies_eV), float(self.fwhm_eV))
+
+
+class EdsResolution:
+    """
+    Resolution of an energy dispersive spectrometer (EDS), given by its
+    full width at half maximum at the Mn Kα energy::
+
+        FWHM(E) ** 2 = 2.5 * (E - E_MnKa) + FWHM_MnKa ** 2
+
+    :arg fwhm_mnka_eV: full width at half maximum at Mn Kα (in eV)
+    :arg min_fwhm_eV: minimum full width at half maximum (in eV), at low
+        energies where the expression above is not valid
+    """
+
+    def __init__(self, fwhm_mnka_eV=130.0, min_fwhm_eV=30.0):
+        self.fwhm_mnka_eV = fwhm_mnka_eV
+        self.min_fwhm_eV = min_fwhm_eV
+
+    def __repr__(self):
+        return "{}(fwhm={:g} eV at Mn Ka)".format(
+            self.__class__.__name__, self.fwhm_mnka_eV
+        )
+
+    def __call__(self, energies_eV):
+        energies_eV = numpy.asarray(energies_eV, dtype=float)
+        squares = 2.5 * (energies_eV - MN_KA_ENERGY_eV) + self.fwhm_mnka_eV**2
+        return numpy.maximum(numpy.sqrt(numpy.maximum(squares, 0.0)), self.min_fwhm_eV)
+
+
+def find_overlapping_pairs(energies_eV, fwhms_eV, nfwhm=1.0):
+    """
+    Returns the pairs of sorted energies *i* < *j* which are within
+    *nfwhm* times the FWHM of the higher energy, i.e.
+    ``energies_eV[j] - energies_eV[i] <= nfwhm * fwhms_eV[j]``.
+
+    For each energy, the first energy of the range overlapping it is found by
+    bisection; the pairs are the ranges of all energies, so the cost is
+    proportional to the number of energies and pairs.
+
+    :arg energies_eV: energies sorted in increasing order (in eV)
+    :arg fwhms_eV: full width at half maximum at each energy (in eV)
+    :arg nfwhm: number of FWHMs between overlapping energies
+
+    :return: positions of the lower and higher energies of each pair
+    :rtype: :class:`tuple` of two :class:`numpy.ndarray`
+    """
+    energies_eV = numpy.asarray(energies_eV, dtype=float)
+    fwhms_eV = numpy.asarray(fwhms_eV, dtype=float)
+
+    starts = numpy.searchsorted(energies_eV, energies_eV - nfwhm * fwhms_eV, "left")
+    counts = numpy.arange(len(energies_eV)) - starts
+    counts = numpy.maximum(counts, 0)
+
+    seconds = numpy.repeat(numpy.arange(len(energies_eV)), counts)
+    offsets = numpy.arange(counts.sum()) - numpy.repeat(
+        numpy.cumsum(counts) - counts, counts
+    )
+    firsts = numpy.repeat(starts, counts) + offsets
+
+    return firsts, seconds
+
+
+class Overlaps:
+    """
+    Pairs of overlapping X-ray lines, stored as arrays.
+    The pairs are sorted by the energy of their second line.
+
+    Iterating yields :class:`Overlap` tuples; the arrays can be used directly
+    for large maps (e.g. to sort the pairs by weight with
+    :func:`numpy.argsort`).
+
+    :arg xraylines: X-ray lines, sorted by energy
+    :arg firsts: positions of the first (lower energy) line of each pair
+    :arg seconds: positions of the second (higher energy) line of each pair
+    :arg separations_eV: energy between the lines of each pair (in eV)
+    :arg fwhms_eV: full width at half maximum at the second line (in eV)
+    :arg weights: weight of each pair
+    """
+
+    def __init__(self, xraylines, firsts, seconds, separations_eV, fwhms_eV, weights):
+        self.xraylines = xraylines
+        self.firsts = firsts
+        self.seconds = seconds
+        self.separations_eV = separations_eV
+        self.fwhms_eV = fwhms_eV
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.firsts)
+
+    def __getitem__(self, index):
+        return Overlap(
+            self.xraylines[self.firsts[index]],
+            self.xraylines[self.seconds[index]],
+            float(self.separations_eV[index]),
+            float(self.fwhms_eV[index]),
+            float(self.weights[index]),
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def _get_fractions(elements, database):
+    # Mass fractions of a composition, otherwise 1.0 for each element
+    mass_fractions = getattr(elements, "mass_fractions", None)
+    if mass_fractions is not None:
+        return dict(mass_fractions)
+
+    atomic_numbers = resolve_atomic_numbers(database, elements)
+    return dict.fromkeys(atomic_numbers, 1.0)
+
+
+def find_overlaps(
+    elements,
+    resolution,
+    nfwhm=1.0,
+    same_element=False,
+    min_weight=0.0,
+    reference=None,
+    database=None,
+):
+    """
+    Returns the pairs of overlapping X-ray lines of elements, i.e. the lines
+    whose energies are within *nfwhm* times the FWHM of the detector at
+    the higher energy.
+
+    The intensity of a line is its relative weight, multiplied by the mass
+    fraction of its element if *elements* is a
+    :class:`Composition <pyxray.composition.Composition>`.
+    Lines without relative weight have an intensity of 0.
+    The weight of a pair is the product of the intensities of its lines.
+    Transition sets (e.g. Kα) are excluded, as their lines are already
+    included.
+
+    Examples::
+
+        from pyxray.composition import Composition
+        from pyxray.overlap import EdsResolution, find_overlaps
+
+        overlaps = find_overlaps(Composition.from_formula("PbS"), EdsResolution(130.0))
+        for overlap in sorted(overlaps, key=lambda overlap: -overlap.weight)[:5]:
+            print(overlap.xrayline1, overlap.xrayline2, overlap.separation_eV)
+
+    :arg elements: :class:`Composition <pyxray.composition.Composition>`,
+        sequence of elements (atomic numbers, symbols, names or
+        :class:`Element <pyxray.descriptor.Element>` objects) or ``None``
+        for all elements
+    :arg resolution: callable returning the full width at half maximum of
+        the detector (in eV) for an array of energies (in eV), e.g.
+        :class:`EdsResolution` or :class:`ConstantResolution`
+    :arg nfwhm: number of FWHMs between overlapping lines
+    :arg same_element: whether to include the pairs of lines of the same
+        element
+    :arg min_weight: minimum weight of the pairs
+    :arg reference: reference of the energies and relative weights,
+        ``None`` for the default reference
+    :arg database: database, the current database of :mod:`pyxray.data`
+        if ``None``
+
+    :rtype: :class:`Overlaps`
+    """
+    if database is None:
+        import pyxray.data
+
+        database = pyxray.data.database
+
+    index = database.xray_line_index(reference)
+
+    mask = ~index.transition_sets
+
+    if elements is None:
+        fractions = numpy.ones(len(index))
+    else:
+        lookup = numpy.full(MAX_Z + 1, numpy.nan)
+        for z, fraction in _get_fractions(elements, database).items():
+            lookup[z] = fraction
+
+        fractions = lookup[index.atomic_numbers]
+        mask &= ~numpy.isnan(fractions)
+
+    (positions,) = numpy.nonzero(mask)
+    xraylines = [index.xraylines[position] for position in positions]
+    energies_eV = index.energies_eV[positions]
+    atomic_numbers = index.atomic_numbers[positions]
+    intensities = (
+        numpy.nan_to_num(index.relative_weights[positions], nan=0.0)
+        * fractions[positions]
+    )
+    fwhms_eV = numpy.asarray(resolution(energies_eV), dtype=float)
+
+    firsts, seconds = find_overlapping_pairs(energies_eV, fwhms_eV, nfwhm)
+    weights = intensities[firsts] * intensities[seconds]
+
+    keep = weights >= min_weight
+    if not same_element:
+        keep &= atomic_numbers[firsts] != atomic_numbers[seconds]
+    firsts = firsts[keep]
+    seconds = seconds[keep]
+
+    return Overlaps(
+        xraylines,
+        firsts,
+        seconds,
+        energies_eV[seconds] - energies_eV[firsts],
+        fwhms_eV[seconds],
+        weights[keep],
+    )
@@ -1,13 +1,15 @@
 # Standard library modules.
-import os
 import collections.abc
 import inspect
+import hashlib
+import pkgutil
 
 # Third party modules.
 import pkg_resources
 
 # Local modules.
 from pyxray.cbook import ProgressReportMixin
+from pyxray.parser.fetch import get_fetcher
 from pyxray.descriptor import AtomicSubshell, XrayTransition, Notation, Reference
 
 # Globals and constants variables.
@@ -130,16 +132,6 @@ ORBITAL = Notation("orbital")
 
 UNATTRIBUTED = Reference("unattributed")
 
-# Install cache
-try:
-    import requests_cache
-
-    dirpath = os.path.join(os.path.dirname(__file__), "..", "data")
-    filepath = os.path.join(dirpath, "cache")
-    requests_cache.install_cache(filepath)
-except ImportError:
-    pass
-
 
 class _Parser(collections.abc.Iterable, ProgressReportMixin):
     """
@@ -155,9 +147,74 @@ class _Parser(collections.abc.Iterable, ProgressReportMixin):
 
     Each parser should be registered in the setup.py under the entry point:
     `pyxray.parser`
+
+    The database is only rebuilt for the parsers whose fingerprint changed
+    (see :func:`compute_fingerprint`).
+    A parser should therefore declare its input data in :attr:`DATA_FILES`
+    and :attr:`DATA_URLS`.
+    """
+
+    #: Version of the parser, to increment to force the parser to run again
+    #: when its output changes for a reason not captured by its source code
+    #: or input data
+    VERSION = 1
+
+    #: Input files of the parser, relative to the ``pyxray/data`` folder
+    DATA_FILES = ()
+
+    #: URLs of the input data of the parser, downloaded with
+    #: :func:`pyxray.parser.fetch.fetch`
+    DATA_URLS = ()
+
+
+def compute_fingerprint(parser):
     """
+    Returns a fingerprint of the output of a parser, a hash of:
+
+    * the version of the parser (:attr:`_Parser.VERSION`)
+    * the source files of the parser class and its base classes within pyxray
+    * the content of its input files (:attr:`_Parser.DATA_FILES`)
+    * the URLs of its input data (:attr:`_Parser.DATA_URLS`) and the hashes
+      of their responses in the store of the current fetcher, if any
+      (see :meth:`DirectoryStore.digests <pyxray.parser.fetch.DirectoryStore.digests>`).
+      Data not downloaded yet cannot be hashed without downloading it.
+
+    Args:
+        parser (_Parser): parser instance
+
+    Returns:
+        str: hexadecimal digest
+    """
+    clasz = type(parser)
+
+    hasher = hashlib.sha256()
+    hasher.update("{}.{}".format(clasz.__module__, clasz.__qualname__).encode("utf8"))
+    hasher.update(str(parser.VERSION).encode("utf8"))
+
+    filepaths = []
+    for baseclass in inspect.getmro(clasz):
+        if not baseclass.__module__.startswith("pyxray."):
+            continue
+
+        filepath = inspect.getsourcefile(baseclass)
+        if filepath not in filepaths:
+            filepaths.append(filepath)
+
+    for filepath in filepaths:
+        with open(filepath, "rb") as fp:
+            hasher.update(fp.read())
+
+    for relpath in parser.DATA_FILES:
+        hasher.update(pkgutil.get_data("pyxray", "data/" + relpath))
+
+    digests = getattr(get_fetcher().store, "digests", None)
+    for url in parser.DATA_URLS:
+        hasher.update(url.encode("utf8"))
+        if digests is not None:
+            for digest in digests(url):
+                hasher.update(digest.encode("ascii"))
 
-    pass
+    return hasher.hexdigest()
 
 
 def find_parsers():
@@ -67,6 +67,9 @@ subshell_order = [
 
 
 class CampbellAtomicSubshellRadiativeWidthParser(base._Parser):
+
+    DATA_FILES = ("campbell.asc",)
+
     def __iter__(self):
         relpath = os.path.join("..", "data", "campbell.asc")
         content = pkgutil.get_data(__name__, relpath).decode("utf8")
@@ -54,6 +54,9 @@ _SUBSHELL_LOOKUP = {
 
 # noinspection PyArgumentList
 class DtsaSubshellParser(base._Parser):
+
+    DATA_FILES = ("dtsa_subshell.csv",)
+
     def __iter__(self):
         relative_path = os.path.join("..", "data", "dtsa_subshell.csv")
         content = pkgutil.get_data(__name__, relative_path).decode("utf8")
@@ -168,6 +171,9 @@ _TRANSITION_LOOKUP = {
 
 # noinspection PyArgumentList
 class DtsaLineParser(base._Parser):
+
+    DATA_FILES = ("dtsa_line.csv",)
+
     def __iter__(self):
         relative_path = os.path.join("..", "data", "dtsa_line.csv")
         content = pkgutil.get_data(__name__, relative_path).decode("utf8")
@@ -0,0 +1,428 @@
+"""
+Download layer of the parsers, replaying responses from a local store.
+
+The responses of the network parsers (e.g. :mod:`pyxray.parser.perkins1991`
+and :mod:`pyxray.parser.wikipedia`) are saved in a store, keyed by their URL
+and parameters.
+Once a response is stored, it is read back from the disk instead of being
+downloaded again.
+
+The store can be filled once with the ``prefetch`` command::
+
+    python -m pyxray.parser.fetch
+
+On a machine without network, the database can then be built in strict
+offline mode, where a missing response raises :class:`OfflineError`
+instead of waiting on the network::
+
+    PYXRAY_OFFLINE=1 python setup.py build_py
+
+Environment variables:
+
+* ``PYXRAY_FETCH_DIR``: folder of the store (default: ``pyxray/data/fetch``)
+* ``PYXRAY_OFFLINE``: if ``1``, ``true`` or ``yes``, enables the strict
+  offline mode
+"""
+
+__all__ = [
+    "OfflineError",
+    "DirectoryStore",
+    "Fetcher",
+    "create_key",
+    "fetch",
+    "get_fetcher",
+    "set_fetcher",
+    "prefetch",
+]
+
+# Standard library modules.
+import os
+import json
+import hashlib
+import logging
+import time
+import tempfile
+import argparse
+import threading
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRPATH = os.path.join(os.path.dirname(__file__), "..", "data", "fetch")
+DEFAULT_TIMEOUT_s = 60.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_s = 1.0
+
+#: HTTP status codes of the responses for which a download is retried
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+TRUE_VALUES = frozenset(["1", "true", "yes", "on"])
+
+
+class OfflineError(Exception):
+    """
+    Raised in strict offline mode when a response is not in the store.
+    """
+
+
+def create_key(url, params=None):
+    """
+    Returns the key of a request in a store, a hash of its URL and parameters.
+    The order of the parameters does not matter.
+
+    Args:
+        url (str): URL
+        params (dict, optional): query parameters
+
+    Returns:
+        str: hexadecimal digest
+    """
+    items = sorted((str(key), str(value)) for key, value in (params or {}).items())
+    text = json.dumps([url, items])
+    return hashlib.sha256(text.encode("utf8")).hexdigest()
+
+
+class DirectoryStore:
+    """
+    Content-addressed store of responses in a folder.
+
+    The content of each response is saved once under its SHA-256 hash
+    (``objects/<hash[:2]>/<hash>``) and the key of each request points to
+    the hash of its content (``index/<key>.json``).
+    The content is verified against its hash when it is read back.
+
+    Any object with the methods :meth:`get` and :meth:`put` can be used as
+    store of a :class:`Fetcher`.
+
+    Args:
+        dirpath (str): folder of the store, created if it does not exist
+    """
+
+    def __init__(self, dirpath):
+        self.dirpath = dirpath
+
+    def _get_index_path(self, key):
+        return os.path.join(self.dirpath, "index", key + ".json")
+
+    def _get_object_path(self, digest):
+        return os.path.join(self.dirpath, "objects", digest[:2], digest)
+
+    def _write(self, filepath, content):
+        # Write then rename, so that an interrupted write is never read back
+        dirpath = os.path.dirname(filepath)
+        os.makedirs(dirpath, exist_ok=True)
+
+        fd, tmppath = tempfile.mkstemp(dir=dirpath)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(content)
+            os.replace(tmppath, filepath)
+        except:
+            os.remove(tmppath)
+            raise
+
+    def __contains__(self, key):
+        return os.path.exists(self._get_index_path(key))
+
+    def get(self, key):
+        """
+        Returns the content stored for a key, ``None`` if the key is not
+        in the store or if its content is corrupted.
+
+        Args:
+            key (str): key of the request (see :func:`create_key`)
+
+        Returns:
+            bytes: content
+        """
+        try:
+            with open(self._get_index_path(key), "r") as fp:
+                entry = json.load(fp)
+            with open(self._get_object_path(entry["sha256"]), "rb") as fp:
+                content = fp.read()
+        except FileNotFoundError:
+            return None
+
+        if hashlib.sha256(content).hexdigest() != entry["sha256"]:
+            logger.warning("Corrupted content for {}".format(entry["url"]))
+            return None
+
+        return content
+
+    def digests(self, url):
+        """
+        Returns the hashes of the contents stored for the requests to a URL,
+        with any parameters, sorted by key of the request.
+        The hashes change when a response is downloaded again with
+        another content.
+
+        Args:
+            url (str): URL of the requests
+
+        Returns:
+            list: hexadecimal digests
+        """
+        try:
+            filenames = sorted(os.listdir(os.path.join(self.dirpath, "index")))
+        except FileNotFoundError:
+            return []
+
+        digests = []
+        for filename in filenames:
+            with open(os.path.join(self.dirpath, "index", filename), "r") as fp:
+                entry = json.load(fp)
+            if entry["url"] == url:
+                digests.append(entry["sha256"])
+
+        return digests
+
+    def put(self, key, url, params, content):
+        """
+        Stores the content of a response.
+
+        Args:
+            key (str): key of the request (see :func:`create_key`)
+            url (str): URL of the request
+            params (dict): query parameters of the request, or ``None``
+            content (bytes): content of the response
+        """
+        digest = hashlib.sha256(content).hexdigest()
+
+        filepath = self._get_object_path(digest)
+        if not os.path.exists(filepath):
+            self._write(filepath, content)
+
+        entry = {"url": url, "params": params, "sha256": digest}
+        self._write(self._get_index_path(key), json.dumps(entry).encode("utf8"))
+
+
+class Fetcher:
+    """
+    Downloads the responses of the parsers, replaying them from a store.
+
+    Downloads which fail with a connection error, a timeout or one of the
+    :data:`RETRY_STATUS_CODES` are retried with an exponential backoff
+    (``backoff * 2 ** attempt`` seconds, or the ``Retry-After`` delay of the
+    server).
+    Each thread downloads with its own session, so that connections to a
+    server are kept alive between downloads.
+    A fetcher can therefore be used from several threads at once.
+
+    Args:
+        store: store of the responses (e.g. :class:`DirectoryStore`).
+            If ``None``, responses are always downloaded.
+        offline (bool): if ``True``, raises :class:`OfflineError` when a
+            response is not in the store instead of downloading it
+        timeout (float): timeout of a download in seconds
+        retries (int): maximum number of retries of a download
+        backoff (float): initial delay between retries in seconds
+    """
+
+    def __init__(
+        self,
+        store=None,
+        offline=False,
+        timeout=DEFAULT_TIMEOUT_s,
+        retries=DEFAULT_RETRIES,
+        backoff=DEFAULT_BACKOFF_s,
+    ):
+        self.store = store
+        self.offline = offline
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self._local = threading.local()
+
+    def _get_session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+
+            session = self._local.session = requests.Session()
+        return session
+
+    def _get_delay(self, attempt, response=None):
+        delay = self.backoff * 2**attempt
+
+        if response is not None:
+            try:
+                delay = max(delay, float(response.headers["Retry-After"]))
+            except (KeyError, ValueError):
+                pass
+
+        return delay
+
+    def _download(self, url, params, verify):
+        import requests
+
+        session = self._get_session()
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+
+            try:
+                r = session.get(url, params=params, timeout=self.timeout, verify=verify)
+            except (requests.ConnectionError, requests.Timeout) as ex:
+                if last_attempt:
+                    raise
+                delay = self._get_delay(attempt)
+                logger.info("Retry {} in {:.1f} s ({})".format(url, delay, ex))
+            else:
+                if r.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    r.raise_for_status()
+                    return r.content
+                delay = self._get_delay(attempt, r)
+                logger.info(
+                    "Retry {} in {:.1f} s (HTTP {})".format(url, delay, r.status_code)
+                )
+
+            time.sleep(delay)
+
+    def fetch(self, url, params=None, verify=True):
+        """
+        Returns the content of the response to a GET request.
+
+        Args:
+            url (str): URL
+            params (dict, optional): query parameters
+            verify (bool): whether to verify the TLS certificate of the server
+
+        Returns:
+            bytes: content
+
+        Raises:
+            OfflineError: in offline mode, if the response is not in the store
+            requests.HTTPError: if the server returns an error
+        """
+        key = create_key(url, params)
+
+        if self.store is not None:
+            content = self.store.get(key)
+            if content is not None:
+                logger.debug("Replay {} from store".format(url))
+                return content
+
+        if self.offline:
+            raise OfflineError(
+                "{} (params: {}) is not in the store. "
+                "Run python -m pyxray.parser.fetch to prefetch it".format(url, params)
+            )
+
+        logger.debug("Download {}".format(url))
+        content = self._download(url, params, verify)
+
+        if self.store is not None:
+            self.store.put(key, url, params, content)
+
+        return content
+
+
+def _create_default_fetcher():
+    dirpath = os.environ.get("PYXRAY_FETCH_DIR", DEFAULT_DIRPATH)
+    offline = os.environ.get("PYXRAY_OFFLINE", "").lower() in TRUE_VALUES
+    return Fetcher(DirectoryStore(dirpath), offline)
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher():
+    """
+    Returns the fetcher used by :func:`fetch`.
+    By default, the fetcher is created from the environment variables
+    ``PYXRAY_FETCH_DIR`` and ``PYXRAY_OFFLINE``.
+    """
+    global _fetcher
+
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = _create_default_fetcher()
+        return _fetcher
+
+
+def set_fetcher(fetcher):
+    """
+    Sets the fetcher used by :func:`fetch`.
+    If ``None``, the default fetcher is created again on next use.
+
+    Args:
+        fetcher (Fetcher): fetcher
+    """
+    global _fetcher
+
+    with _fetcher_lock:
+        _fetcher = fetcher
+
+
+def fetch(url, params=None, verify=True):
+    """
+    Returns the content of the response to a GET request with the current
+    fetcher (see :meth:`Fetcher.fetch`).
+    """
+    return get_fetcher().fetch(url, params, verify)
+
+
+def prefetch(parsers, fetcher=None):
+    """
+    Fills the store with the responses of the network parsers, i.e. the
+    parsers declaring :attr:`DATA_URLS <pyxray.parser.base._Parser.DATA_URLS>`.
+    Each of these parsers is run once, with the offline mode disabled.
+
+    Args:
+        parsers (list): tuples of name and parser instance
+        fetcher (Fetcher, optional): fetcher with the store to fill.
+            If ``None``, the current fetcher is used.
+    """
+    if fetcher is None:
+        fetcher = get_fetcher()
+
+    previous_fetcher = get_fetcher()
+    set_fetcher(
+        Fetcher(
+            fetcher.store,
+            offline=False,
+            timeout=fetcher.timeout,
+            retries=fetcher.retries,
+            backoff=fetcher.backoff,
+        )
+    )
+
+    try:
+        for name, parser in parsers:
+            if not parser.DATA_URLS:
+                continue
+
+            logger.info("Prefetch {}".format(name))
+            for _prop in parser:
+                pass
+
+    finally:
+        set_fetcher(previous_fetcher)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Download the data of the network parsers in a local store"
+    )
+    parser.add_argument(
+        "--dirpath",
+        default=os.environ.get("PYXRAY_FETCH_DIR", DEFAULT_DIRPATH),
+        help="Folder of the store",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    from pyxray.parser.base import find_parsers
+
+    prefetch(find_parsers(), Fetcher(DirectoryStore(args.dirpath)))
+
+
+if __name__ == "__main__":
+    main()
@@ -109,6 +109,9 @@ _TRANSITION_LOOKUP = {
 
 
 class JEOLTransitionParser(base._Parser):
+
+    DATA_FILES = ("lambda.asc",)
+
     def __iter__(self):
         relpath = os.path.join("..", "data", "lambda.asc")
         content = pkgutil.get_data(__name__, relpath).decode("utf8")
@@ -28,6 +28,9 @@ NIST = Reference(
 
 
 class NISTElementAtomicWeightParser(base._Parser):
+
+    DATA_FILES = ("nist_element_atomic_weight.html",)
+
     def __iter__(self):
         relpath = os.path.join("..", "data", "nist_element_atomic_weight.html")
         content = pkgutil.get_data(__name__, relpath).decode("utf8")
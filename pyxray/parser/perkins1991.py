@@ -5,13 +5,19 @@ Parser for the Evaluated Atomic Data Library (EADL)
 
 # Standard library modules.
 import re
+import mmap
 import logging
+import functools
 
 # Third party modules.
-import requests
 
 # Local modules.
-from pyxray.descriptor import Reference, Element, XrayTransition
+from pyxray.descriptor import (
+    Reference,
+    Element,
+    XrayTransition,
+    NonRadiativeTransition,
+)
 from pyxray.property import (
     ElementAtomicWeight,
     AtomicSubshellBindingEnergy,
@@ -20,8 +26,11 @@ from pyxray.property import (
     AtomicSubshellOccupancy,
     XrayTransitionEnergy,
     XrayTransitionProbability,
+    NonRadiativeTransitionEnergy,
+    NonRadiativeTransitionProbability,
 )
 import pyxray.parser.base as base
+from pyxray.parser.fetch import fetch
 
 # Globals and constants variables.
 logger = logging.getLogger(__name__)
@@ -45,7 +54,7 @@ def float_(text):
     base, sign, exp = FLOAT_PATTERN.match(text).groups()
     base = float(base)
     exp = float(exp) if sign == "+" else -float(exp)
-    return base * 10 ** exp
+    return base * 10**exp
 
 
 # Conversion from EADL to AtomicSubshell descriptor
@@ -123,261 +132,285 @@ SEPERATOR = "
 
 MAX_Z = 100
 
+#: Width of a numeric field of the EADL data lines, e.g. ``" 1.00790+ 0"``
+FIELD_WIDTH = 11
 
-class Perkins1991Parser(base._Parser):
-    def __iter__(self):
-        r = requests.get(EADL_URL, stream=True, verify=False)
+FIELDS_PATTERN = re.compile(rb"(?:[ -]\d\.\d{5}[+-][ \d]\d)*")
 
-        try:
-            rows = []
-            for line in r.iter_lines():
-                line = line.decode("ascii")
+ZERO = ord("0")
+SPACE = ord(" ")
+MINUS = ord("-")
+NEWLINE = ord("\n")
 
-                if line == SEPERATOR:
-                    yield from self._iter_rows(rows)
 
-                    element = self._extract_element(rows)
-                    self.update(int(element.z / MAX_Z * 100.0))
+def parse_fields(lines, ncolumn):
+    """
+    Parses the numeric fields of data lines in bulk.
 
-                    rows = []
-                    continue
+    The fields are fixed-width, with a mantissa of 6 digits and an exponent
+    of 2 digits without ``E`` (e.g. ``" 1.00790+ 0"``).
+    They are converted together as an array of characters.
+    If a field does not have this format, all fields are converted one by
+    one with :func:`float_`.
+    In both cases, the values are identical.
 
-                rows.append(line)
+    Args:
+        lines (list): data lines (:class:`bytes`)
+        ncolumn (int): number of fields to parse per line
 
-        finally:
-            r.close()
+    Returns:
+        :class:`numpy.ndarray`: values, one row per line
+    """
+    import numpy as np
 
-    def _iter_rows(self, rows):
-        yield from self._parse_atomic_weight(rows)
-        yield from self._parse_atomic_subshell_binding_energy(rows)
-        yield from self._parse_atomic_subshell_radiative_width(rows)
-        #        yield from self._parse_atomic_subshell_nonradiative_width(rows)
-        yield from self._parse_atomic_subshell_occupaqncy(rows)
-        yield from self._parse_radiative_transition(rows)
+    width = FIELD_WIDTH * ncolumn
+    buffer = b"".join(line[:width].ljust(width) for line in lines)
 
-    #        yield from self._parse_nonradiative_transition(rows)
+    if not FIELDS_PATTERN.fullmatch(buffer):
+        return np.array(
+            [
+                [
+                    float_(line[i : i + FIELD_WIDTH].decode("ascii"))
+                    for i in range(0, width, FIELD_WIDTH)
+                ]
+                for line in lines
+            ]
+        )
 
-    def _extract_element(self, rows):
-        return Element(int(rows[0][0:3]))
+    chars = np.frombuffer(buffer, np.uint8).reshape(len(lines), ncolumn, FIELD_WIDTH)
+    digits = chars - ZERO
+    mantissa_digits = digits[..., [1, 3, 4, 5, 6, 7]]
+    exponent_digits = np.where(chars[..., 9] == SPACE, 0, digits[..., 9])
 
-    def _extract_reaction_descriptor(self, rows):
-        return int(rows[1][0:2])
+    # Integer mantissa divided by 1e5 is rounded like float("d.ddddd")
+    mantissa = mantissa_digits.astype(np.int64) @ 10 ** np.arange(5, -1, -1)
+    mantissa = np.where(chars[..., 0] == MINUS, -mantissa, mantissa) / 1e5
 
-    def _extract_reaction_modifier(self, rows):
-        return int(rows[1][5:8])
+    exponent = exponent_digits.astype(np.int64) * 10 + digits[..., 10]
+    exponent = np.where(chars[..., 8] == MINUS, -exponent, exponent)
 
-    def _extract_reaction_property(self, rows):
-        return int(rows[1][2:5])
+    return mantissa * _get_powers()[exponent + 99]
 
-    def _extract_outgoing_particle(self, rows):
-        return int(rows[0][10:12])
 
-    def _extract_source_subshell(self, rows):
-        return ATOMIC_SUBSHELLS[int(float_(rows[0][0:11]))]
+@functools.lru_cache(maxsize=None)
+def _get_powers():
+    # Powers of ten from 1e-99 to 1e99, computed as in float_()
+    import numpy as np
 
-    def _extract_secondary_destination_subshell(self, rows):
-        return ATOMIC_SUBSHELLS[int(float_(rows[0][11:22]))]
+    return np.array([10 ** float(exp) for exp in range(-99, 100)])
 
-    def _extract_destination_subshell(self, rows):
-        return ATOMIC_SUBSHELLS[int(float_(rows[1][21:32]))]
 
-    def _parse_atomic_weight(self, rows):
-        # Note: Fake descriptor and property. Selected just in order to only
-        # have one entry for the atomic weight
-        reaction_descriptor = self._extract_reaction_descriptor(rows)
-        if reaction_descriptor != REACTION_DESCRIPTOR_SUBSHELL:
-            return
+@functools.lru_cache(maxsize=None)
+def _create_xray_transition(source_subshell, destination_subshell):
+    # Same transitions for most elements
+    return XrayTransition(source_subshell, destination_subshell)
 
-        reaction_property = self._extract_reaction_property(rows)
-        if reaction_property != REACTION_PROPERTY_NUMBER_ELECTRON:
-            return
 
-        element = self._extract_element(rows)
-        value = float_(rows[0][13:24])
-        prop = ElementAtomicWeight(PERKINS1991, element, value)
-        logger.debug("Parsed: {0}".format(prop))
-        yield prop
+@functools.lru_cache(maxsize=None)
+def _create_nonradiative_transition(
+    source_subshell, destination_subshell, secondary_destination_subshell
+):
+    return NonRadiativeTransition(
+        source_subshell, destination_subshell, secondary_destination_subshell
+    )
 
-    def _parse_atomic_subshell_binding_energy(self, rows):
-        reaction_descriptor = self._extract_reaction_descriptor(rows)
-        if reaction_descriptor != REACTION_DESCRIPTOR_SUBSHELL:
-            return
 
-        reaction_modifier = self._extract_reaction_modifier(rows)
-        if reaction_modifier != REACTION_MODIFIER_NONE:
-            return
+class Perkins1991Parser(base._Parser):
+    """
+    Parses the EADL file, downloaded from :data:`EADL_URL`, or a local copy
+    of the file, which is then memory-mapped.
 
-        outgoing_particle = self._extract_outgoing_particle(rows)
-        if outgoing_particle != OUTGOING_PARTICLE_NONE:
-            return
+    The file is read block by block.
+    The header of each block is decoded once and the block is dispatched to
+    the handler of its reaction (see :attr:`HANDLERS`); other blocks are
+    skipped without being decoded.
 
-        reaction_property = self._extract_reaction_property(rows)
-        if reaction_property != REACTION_PROPERTY_BINDING_ENERGY:
-            return
+    Args:
+        filepath (str, optional): path of a local copy of ``eadl.all``
+    """
 
-        element = self._extract_element(rows)
+    DATA_URLS = (EADL_URL,)
 
-        for row in rows[2:]:
-            atomic_subshell = self._extract_source_subshell([row])
-            value_eV = float_(row[11:22]) * 1e6
-            prop = AtomicSubshellBindingEnergy(
-                PERKINS1991, element, atomic_subshell, value_eV
-            )
-            logger.debug("Parsed: {0}".format(prop))
-            yield prop
+    def __init__(self, filepath=None):
+        self.filepath = filepath
 
-    def _parse_atomic_subshell_radiative_width(self, rows):
-        reaction_descriptor = self._extract_reaction_descriptor(rows)
-        if reaction_descriptor != REACTION_DESCRIPTOR_SUBSHELL:
+    def __iter__(self):
+        if self.filepath is None:
+            yield from self._iter_buffer(fetch(EADL_URL, verify=False))
             return
 
-        reaction_modifier = self._extract_reaction_modifier(rows)
-        if reaction_modifier != REACTION_MODIFIER_NONE:
-            return
+        with open(self.filepath, "rb") as fp:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield from self._iter_buffer(buffer)
+
+    def _iter_blocks(self, buffer):
+        """
+        Yields the blocks of the buffer, without their separator line.
+        """
+        separator = SEPERATOR.encode("ascii")
+
+        start = 0
+        position = buffer.find(separator)
+        while position >= 0:
+            end = position + len(separator)
+
+            # Separator must be a whole line
+            line_start = position == 0 or buffer[position - 1] == NEWLINE
+            line_end = buffer[end : end + 1] in (b"\n", b"\r", b"")
+            if line_start and line_end:
+                yield buffer[start:position]
+                start = buffer.find(b"\n", end) + 1 or len(buffer)
+
+            position = buffer.find(separator, end)
+
+    def _iter_buffer(self, buffer):
+        # Formatting the properties is slower than parsing them
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        for block in self._iter_blocks(buffer):
+            header0, header1, data = block.split(b"\n", 2)
+
+            z = int(header0[0:3])
+
+            # Reaction descriptor, property, modifier and outgoing particle
+            key = (
+                int(header1[0:2]),
+                int(header1[2:5]),
+                int(header1[5:8]),
+                int(header0[10:12]),
+            )
 
-        outgoing_particle = self._extract_outgoing_particle(rows)
-        if outgoing_particle != OUTGOING_PARTICLE_NONE:
-            return
+            handler = self.HANDLERS.get(key)
+            if handler is not None:
+                lines = data.splitlines()
+                for prop in handler(self, Element(z), header0, header1, lines):
+                    if debug:
+                        logger.debug("Parsed: {0}".format(prop))
+                    yield prop
 
-        reaction_property = self._extract_reaction_property(rows)
-        if reaction_property != REACTION_PROPERTY_RADIATIVE_WIDTH:
-            return
+            self.update(int(z / MAX_Z * 100.0))
 
-        element = self._extract_element(rows)
+    def _parse_atomic_subshell_values(self, lines):
+        values = parse_fields(lines, 2)
+        atomic_subshells = [ATOMIC_SUBSHELLS[int(key)] for key in values[:, 0]]
+        return zip(atomic_subshells, values[:, 1].tolist())
 
-        for row in rows[2:]:
-            atomic_subshell = self._extract_source_subshell([row])
-            value_eV = float_(row[11:22]) * 1e6
-            prop = AtomicSubshellRadiativeWidth(
-                PERKINS1991, element, atomic_subshell, value_eV
+    def _parse_number_electron(self, element, header0, header1, lines):
+        # Note: Fake descriptor and property. Selected just in order to only
+        # have one entry for the atomic weight
+        value = float_(header0[13:24].decode("ascii"))
+        prop = ElementAtomicWeight(PERKINS1991, element, value)
+        yield prop
+
+        for atomic_subshell, value in self._parse_atomic_subshell_values(lines):
+            prop = AtomicSubshellOccupancy(
+                PERKINS1991, element, atomic_subshell, int(value)
             )
-            logger.debug("Parsed: {0}".format(prop))
             yield prop
 
-    def _parse_atomic_subshell_nonradiative_width(self, rows):
-        reaction_descriptor = self._extract_reaction_descriptor(rows)
-        if reaction_descriptor != REACTION_DESCRIPTOR_SUBSHELL:
-            return
-
-        reaction_modifier = self._extract_reaction_modifier(rows)
-        if reaction_modifier != REACTION_MODIFIER_NONE:
-            return
-
-        outgoing_particle = self._extract_outgoing_particle(rows)
-        if outgoing_particle != OUTGOING_PARTICLE_NONE:
-            return
-
-        reaction_property = self._extract_reaction_property(rows)
-        if reaction_property != REACTION_PROPERTY_NONRADIATIVE_WIDTH:
-            return
+    def _parse_atomic_subshell_binding_energy(self, element, header0, header1, lines):
+        for atomic_subshell, value in self._parse_atomic_subshell_values(lines):
+            prop = AtomicSubshellBindingEnergy(
+                PERKINS1991, element, atomic_subshell, value * 1e6
+            )
+            yield prop
 
-        element = self._extract_element(rows)
+    def _parse_atomic_subshell_radiative_width(self, element, header0, header1, lines):
+        for atomic_subshell, value in self._parse_atomic_subshell_values(lines):
+            prop = AtomicSubshellRadiativeWidth(
+                PERKINS1991, element, atomic_subshell, value * 1e6
+            )
+            yield prop
 
-        for row in rows[2:]:
-            atomic_subshell = self._extract_source_subshell([row])
-            value_eV = float_(row[11:22]) * 1e6
+    def _parse_atomic_subshell_nonradiative_width(
+        self, element, header0, header1, lines
+    ):
+        for atomic_subshell, value in self._parse_atomic_subshell_values(lines):
             prop = AtomicSubshellNonRadiativeWidth(
-                PERKINS1991, element, atomic_subshell, value_eV
+                PERKINS1991, element, atomic_subshell, value * 1e6
             )
-            logger.debug("Parsed: {0}".format(prop))
             yield prop
 
-    def _parse_atomic_subshell_occupaqncy(self, rows):
-        reaction_descriptor = self._extract_reaction_descriptor(rows)
-        if reaction_descriptor != REACTION_DESCRIPTOR_SUBSHELL:
-            return
-
-        reaction_modifier = self._extract_reaction_modifier(rows)
-        if reaction_modifier != REACTION_MODIFIER_NONE:
-            return
-
-        outgoing_particle = self._extract_outgoing_particle(rows)
-        if outgoing_particle != OUTGOING_PARTICLE_NONE:
-            return
-
-        reaction_property = self._extract_reaction_property(rows)
-        if reaction_property != REACTION_PROPERTY_NUMBER_ELECTRON:
-            return
+    def _parse_radiative_transition(self, element, header0, header1, lines):
+        destination_subshell = ATOMIC_SUBSHELLS[
+            int(float_(header1[21:32].decode("ascii")))
+        ]
 
-        element = self._extract_element(rows)
+        values = parse_fields(lines, 3)
+        for key, probability, energy_MeV in values.tolist():
+            source_subshell = ATOMIC_SUBSHELLS[int(key)]
+            transition = _create_xray_transition(source_subshell, destination_subshell)
 
-        for row in rows[2:]:
-            atomic_subshell = self._extract_source_subshell([row])
-            value = int(float_(row[11:22]))
-            prop = AtomicSubshellOccupancy(PERKINS1991, element, atomic_subshell, value)
-            logger.debug("Parsed: {0}".format(prop))
+            prop = XrayTransitionProbability(
+                PERKINS1991, element, transition, probability
+            )
             yield prop
 
-    def _parse_radiative_transition(self, rows):
-        reaction_descriptor = self._extract_reaction_descriptor(rows)
-        if reaction_descriptor != REACTION_DESCRIPTOR_TRANSITION:
-            return
-
-        reaction_modifier = self._extract_reaction_modifier(rows)
-        if reaction_modifier != REACTION_MODIFIER_EXTRA:
-            return
-
-        outgoing_particle = self._extract_outgoing_particle(rows)
-        if outgoing_particle != OUTGOING_PARTICLE_PHOTON:
-            return
-
-        reaction_property = self._extract_reaction_property(rows)
-        if reaction_property != REACTION_PROPERTY_RADIATIVE_PROBABILITY:
-            return
-
-        element = self._extract_element(rows)
-
-        destination_subshell = self._extract_destination_subshell(rows)
+            prop = XrayTransitionEnergy(
+                PERKINS1991, element, transition, energy_MeV * 1e6
+            )
+            yield prop
 
-        for row in rows[2:]:
-            source_subshell = self._extract_source_subshell([row])
-            transition = XrayTransition(source_subshell, destination_subshell)
+    def _parse_nonradiative_transition(self, element, header0, header1, lines):
+        destination_subshell = ATOMIC_SUBSHELLS[
+            int(float_(header1[21:32].decode("ascii")))
+        ]
+
+        values = parse_fields(lines, 4)
+        for key, secondary_key, probability, energy_MeV in values.tolist():
+            transition = _create_nonradiative_transition(
+                ATOMIC_SUBSHELLS[int(key)],
+                destination_subshell,
+                ATOMIC_SUBSHELLS[int(secondary_key)],
+            )
 
-            value = float_(row[11:22])
-            prop = XrayTransitionProbability(PERKINS1991, element, transition, value)
-            logger.debug("Parsed: {0}".format(prop))
+            prop = NonRadiativeTransitionProbability(
+                PERKINS1991, element, transition, probability
+            )
             yield prop
 
-            value_eV = float_(row[22:33]) * 1e6
-            prop = XrayTransitionEnergy(PERKINS1991, element, transition, value_eV)
-            logger.debug("Parsed: {0}".format(prop))
+            prop = NonRadiativeTransitionEnergy(
+                PERKINS1991, element, transition, energy_MeV * 1e6
+            )
             yield prop
 
-
-#    def _parse_nonradiative_transition(self, rows):
-#        reaction_descriptor = self._extract_reaction_descriptor(rows)
-#        if reaction_descriptor != REACTION_DESCRIPTOR_TRANSITION:
-#            return
-#
-#        reaction_modifier = self._extract_reaction_modifier(rows)
-#        if reaction_modifier != REACTION_MODIFIER_EXTRA:
-#            return
-#
-#        outgoing_particle = self._extract_outgoing_particle(rows)
-#        if outgoing_particle != OUTGOING_PARTICLE_ELECTRON:
-#            return
-#
-#        reaction_property = self._extract_reaction_property(rows)
-#        if reaction_property != REACTION_PROPERTY_NONRADIATIVE_PROBABILITY:
-#            return
-#
-#        element = self._extract_element(rows)
-#
-#        destination_subshell = self._extract_destination_subshell(rows)
-#
-#        for row in rows[2:]:
-#            source_subshell = self._extract_source_subshell([row])
-#            secondary_destination_subshell = \
-#                self._extract_secondary_destination_subshell([row])
-#            transition = Transition(source_subshell, destination_subshell,
-#                                    secondary_destination_subshell)
-#
-#            value = float_(row[22:33])
-#            prop = TransitionProbability(PERKINS1991, element, transition, value)
-#            logger.debug('Parsed: {0}'.format(prop))
-#            yield prop
-#
-#            value_eV = float_(row[33:44]) * 1e6
-#            prop = TransitionEnergy(PERKINS1991, element, transition, value_eV)
-#            logger.debug('Parsed: {0}'.format(prop))
-#            yield prop
+    #: Handlers of the blocks, by reaction descriptor (C), reaction property (I),
+    #: reaction modifier (S) and outgoing particle (Yo)
+    HANDLERS = {
+        (
+            REACTION_DESCRIPTOR_SUBSHELL,
+            REACTION_PROPERTY_NUMBER_ELECTRON,
+            REACTION_MODIFIER_NONE,
+            OUTGOING_PARTICLE_NONE,
+        ): _parse_number_electron,
+        (
+            REACTION_DESCRIPTOR_SUBSHELL,
+            REACTION_PROPERTY_BINDING_ENERGY,
+            REACTION_MODIFIER_NONE,
+            OUTGOING_PARTICLE_NONE,
+        ): _parse_atomic_subshell_binding_energy,
+        (
+            REACTION_DESCRIPTOR_SUBSHELL,
+            REACTION_PROPERTY_RADIATIVE_WIDTH,
+            REACTION_MODIFIER_NONE,
+            OUTGOING_PARTICLE_NONE,
+        ): _parse_atomic_subshell_radiative_width,
+        (
+            REACTION_DESCRIPTOR_SUBSHELL,
+            REACTION_PROPERTY_NONRADIATIVE_WIDTH,
+            REACTION_MODIFIER_NONE,
+            OUTGOING_PARTICLE_NONE,
+        ): _parse_atomic_subshell_nonradiative_width,
+        (
+            REACTION_DESCRIPTOR_TRANSITION,
+            REACTION_PROPERTY_RADIATIVE_PROBABILITY,
+            REACTION_MODIFIER_EXTRA,
+            OUTGOING_PARTICLE_PHOTON,
+        ): _parse_radiative_transition,
+        (
+            REACTION_DESCRIPTOR_TRANSITION,
+            REACTION_PROPERTY_NONRADIATIVE_PROBABILITY,
+            REACTION_MODIFIER_EXTRA,
+            OUTGOING_PARTICLE_ELECTRON,
+        ): _parse_nonradiative_transition,
+    }
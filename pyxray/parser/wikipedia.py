@@ -3,15 +3,17 @@ Parsers from data collected from Wikipedia.
 """
 
 # Standard library modules.
+import json
 import logging
+import concurrent.futures
 
 logger = logging.getLogger(__name__)
 
 # Third party modules.
-import requests
 
 # Local modules.
 import pyxray.parser.base as base
+from pyxray.parser.fetch import fetch
 from pyxray.descriptor import Reference, Element, Language
 from pyxray.property import ElementName
 
@@ -21,6 +23,18 @@ WIKIPEDIA = Reference("wikipedia", author="Wikipedia contributors")
 
 
 class WikipediaElementNameParser(base._Parser):
+    """
+    Parses the names of the elements in the most spoken languages from the
+    language links of their English Wikipedia page.
+
+    The pages are queried concurrently, but the properties are yielded in
+    the order of the elements.
+
+    Args:
+        max_workers (int): maximum number of concurrent queries
+    """
+
+    DATA_URLS = ("https://en.wikipedia.org/w/api.php",)
 
     NAMES_EN = [
         "Hydrogen",
@@ -178,13 +192,16 @@ class WikipediaElementNameParser(base._Parser):
         "pl",
     ]
 
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+
     def _find_wikipedia_names(self, name_en):
         """
         Finds all Wikipedia pages referring to the specified name in English and
         returns a dictionary where the keys are the language code and the values
         are the titles of the corresponding pages.
         """
-        url = "https://en.wikipedia.org/w/api.php"
+        url = self.DATA_URLS[0]
         params = {
             "action": "query",
             "titles": name_en,
@@ -192,10 +209,7 @@ class WikipediaElementNameParser(base._Parser):
             "lllimit": 500,
             "format": "json",
         }
-        r = requests.get(url, params=params)
-        if not r:
-            raise ValueError("Could not find wikipedia page: {0}".format(name_en))
-        out = r.json()
+        out = json.loads(fetch(url, params))
 
         names = {}
         pages = out["query"]["pages"]
@@ -206,15 +220,30 @@ class WikipediaElementNameParser(base._Parser):
         return names
 
     def __iter__(self):
+        executor = concurrent.futures.ThreadPoolExecutor(self.max_workers)
+        futures = [
+            executor.submit(self._find_wikipedia_names, name_en)
+            for name_en in self.NAMES_EN
+        ]
+
+        try:
+            yield from self._iter_names(futures)
+        finally:
+            # Pending queries are cancelled if the iteration stops early
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
+    def _iter_names(self, futures):
         length = len(self.NAMES_EN)
-        for z, name_en in enumerate(self.NAMES_EN, 1):
+        for z, (name_en, future) in enumerate(zip(self.NAMES_EN, futures), 1):
             element = Element(z)
             language = Language("en")
             prop = ElementName(WIKIPEDIA, element, language, name_en)
             logger.debug("Parsed: {0}".format(prop))
             yield prop
 
-            names = self._find_wikipedia_names(name_en)
+            names = future.result()
             for code, name in names.items():
                 if code not in self.LANGUAGES:
                     continue
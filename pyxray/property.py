@@ -14,6 +14,7 @@ from pyxray.descriptor import (
     AtomicShell,
     AtomicSubshell,
     XrayTransition,
+    NonRadiativeTransition,
     Notation,
     Language,
 )
@@ -156,3 +157,19 @@ class XrayTransitionRelativeWeight:
     element: Element
     xray_transition: XrayTransition
     value: float
+
+
+@dataclasses.dataclass(frozen=True)
+class NonRadiativeTransitionEnergy:
+    reference: Reference
+    element: Element
+    nonradiative_transition: NonRadiativeTransition
+    value_eV: float
+
+
+@dataclasses.dataclass(frozen=True)
+class NonRadiativeTransitionProbability:
+    reference: Reference
+    element: Element
+    nonradiative_transition: NonRadiativeTransition
+    value: float
@@ -12,6 +12,7 @@ import logging
 import sqlalchemy.sql
 
 # Local modules.
+import pyxray.descriptor as descriptor
 
 # Globals and constants variables.
 logger = logging.getLogger(__name__)
@@ -29,10 +30,26 @@ class SqlBase:
         str: sqlalchemy.String,
     }
 
+    #: Names of the string fields of property tables used to look up
+    #: descriptors, e.g. the symbol of an element or the notation of
+    #: an X-ray transition
+    LOOKUP_FIELDS = frozenset(["value", "ascii", "utf16"])
+
+    #: Name of the integer column with the packed key of the descriptors
+    #: defining one, e.g. :attr:`AtomicSubshell.key <pyxray.descriptor.AtomicSubshell.key>`
+    PACKED_KEY_COLUMN = "key"
+
     def __init__(self, engine):
         self.engine = engine
         self.metadata = sqlalchemy.MetaData()
 
+    def _begin(self):
+        """
+        Returns a context manager with a connection to the database in
+        a transaction.
+        """
+        return self.engine.begin()
+
     def _get_table_name(self, dataclass):
         """
         Creates a table name from a dataclass class or instance.
@@ -47,6 +64,19 @@ class SqlBase:
             dataclass = type(dataclass)
         return "_".join(camelcase_to_words(dataclass.__name__).split()).lower()
 
+    def _has_packed_key(self, dataclass):
+        """
+        Returns whether a dataclass defines a packed key (property ``key``),
+        stored in the column :attr:`PACKED_KEY_COLUMN` of its table.
+
+        Args:
+            dataclass (dataclasses.dataclass): class or instance
+        """
+        if not inspect.isclass(dataclass):
+            dataclass = type(dataclass)
+        attr = getattr(dataclass, self.PACKED_KEY_COLUMN, None)
+        return isinstance(attr, property)
+
     def _create_table(self, table_name, dataclass):
         """
         Creates a table in the database.
@@ -59,6 +89,9 @@ class SqlBase:
             :class:`sqlalchemy.Table`: table instance
         """
         columns = [sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True)]
+        foreign_columns = []
+        int_columns = []
+        lookup_columns = []
 
         for field in dataclasses.fields(dataclass):
             if dataclasses.is_dataclass(field.type):
@@ -68,6 +101,7 @@ class SqlBase:
                     None,
                     sqlalchemy.ForeignKey(subtable.name + ".id"),
                 )
+                foreign_columns.append(column.name)
 
             elif field.type in self.FIELDS_TO_SQLTYPE:
                 nullable = field.default is None
@@ -76,9 +110,15 @@ class SqlBase:
                     field.name.startswith("key") or field.name.endswith("key")
                 ):
                     columntype = sqlalchemy.String(collation="NOCASE")
+                    lookup_columns.append(field.name)
                 else:
                     columntype = self.FIELDS_TO_SQLTYPE[field.type]
 
+                if field.type == int:
+                    int_columns.append(field.name)
+                elif field.type == str and field.name in self.LOOKUP_FIELDS:
+                    lookup_columns.append(field.name)
+
                 column = sqlalchemy.Column(field.name, columntype, nullable=nullable)
 
             else:
@@ -86,13 +126,110 @@ class SqlBase:
 
             columns.append(column)
 
-        table = sqlalchemy.Table(table_name, self.metadata, *columns)
+        if self._has_packed_key(dataclass) and not self._is_outdated_table(table_name):
+            column = sqlalchemy.Column(
+                self.PACKED_KEY_COLUMN, sqlalchemy.Integer, nullable=False
+            )
+            columns.append(column)
+            lookup_columns.append(column.name)
+
+        indexes = self._create_indexes(
+            table_name, foreign_columns, int_columns, lookup_columns
+        )
 
-        self.metadata.create_all(self.engine, tables=[table])
+        table = sqlalchemy.Table(table_name, self.metadata, *columns, *indexes)
+
+        with self._begin() as conn:
+            self.metadata.create_all(conn, tables=[table])
         logger.debug('Create table "{}"'.format(table_name))
 
         return table
 
+    def _is_outdated_table(self, table_name):
+        """
+        Returns whether the table exists in the database, but without the
+        column :attr:`PACKED_KEY_COLUMN`, i.e. the database was built before
+        the packed keys were added.
+
+        Args:
+            table_name (str): name of table
+        """
+        with self._begin() as conn:
+            inspector = sqlalchemy.inspect(conn)
+            if not inspector.has_table(table_name):
+                return False
+            names = [column["name"] for column in inspector.get_columns(table_name)]
+
+        if self.PACKED_KEY_COLUMN in names:
+            return False
+
+        logger.warning(
+            'Table "{}" has no packed key column, the database is outdated; '
+            "rebuild it for faster lookups".format(table_name)
+        )
+        return True
+
+    def _get_packed_key(self, table, dataclass):
+        """
+        Returns the column with the packed key of a dataclass defining one
+        (see :meth:`_has_packed_key`).
+        If the table is outdated (see :meth:`_is_outdated_table`), the packed
+        key is computed from the columns of the quantum numbers instead,
+        as in :func:`pack_quantum_numbers <pyxray.descriptor.pack_quantum_numbers>`.
+
+        Args:
+            table (:class:`sqlalchemy.Table`): table of the dataclass
+            dataclass (dataclasses.dataclass): class or instance
+
+        Returns:
+            column or SQL expression of the packed key
+        """
+        if self.PACKED_KEY_COLUMN in table.c:
+            return table.c[self.PACKED_KEY_COLUMN]
+
+        key = sqlalchemy.literal(0)
+        for field in dataclasses.fields(dataclass):
+            value = sqlalchemy.func.coalesce(table.c[field.name] + 1, 0)
+            key = key * (1 << descriptor.KEY_BITS) + value
+        return key
+
+    def _create_indexes(self, table_name, foreign_columns, int_columns, lookup_columns):
+        """
+        Creates the indexes of a table for the lookups of
+        :class:`SqlDatabase <pyxray.sql.data.SqlDatabase>`.
+
+        * Property tables (with foreign keys) have a composite index on their
+          foreign keys, where the reference comes last as it is only used
+          to sort or filter the rows of a property.
+        * Descriptor tables (without foreign key) have a composite index on
+          their integer columns (e.g. quantum numbers).
+        * Key columns (e.g. ``bibtexkey`` or the packed key of the quantum
+          numbers) and string columns used to look up descriptors
+          (see :attr:`LOOKUP_FIELDS`) have their own index.
+
+        Args:
+            table_name (str): name of table
+            foreign_columns (list): names of the foreign key columns
+            int_columns (list): names of the integer columns
+            lookup_columns (list): names of the key and lookup columns
+
+        Returns:
+            list: :class:`sqlalchemy.Index` instances
+        """
+        indexes = []
+
+        if foreign_columns:
+            names = sorted(foreign_columns, key=lambda name: name == "reference_id")
+            indexes.append(sqlalchemy.Index("ix_" + table_name, *names))
+
+        elif int_columns:
+            indexes.append(sqlalchemy.Index("ix_" + table_name, *int_columns))
+
+        for name in lookup_columns:
+            indexes.append(sqlalchemy.Index("ix_{}_{}".format(table_name, name), name))
+
+        return indexes
+
     def require_table(self, dataclass):
         """
         Returns the table for the specified dataclass.
@@ -126,22 +263,27 @@ class SqlBase:
         table = self.require_table(dataclass)
 
         clauses = []
-        for field in dataclasses.fields(dataclass):
-            name = field.name
-            value = getattr(dataclass, name)
+        if self.PACKED_KEY_COLUMN in table.c:
+            # One clause for all the quantum numbers
+            clauses.append(table.c[self.PACKED_KEY_COLUMN] == dataclass.key)
 
-            if dataclasses.is_dataclass(field.type):
-                row_id = self._get_row(value)
-                clause = table.c[name + "_id"] == row_id
+        else:
+            for field in dataclasses.fields(dataclass):
+                name = field.name
+                value = getattr(dataclass, name)
 
-            else:
-                clause = table.c[name] == value
+                if dataclasses.is_dataclass(field.type):
+                    row_id = self._get_row(value)
+                    clause = table.c[name + "_id"] == row_id
+
+                else:
+                    clause = table.c[name] == value
 
-            clauses.append(clause)
+                clauses.append(clause)
 
         statement = sqlalchemy.sql.select(table.c.id).where(
             sqlalchemy.sql.and_(*clauses)
         )
 
-        with self.engine.begin() as conn:
+        with self._begin() as conn:
             return conn.execute(statement).scalar()
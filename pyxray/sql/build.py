@@ -3,21 +3,167 @@ Build the SQL database from the registered parsers.
 """
 
 # Standard library modules.
+import contextlib
 import dataclasses
 import logging
+import concurrent.futures
+import hashlib
 
 # Third party modules.
+import sqlalchemy
 import tqdm
 
 # Local modules.
-from pyxray.parser.base import find_parsers
+from pyxray.parser.base import find_parsers, compute_fingerprint
 from pyxray.sql.base import SqlBase
+import pyxray.descriptor
+import pyxray.property
+import pyxray.sql.base
 
 # Globals and constants variables.
 logger = logging.getLogger(__name__)
 
+# Settings of SQLite suited to build a database from scratch: the file is
+# thrown away if the build fails, so durability is not needed
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": "-65536",  # 64 MiB
+    "temp_store": "MEMORY",
+}
+
+# Default settings of SQLite, restored after the build
+DEFAULT_PRAGMAS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "cache_size": "-2000",
+    "temp_store": "DEFAULT",
+}
+
+# Name of the fingerprint of the schema of the database
+SCHEMA_FINGERPRINT_NAME = "__schema__"
+
+
+def compute_schema_fingerprint():
+    """
+    Returns a fingerprint of the modules defining the schema of the database.
+    If it changes, the whole database is rebuilt.
+
+    Returns:
+        str: hexadecimal digest
+    """
+    hasher = hashlib.sha256()
+
+    filepaths = [
+        pyxray.descriptor.__file__,
+        pyxray.property.__file__,
+        pyxray.sql.base.__file__,
+        __file__,
+    ]
+
+    for filepath in filepaths:
+        with open(filepath, "rb") as fp:
+            hasher.update(fp.read())
+
+    return hasher.hexdigest()
+
 
 class SqlDatabaseBuilder(SqlBase):
+    def __init__(self, engine):
+        super().__init__(engine)
+
+        # Identity map of the dataclass instances already in the database
+        # (e.g. references, elements, X-ray transitions) and their row
+        self._row_ids = {}
+        self._loaded_dataclasses = set()
+
+        # Connection of the transaction of the build (see build())
+        self._connection = None
+
+    def _begin(self):
+        if self._connection is not None:
+            return contextlib.nullcontext(self._connection)
+        return super()._begin()
+
+    def _set_pragmas(self, conn, pragmas):
+        if self.engine.dialect.name != "sqlite":
+            return
+
+        for name, value in pragmas.items():
+            conn.exec_driver_sql("PRAGMA {} = {}".format(name, value))
+        conn.commit()
+
+    def _load_row_ids(self, clasz):
+        """
+        Adds the rows already in the table of a dataclass to the identity map,
+        e.g. when the database is built in an existing file.
+        Only dataclasses without nested dataclasses are loaded.
+        """
+        if clasz in self._loaded_dataclasses:
+            return
+        self._loaded_dataclasses.add(clasz)
+
+        fields = dataclasses.fields(clasz)
+        if any(dataclasses.is_dataclass(field.type) for field in fields):
+            return
+
+        table = self.require_table(clasz)
+        with self._begin() as conn:
+            for row in conn.execute(sqlalchemy.select(table)):
+                dataclass = clasz(*(row._mapping[field.name] for field in fields))
+                self._row_ids.setdefault(dataclass, row._mapping["id"])
+
+    def _insert_missing(self, list_dataclass):
+        """
+        Inserts, in one batch, the dataclass instances which are not yet
+        in the database and adds their row to the identity map.
+        All dataclass instances must have the same type.
+        """
+        missing = [
+            dataclass
+            for dataclass in dict.fromkeys(list_dataclass)
+            if dataclass not in self._row_ids
+        ]
+        if not missing:
+            return
+
+        clasz = type(missing[0])
+        self._load_row_ids(clasz)
+        missing = [dataclass for dataclass in missing if dataclass not in self._row_ids]
+        if not missing:
+            return
+
+        table = self.require_table(clasz)
+        list_params = self._convert_many_dataclasses_to_params(missing)
+
+        with self._begin() as conn:
+            last_row_id = self._get_last_row_id(conn, table)
+
+            conn.execute(table.insert(), list_params)
+
+            # Rows are inserted in the order of the parameters
+            statement = (
+                sqlalchemy.select(table.c.id)
+                .where(table.c.id > last_row_id)
+                .order_by(table.c.id)
+            )
+            row_ids = conn.execute(statement).scalars().all()
+
+        assert len(row_ids) == len(missing)
+        self._row_ids.update(zip(missing, row_ids))
+
+    def _convert_many_dataclasses_to_params(self, list_dataclass):
+        # Insert the nested dataclasses first, one batch per field
+        for field in dataclasses.fields(list_dataclass[0]):
+            if dataclasses.is_dataclass(field.type):
+                self._insert_missing(
+                    [getattr(dataclass, field.name) for dataclass in list_dataclass]
+                )
+
+        return [
+            self._convert_dataclass_to_params(dataclass) for dataclass in list_dataclass
+        ]
+
     def _convert_dataclass_to_params(self, dataclass):
         params = {}
         for field in dataclasses.fields(dataclass):
@@ -25,11 +171,16 @@ class SqlDatabaseBuilder(SqlBase):
             value = getattr(dataclass, name)
 
             if dataclasses.is_dataclass(value):
-                row_id = self.insert(value, check_duplicate=True)
+                row_id = self._row_ids.get(value)
+                if row_id is None:
+                    row_id = self.insert(value, check_duplicate=True)
                 params[name + "_id"] = row_id
             else:
                 params[name] = value
 
+        if self.PACKED_KEY_COLUMN in self.require_table(dataclass).c:
+            params[self.PACKED_KEY_COLUMN] = dataclass.key
+
         return params
 
     def insert(self, dataclass, check_duplicate=False):
@@ -46,8 +197,12 @@ class SqlDatabaseBuilder(SqlBase):
         """
         # Check if already exists
         if check_duplicate:
-            row_id = self._get_row(dataclass)
+            row_id = self._row_ids.get(dataclass)
+            if row_id is None:
+                row_id = self._get_row(dataclass)
+
             if row_id is not None:
+                self._row_ids[dataclass] = row_id
                 return row_id
 
         # Create insert statement
@@ -58,44 +213,323 @@ class SqlDatabaseBuilder(SqlBase):
         logger.debug('Insert in "{}": {!r}'.format(table.name, params))
 
         # Insert
-        with self.engine.begin() as conn:
+        with self._begin() as conn:
             result = conn.execute(ins)
-            return result.inserted_primary_key[0]
+            row_id = result.inserted_primary_key[0]
+
+        if check_duplicate:
+            self._row_ids[dataclass] = row_id
+
+        return row_id
 
     def insert_many(self, list_dataclass):
         clasz = type(list_dataclass[0])
 
-        list_params = []
         for dataclass in list_dataclass:
             if type(dataclass) != clasz:
                 raise ValueError("All dataclasses do not have the same type")
 
-            params = self._convert_dataclass_to_params(dataclass)
-            list_params.append(params)
+        list_params = self._convert_many_dataclasses_to_params(list_dataclass)
 
         table = self.require_table(clasz)
 
         # Insert
-        with self.engine.begin() as conn:
+        with self._begin() as conn:
             conn.execute(table.insert(), list_params)
 
     def _find_parsers(self):
         return find_parsers()
 
-    def build(self):
+    def build(self, max_workers=1):
         """
         Find all parsers and insert their properties in the database.
+
+        The database is built in a single transaction with settings of
+        SQLite suited to bulk loading (see :data:`BULK_LOAD_PRAGMAS`).
+        The default settings are restored and the database is vacuumed
+        at the end.
+
+        With more than one worker, the parsers are run concurrently in a pool
+        of threads, which mostly benefits the parsers downloading data.
+        The properties of each parser are still inserted by this thread
+        only, in the order of the parsers, so the database is the same as
+        with one worker.
+
+        Args:
+            max_workers (int): maximum number of parsers running concurrently.
+                If ``None``, the default of
+                :class:`concurrent.futures.ThreadPoolExecutor` is used.
         """
         parsers = self._find_parsers()
         logger.info("Found {:d} parsers".format(len(parsers)))
 
-        for name, parser in tqdm.tqdm(parsers, desc="Building database"):
-            buffer = {}
+        with self.engine.connect() as conn:
+            self._set_pragmas(conn, BULK_LOAD_PRAGMAS)
+
+            try:
+                with conn.begin():
+                    # The SQLite driver only begins a transaction before
+                    # inserting rows; begin it now so the tables are
+                    # also created in the transaction
+                    if self.engine.dialect.name == "sqlite":
+                        conn.exec_driver_sql("BEGIN")
+
+                    self._build(conn, parsers, max_workers)
+            finally:
+                self._set_pragmas(conn, DEFAULT_PRAGMAS)
+
+            # Collect statistics about the tables and indexes for the query
+            # planner and defragment the database file
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.exec_driver_sql("ANALYZE")
+            if self.engine.dialect.name == "sqlite":
+                conn.exec_driver_sql("VACUUM")
+
+    def _parse(self, parser):
+        """
+        Returns the properties of a parser grouped by type.
+        """
+        buffer = {}
+        for prop in parser:
+            buffer.setdefault(type(prop), []).append(prop)
+        return buffer
+
+    def _parse_with_progress(self, name, parser, position):
+        """
+        Returns the properties of a parser grouped by type, while reporting
+        the progress of the parser on its own progress bar.
+        """
+        with tqdm.tqdm(
+            total=100,
+            desc="Processing {}".format(name),
+            position=position,
+            leave=False,
+        ) as progressbar:
+
+            def hook(progress):
+                progressbar.update(progress - progressbar.n)
+
+            parser.add_reporthook(hook)
+            try:
+                return self._parse(parser)
+            finally:
+                parser.remove_reporthook(hook)
+
+    def _iter_parse(self, parsers, max_workers):
+        """
+        Yields the name and the properties of each parser, in the order
+        of the parsers.
+        """
+        if max_workers == 1:
+            for name, parser in parsers:
+                parser = tqdm.tqdm(parser, desc="Processing {}".format(name))
+                yield name, self._parse(parser)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = [
+                executor.submit(self._parse_with_progress, name, parser, position)
+                for position, (name, parser) in enumerate(parsers, 1)
+            ]
+
+            try:
+                for (name, _parser), future in zip(parsers, futures):
+                    yield name, future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _require_build_tables(self):
+        """
+        Returns the tables recording the fingerprint of each parser and
+        the ranges of rows inserted from each parser.
+        """
+        table_fingerprint = self.metadata.tables.get("build_fingerprint")
+        if table_fingerprint is None:
+            table_fingerprint = sqlalchemy.Table(
+                "build_fingerprint",
+                self.metadata,
+                sqlalchemy.Column("name", sqlalchemy.String, primary_key=True),
+                sqlalchemy.Column("fingerprint", sqlalchemy.String, nullable=False),
+                sqlalchemy.Column("position", sqlalchemy.Integer, nullable=False),
+            )
+
+        table_row_range = self.metadata.tables.get("build_row_range")
+        if table_row_range is None:
+            table_row_range = sqlalchemy.Table(
+                "build_row_range",
+                self.metadata,
+                sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+                sqlalchemy.Column("name", sqlalchemy.String, nullable=False),
+                sqlalchemy.Column("table_name", sqlalchemy.String, nullable=False),
+                sqlalchemy.Column("first_id", sqlalchemy.Integer, nullable=False),
+                sqlalchemy.Column("last_id", sqlalchemy.Integer, nullable=False),
+            )
+
+        with self._begin() as conn:
+            self.metadata.create_all(conn, tables=[table_fingerprint, table_row_range])
+
+        return table_fingerprint, table_row_range
+
+    def _get_last_row_id(self, conn, table):
+        statement = sqlalchemy.select(sqlalchemy.func.max(table.c.id))
+        return conn.execute(statement).scalar() or 0
+
+    def _reflect(self, conn):
+        metadata = sqlalchemy.MetaData()
+        metadata.reflect(conn)
+        return metadata
+
+    def _read_fingerprints(self, conn):
+        if not sqlalchemy.inspect(conn).has_table("build_fingerprint"):
+            return {}
+
+        table_fingerprint, _table_row_range = self._require_build_tables()
+        statement = sqlalchemy.select(
+            table_fingerprint.c.name, table_fingerprint.c.fingerprint
+        ).order_by(table_fingerprint.c.position)
+        return dict(conn.execute(statement).all())
+
+    def _drop_tables(self, conn):
+        self._reflect(conn).drop_all(conn)
+
+        self.metadata.clear()
+        self._row_ids.clear()
+        self._loaded_dataclasses.clear()
+
+    def _delete_rows(self, conn, names):
+        """
+        Deletes the rows inserted from the parsers with the specified names,
+        as well as the descriptors which are not referred to anymore.
+        """
+        _table_fingerprint, table_row_range = self._require_build_tables()
+        metadata = self._reflect(conn)
+
+        statement = sqlalchemy.select(table_row_range).where(
+            table_row_range.c.name.in_(names)
+        )
+        for row in conn.execute(statement).fetchall():
+            table = metadata.tables[row.table_name]
+            conn.execute(
+                table.delete().where(table.c.id.between(row.first_id, row.last_id))
+            )
+
+        conn.execute(table_row_range.delete().where(table_row_range.c.name.in_(names)))
+
+        # Delete orphan descriptors
+        referrers = {}
+        for table in metadata.sorted_tables:
+            for foreign_key in table.foreign_keys:
+                referrers.setdefault(foreign_key.column.table, []).append(
+                    foreign_key.parent
+                )
+
+        for table, columns in referrers.items():
+            selects = [
+                sqlalchemy.select(column).where(column != None) for column in columns
+            ]
+            conn.execute(
+                table.delete().where(table.c.id.not_in(sqlalchemy.union(*selects)))
+            )
+
+        # Row ids of the identity map may have been deleted
+        self._row_ids.clear()
+        self._loaded_dataclasses.clear()
+
+    def _select_parsers(self, conn, parsers):
+        """
+        Returns the parsers to run and the fingerprints of all parsers.
+
+        The rows of the parsers are kept for the longest sequence of first
+        parsers which are unchanged since the last build and in the same
+        order.
+        The rows of all the following parsers (changed, removed or not) are
+        deleted and these parsers are run again, so that the rows are
+        inserted in the order of the parsers, with the same ids as in
+        a database built from scratch.
+        """
+        fingerprints = {SCHEMA_FINGERPRINT_NAME: compute_schema_fingerprint()}
+        for name, parser in parsers:
+            fingerprints[name] = compute_fingerprint(parser)
+
+        previous_fingerprints = self._read_fingerprints(conn)
+
+        schema_fingerprint = previous_fingerprints.pop(SCHEMA_FINGERPRINT_NAME, None)
+        if schema_fingerprint != fingerprints[SCHEMA_FINGERPRINT_NAME]:
+            self._drop_tables(conn)
+            previous_fingerprints = {}
+
+        count = 0
+        for (name, _parser), previous_name in zip(parsers, previous_fingerprints):
+            if name != previous_name:
+                break
+            if previous_fingerprints[name] != fingerprints[name]:
+                break
+            logger.info("Skip {}, already up to date".format(name))
+            count += 1
+
+        stale_names = list(previous_fingerprints)[count:]
+        if stale_names:
+            logger.info("Delete rows of {}".format(", ".join(stale_names)))
+            self._delete_rows(conn, stale_names)
+
+        return parsers[count:], fingerprints
+
+    def _write_fingerprints(self, conn, fingerprints):
+        table_fingerprint, _table_row_range = self._require_build_tables()
+        conn.execute(table_fingerprint.delete())
+        conn.execute(
+            table_fingerprint.insert(),
+            [
+                {"name": name, "fingerprint": fingerprint, "position": position}
+                for position, (name, fingerprint) in enumerate(fingerprints.items())
+            ],
+        )
+
+    def _build(self, conn, parsers, max_workers):
+        self._connection = conn
+
+        try:
+            parsers, fingerprints = self._select_parsers(conn, parsers)
+            _table_fingerprint, table_row_range = self._require_build_tables()
+
+            # Closing the iterator cancels the pending parsers on error
+            iterator = contextlib.closing(self._iter_parse(parsers, max_workers))
+
+            with iterator as buffers:
+                for name, buffer in tqdm.tqdm(
+                    buffers, desc="Building database", total=len(parsers)
+                ):
+                    for list_dataclass in tqdm.tqdm(
+                        buffer.values(), desc="Inserting {}".format(name)
+                    ):
+                        table = self.require_table(type(list_dataclass[0]))
+                        first_id = self._get_last_row_id(conn, table) + 1
+
+                        self.insert_many(list_dataclass)
+
+                        params = {
+                            "name": name,
+                            "table_name": table.name,
+                            "first_id": first_id,
+                            "last_id": self._get_last_row_id(conn, table),
+                        }
+                        conn.execute(table_row_range.insert(), params)
+
+            # The responses downloaded by the parsers are now in the store
+            # of the fetcher, so their hashes are part of the fingerprints
+            for name, parser in parsers:
+                if parser.DATA_URLS:
+                    fingerprints[name] = compute_fingerprint(parser)
+
+            self._write_fingerprints(conn, fingerprints)
 
-            for prop in tqdm.tqdm(parser, desc="Processing {}".format(name)):
-                buffer.setdefault(type(prop), []).append(prop)
+        except:
+            # The tables and rows are rolled back with the transaction
+            self.metadata.clear()
+            self._row_ids.clear()
+            self._loaded_dataclasses.clear()
+            raise
 
-            for list_dataclass in tqdm.tqdm(
-                buffer.values(), desc="Inserting {}".format(name)
-            ):
-                self.insert_many(list_dataclass)
+        finally:
+            self._connection = None
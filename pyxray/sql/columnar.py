@@ -0,0 +1,246 @@
+"""
+Export of the SQL database into columnar tables, for analyses of whole
+tables (e.g. with pandas or Polars) instead of lookups one value at a time.
+
+Each table of the SQL database (references, descriptors and properties) is
+written in a folder with one NumPy ``.npy`` file per column.
+The files are loaded back with :func:`numpy.load` as memory-mapped arrays,
+so that processes loading the same folder share one physical copy of the
+data, through the page cache of the operating system.
+
+Descriptors and references are integer-coded: a property table has a column
+``<field>_id`` (e.g. ``element_id``, ``xray_transition_id``,
+``reference_id``) with the value of the column ``id`` of the row in the
+table of the descriptor (e.g. ``element``, ``xray_transition``,
+``reference``).
+Missing values are -1 in integer columns (e.g. the undefined quantum numbers
+of a transition set), ``nan`` in float columns and an empty string in string
+columns.
+
+The folder is created with :func:`export_columnar` or from the command line::
+
+    python -m pyxray.sql.columnar DIRPATH
+"""
+
+__all__ = ["export_columnar", "load_columnar"]
+
+# Standard library modules.
+import os
+import json
+import argparse
+import logging
+import dataclasses
+
+# Third party modules.
+import numpy
+import sqlalchemy.sql
+
+# Local modules.
+from pyxray.sql.base import SqlBase
+from pyxray.sql.memory import (
+    DESCRIPTORS,
+    PROPERTIES,
+    NONRADIATIVE_DESCRIPTORS,
+    NONRADIATIVE_PROPERTIES,
+)
+import pyxray.descriptor as descriptor
+
+# Globals and constants variables.
+logger = logging.getLogger(__name__)
+
+#: Version of the layout of the folder, increased on incompatible changes
+FORMAT_VERSION = 1
+
+MANIFEST_FILENAME = "manifest.json"
+
+DATACLASSES = (
+    [descriptor.Reference]
+    + DESCRIPTORS
+    + NONRADIATIVE_DESCRIPTORS
+    + PROPERTIES
+    + NONRADIATIVE_PROPERTIES
+)
+
+MISSING_INT = -1
+
+
+def _get_columns(dataclass):
+    """
+    Returns the names and kinds of the columns of the table of a dataclass:
+    ``"code"`` for the id of a row of another table, ``"int"``, ``"float"``
+    or ``"str"``.
+    """
+    columns = [("id", "code")]
+
+    for field in dataclasses.fields(dataclass):
+        if dataclasses.is_dataclass(field.type):
+            columns.append((field.name + "_id", "code"))
+        elif field.type in (int, float, str):
+            columns.append((field.name, field.type.__name__))
+        else:
+            raise ValueError("Unknown field: {}".format(field.type))
+
+    return columns
+
+
+def _create_array(values, kind):
+    if kind == "code":
+        return numpy.array(values, dtype=numpy.int32)
+
+    if kind == "int":
+        values = [MISSING_INT if value is None else value for value in values]
+        return numpy.array(values, dtype=numpy.int32)
+
+    if kind == "float":
+        values = [numpy.nan if value is None else value for value in values]
+        return numpy.array(values, dtype=float)
+
+    values = ["" if value is None else value for value in values]
+    return numpy.array(values, dtype=str)
+
+
+def export_columnar(engine, dirpath):
+    """
+    Exports all the tables of an SQL database in a folder, with one ``.npy``
+    file per column.
+    The database is not modified: a table missing from the database is
+    exported with empty columns.
+
+    The manifest of the folder (``manifest.json``) is written last,
+    so a folder is only loaded by :func:`load_columnar` once completely
+    exported.
+
+    :arg engine: :class:`sqlalchemy.engine.Engine` of the SQL database
+    :arg dirpath: path of the folder, created if needed
+
+    :return: number of rows of each table
+    :rtype: :class:`dict`
+    """
+    base = SqlBase(engine)
+
+    manifestpath = os.path.join(dirpath, MANIFEST_FILENAME)
+    if os.path.exists(manifestpath):
+        os.remove(manifestpath)
+
+    tables = {}
+    lengths = {}
+    with engine.connect() as conn:
+        # The tables are reflected, not required, so that the database
+        # (e.g. the distributed one) is only read
+        inspector = sqlalchemy.inspect(conn)
+        metadata = sqlalchemy.MetaData()
+
+        for dataclass in DATACLASSES:
+            table_name = base._get_table_name(dataclass)
+            columns = _get_columns(dataclass)
+
+            if inspector.has_table(table_name):
+                table = sqlalchemy.Table(table_name, metadata, autoload_with=conn)
+                statement = sqlalchemy.sql.select(
+                    *[table.c[name] for name, _kind in columns]
+                ).order_by(table.c["id"])
+                rows = conn.execute(statement).all()
+            else:
+                logger.debug("No table {}, export empty columns".format(table_name))
+                rows = []
+
+            tabledirpath = os.path.join(dirpath, table_name)
+            os.makedirs(tabledirpath, exist_ok=True)
+
+            values_by_column = list(zip(*rows)) or [()] * len(columns)
+            for (name, kind), values in zip(columns, values_by_column):
+                array = _create_array(values, kind)
+                numpy.save(os.path.join(tabledirpath, name + ".npy"), array)
+
+            tables[table_name] = dict(columns)
+            lengths[table_name] = len(rows)
+            logger.debug("Export {:d} rows of {}".format(len(rows), table_name))
+
+    manifest = {"version": FORMAT_VERSION, "tables": tables, "lengths": lengths}
+    with open(manifestpath, "w") as fp:
+        json.dump(manifest, fp, indent=2)
+
+    return lengths
+
+
+def load_columnar(dirpath, tables=None, mmap_mode="r"):
+    """
+    Loads the tables exported by :func:`export_columnar`.
+
+    The columns are memory-mapped: only the pages which are read are loaded
+    and they are shared between the processes loading the same folder.
+    The numeric columns can be wrapped without copy by other libraries
+    (e.g. Arrow or Polars).
+
+    Examples::
+
+        tables = load_columnar("pyxray-columnar")
+        energies = tables["xray_transition_energy"]
+        elements = tables["element"]
+        # Rows are sorted by id
+        positions = numpy.searchsorted(elements["id"], energies["element_id"])
+        zs = elements["atomic_number"][positions]
+
+    :arg dirpath: path of the folder
+    :arg tables: names of the tables to load, ``None`` for all tables
+    :arg mmap_mode: mode of :func:`numpy.load`, ``None`` to read the columns
+        in memory
+
+    :return: :class:`dict` of the tables, where each table is a
+        :class:`dict` of its columns (:class:`numpy.ndarray`)
+    """
+    manifestpath = os.path.join(dirpath, MANIFEST_FILENAME)
+    if not os.path.exists(manifestpath):
+        raise FileNotFoundError("Cannot find columnar tables in {}".format(dirpath))
+
+    with open(manifestpath, "r") as fp:
+        manifest = json.load(fp)
+
+    if manifest["version"] != FORMAT_VERSION:
+        raise ValueError(
+            "Unsupported version of columnar tables: {}".format(manifest["version"])
+        )
+
+    if tables is None:
+        tables = manifest["tables"].keys()
+
+    data = {}
+    for table_name in tables:
+        columns = {}
+        for name in manifest["tables"][table_name]:
+            filepath = os.path.join(dirpath, table_name, name + ".npy")
+            columns[name] = numpy.load(filepath, mmap_mode=mmap_mode)
+        data[table_name] = columns
+
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export the SQL database of pyxray into columnar tables"
+    )
+    parser.add_argument("dirpath", help="Folder of the columnar tables")
+    parser.add_argument(
+        "--database", help="Path of the SQL database (default: distributed database)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.database is None:
+        from pyxray.data import _create_engine
+
+        engine = _create_engine()
+    else:
+        engine = sqlalchemy.create_engine("sqlite:///" + args.database)
+
+    lengths = export_columnar(engine, args.dirpath)
+    logger.info(
+        "Exported {:d} rows of {:d} tables in {}".format(
+            sum(lengths.values()), len(lengths), args.dirpath
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
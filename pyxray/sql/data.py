@@ -1,21 +1,44 @@
 """"""
 
 # Standard library modules.
-from collections.abc import Sequence
 import logging
+import numbers
 
 # Third party modules.
+import numpy
 import sqlalchemy.sql
 
 # Local modules.
-from pyxray.base import _DatabaseMixin, NotFound
+from pyxray.base import _DatabaseMixin, NotFound, _freeze
 from pyxray.sql.base import SqlBase
+from pyxray.sql.resolver import NotationResolver
 import pyxray.descriptor as descriptor
 import pyxray.property as prop
 
 # Globals and constants variables.
 logger = logging.getLogger(__name__)
 
+ATOMIC_SUBSHELL_COLUMNS = [
+    "principal_quantum_number",
+    "azimuthal_quantum_number",
+    "total_angular_momentum_nominator",
+]
+
+XRAY_TRANSITION_COLUMNS = [
+    "source_principal_quantum_number",
+    "source_azimuthal_quantum_number",
+    "source_total_angular_momentum_nominator",
+    "destination_principal_quantum_number",
+    "destination_azimuthal_quantum_number",
+    "destination_total_angular_momentum_nominator",
+]
+
+NONRADIATIVE_TRANSITION_COLUMNS = XRAY_TRANSITION_COLUMNS + [
+    "secondary_destination_principal_quantum_number",
+    "secondary_destination_azimuthal_quantum_number",
+    "secondary_destination_total_angular_momentum_nominator",
+]
+
 
 class StatementBuilder:
     def __init__(self, distinct=False):
@@ -76,262 +99,357 @@ class StatementBuilder:
 
 
 class SqlDatabase(_DatabaseMixin, SqlBase):
+    """
+    Database where every lookup is an SQL query.
+
+    The statements of the queries are cached by shape, i.e. the method,
+    the type of the arguments (e.g. atomic number or symbol of an element)
+    and whether a reference is specified.
+    The values of the arguments are passed as bound parameters, so a statement
+    is only built and compiled once.
+
+    The notations of atomic shells, atomic subshells and X-ray transitions
+    (e.g. ``"Ka1"``) are resolved to their descriptors in Python, with
+    a :class:`NotationResolver <pyxray.sql.resolver.NotationResolver>` loaded
+    on the first lookup of a notation, so the queries do not join the
+    notation tables.
+    """
+
     def __init__(self, engine):
         super().__init__(engine)
+        self._statements = {}
+        self._notation_resolver = None
 
-    def _expand_atomic_subshell(self, atomic_subshell):
-        if (
-            hasattr(atomic_subshell, "principal_quantum_number")
-            and hasattr(atomic_subshell, "azimuthal_quantum_number")
-            and hasattr(atomic_subshell, "total_angular_momentum_nominator")
-        ):
-            n = atomic_subshell.atomic_shell.principal_quantum_number
-            l = atomic_subshell.azimuthal_quantum_number
-            j_n = atomic_subshell.total_angular_momentum_nominator
-
-        elif isinstance(atomic_subshell, Sequence) and len(atomic_subshell) == 3:
-            n = atomic_subshell[0]
-            l = atomic_subshell[1]
-            j_n = atomic_subshell[2]
-
-        else:
-            raise NotFound("Cannot parse atomic subshell: {}".format(atomic_subshell))
-
-        return n, l, j_n
-
-    def _expand_xray_transition(self, xray_transition):
-        if isinstance(xray_transition, descriptor.XrayTransition):
-            src_n = xray_transition.source_principal_quantum_number
-            src_l = xray_transition.source_azimuthal_quantum_number
-            src_j_n = xray_transition.source_total_angular_momentum_nominator
-            dst_n = xray_transition.destination_principal_quantum_number
-            dst_l = xray_transition.destination_azimuthal_quantum_number
-            dst_j_n = xray_transition.destination_total_angular_momentum_nominator
-
-        elif isinstance(xray_transition, Sequence) and len(xray_transition) >= 2:
-            src_n, src_l, src_j_n = self._expand_atomic_subshell(xray_transition[0])
-            dst_n, dst_l, dst_j_n = self._expand_atomic_subshell(xray_transition[1])
+    def _resolve_notation(self, dataclass, text):
+        if self._notation_resolver is None:
+            self._notation_resolver = NotationResolver.from_sql(self)
+        return self._notation_resolver.resolve(dataclass, text)
 
-        else:
-            raise NotFound("Cannot parse X-ray transition: {}".format(xray_transition))
-
-        return src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n
-
-    def _update_element(self, builder, table, element, column="element_id"):
+    def _bind_element(self, params, element):
         if hasattr(element, "atomic_number"):
             element = element.atomic_number
 
         if isinstance(element, str):
-            table_name = self.require_table(prop.ElementName)
-            builder.add_join(
-                table, table_name, table.c[column] == table_name.c["element_id"]
-            )
-            clause_name = table_name.c["value"] == element
-
-            table_symbol = self.require_table(prop.ElementSymbol)
-            builder.add_join(
-                table, table_symbol, table.c[column] == table_symbol.c["element_id"]
-            )
-            clause_symbol = table_symbol.c["value"] == element
-
-            builder.add_clause(sqlalchemy.sql.or_(clause_name, clause_symbol))
+            params["element"] = element
+            return str
 
         elif isinstance(element, int):
-            table_element = self.require_table(descriptor.Element)
-            builder.add_join(
-                table, table_element, table.c[column] == table_element.c["id"]
-            )
-            builder.add_clause(table_element.c["atomic_number"] == element)
+            params["element"] = element
+            return int
 
         else:
             raise NotFound("Cannot parse element: {}".format(element))
 
-    def _update_atomic_shell(
-        self, builder, table, atomic_shell, column="atomic_shell_id"
-    ):
+    def _bind_atomic_shell(self, params, atomic_shell):
         if hasattr(atomic_shell, "principal_quantum_number"):
             atomic_shell = atomic_shell.principal_quantum_number
 
         if isinstance(atomic_shell, str):
-            table_notation = self.require_table(prop.AtomicShellNotation)
-            builder.add_join(
-                table,
-                table_notation,
-                table.c[column] == table_notation.c["atomic_shell_id"],
+            atomic_shells = self._resolve_notation(
+                prop.AtomicShellNotation, atomic_shell
             )
-            builder.add_clause(
-                sqlalchemy.sql.or_(
-                    table_notation.c["ascii"] == atomic_shell,
-                    table_notation.c["utf16"] == atomic_shell,
-                )
+            return self._bind_many(
+                params, "atomic_shell", [shell.n for shell in atomic_shells]
             )
 
         elif isinstance(atomic_shell, int):
-            table_atomic_shell = self.require_table(descriptor.AtomicShell)
-            builder.add_join(
-                table, table_atomic_shell, table.c[column] == table_atomic_shell.c["id"]
-            )
-            builder.add_clause(
-                table_atomic_shell.c["principal_quantum_number"] == atomic_shell
-            )
+            params["atomic_shell"] = atomic_shell
+            return int
 
         else:
             raise NotFound("Cannot parse atomic shell: {}".format(atomic_shell))
 
-    def _update_atomic_subshell(
-        self, builder, table, atomic_subshell, column="atomic_subshell_id"
-    ):
+    def _bind_quantum_numbers(self, params, name, columns, values):
+        # Undefined quantum numbers are not bound; they change the shape
+        # of the statement (IS NULL or IS NOT NULL clauses)
+        for column, value in zip(columns, values):
+            if value is not None:
+                params[name + "_" + column] = value
+        return tuple(value is not None for value in values)
+
+    def _bind_many(self, params, name, values):
+        # Values of a notation, which may refer to more than one descriptor
+        if len(values) == 1:
+            params[name] = values[0]
+            return int
+
+        params[name] = list(values)
+        return list
+
+    def _bind_packed_key(self, params, name, values):
+        # The quantum numbers are bound as one packed key; which ones are
+        # undefined changes the shape of the statement (mask of the key)
+        try:
+            params[name + "_key"] = descriptor.pack_quantum_numbers(values)
+        except (TypeError, ValueError):
+            raise NotFound("Cannot parse quantum numbers: {}".format(values))
+        return tuple(value is not None for value in values)
+
+    def _bind_atomic_subshell(self, params, atomic_subshell):
         if isinstance(atomic_subshell, str):
-            table_notation = self.require_table(prop.AtomicSubshellNotation)
-            builder.add_join(
-                table,
-                table_notation,
-                table.c[column] == table_notation.c["atomic_subshell_id"],
+            atomic_subshells = self._resolve_notation(
+                prop.AtomicSubshellNotation, atomic_subshell
             )
-            builder.add_clause(
-                sqlalchemy.sql.or_(
-                    table_notation.c["ascii"] == atomic_subshell,
-                    table_notation.c["utf16"] == atomic_subshell,
-                )
+            return self._bind_many(
+                params,
+                "atomic_subshell_key",
+                [atomic_subshell.key for atomic_subshell in atomic_subshells],
             )
 
-        else:
-            n, l, j_n = self._expand_atomic_subshell(atomic_subshell)
-            table_atomic_subshell = self.require_table(descriptor.AtomicSubshell)
-            builder.add_join(
-                table,
-                table_atomic_subshell,
-                table.c[column] == table_atomic_subshell.c["id"],
+        return self._bind_packed_key(
+            params,
+            "atomic_subshell",
+            self._expand_atomic_subshell(atomic_subshell),
+        )
+
+    def _bind_xray_transition(self, params, xray_transition):
+        if isinstance(xray_transition, str):
+            xray_transitions = self._resolve_notation(
+                prop.XrayTransitionNotation, xray_transition
             )
-            builder.add_clause(table_atomic_subshell.c["principal_quantum_number"] == n)
-            builder.add_clause(table_atomic_subshell.c["azimuthal_quantum_number"] == l)
-            builder.add_clause(
-                table_atomic_subshell.c["total_angular_momentum_nominator"] == j_n
+            return self._bind_many(
+                params,
+                "xray_transition_key",
+                [xray_transition.key for xray_transition in xray_transitions],
             )
 
-    def _update_xray_transition(
-        self, builder, table, xray_transition, column="xray_transition_id", search=False
-    ):
-        if isinstance(xray_transition, str):
-            table_notation = self.require_table(prop.XrayTransitionNotation)
-            builder.add_join(
-                table,
-                table_notation,
-                table.c[column] == table_notation.c["xray_transition_id"],
+        return self._bind_packed_key(
+            params,
+            "xray_transition",
+            self._expand_xray_transition(xray_transition),
+        )
+
+    def _bind_nonradiative_transition(self, params, nonradiative_transition):
+        return self._bind_quantum_numbers(
+            params,
+            "nonradiative_transition",
+            NONRADIATIVE_TRANSITION_COLUMNS,
+            self._expand_nonradiative_transition(nonradiative_transition),
+        )
+
+    def _bind_reference(self, params, reference):
+        if isinstance(reference, descriptor.Reference):
+            reference = reference.bibtexkey
+
+        if not reference:
+            return False
+
+        params["reference"] = reference
+        return True
+
+    def _bind_language(self, params, language):
+        if isinstance(language, descriptor.Language):
+            language = language.key
+
+        params["language"] = language
+
+    def _bind_notation(self, params, notation):
+        if isinstance(notation, descriptor.Notation):
+            notation = notation.key
+
+        params["notation"] = notation
+
+    def _update_element(self, builder, table, element_kind, column="element_id"):
+        if element_kind is str:
+            # A subquery per table, rather than joins with an OR clause
+            # across tables, so that both lookups can use an index
+            table_name = self.require_table(prop.ElementName)
+            select_name = sqlalchemy.sql.select(table_name.c["element_id"]).where(
+                table_name.c["value"] == sqlalchemy.bindparam("element")
+            )
+
+            table_symbol = self.require_table(prop.ElementSymbol)
+            select_symbol = sqlalchemy.sql.select(table_symbol.c["element_id"]).where(
+                table_symbol.c["value"] == sqlalchemy.bindparam("element")
             )
+
             builder.add_clause(
-                sqlalchemy.sql.or_(
-                    table_notation.c["ascii"] == xray_transition,
-                    table_notation.c["utf16"] == xray_transition,
-                )
+                table.c[column].in_(sqlalchemy.sql.union(select_name, select_symbol))
             )
 
         else:
-            src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n = self._expand_xray_transition(
-                xray_transition
-            )
-            table_xray_transition = self.require_table(descriptor.XrayTransition)
+            table_element = self.require_table(descriptor.Element)
             builder.add_join(
-                table,
-                table_xray_transition,
-                table.c[column] == table_xray_transition.c["id"],
+                table, table_element, table.c[column] == table_element.c["id"]
+            )
+            builder.add_clause(
+                table_element.c["atomic_number"] == sqlalchemy.bindparam("element")
             )
 
-            if search:
+    def _update_atomic_shell(
+        self, builder, table, atomic_shell_kind, column="atomic_shell_id"
+    ):
+        table_atomic_shell = self.require_table(descriptor.AtomicShell)
+        builder.add_join(
+            table, table_atomic_shell, table.c[column] == table_atomic_shell.c["id"]
+        )
 
-                def create_clause(column, value):
-                    if value is not None:
-                        return table_xray_transition.c[column] == value
-                    else:
-                        return table_xray_transition.c[column] != None
+        column_n = table_atomic_shell.c["principal_quantum_number"]
+        if atomic_shell_kind is list:
+            builder.add_clause(
+                column_n.in_(sqlalchemy.bindparam("atomic_shell", expanding=True))
+            )
+        else:
+            builder.add_clause(column_n == sqlalchemy.bindparam("atomic_shell"))
 
+    def _update_quantum_numbers(
+        self, builder, table, name, columns, defineds, search=False
+    ):
+        for column, defined in zip(columns, defineds):
+            if defined:
                 builder.add_clause(
-                    create_clause("source_principal_quantum_number", src_n)
-                )
-                builder.add_clause(
-                    create_clause("source_azimuthal_quantum_number", src_l)
-                )
-                builder.add_clause(
-                    create_clause("source_total_angular_momentum_nominator", src_j_n)
-                )
-                builder.add_clause(
-                    create_clause("destination_principal_quantum_number", dst_n)
-                )
-                builder.add_clause(
-                    create_clause("destination_azimuthal_quantum_number", dst_l)
-                )
-                builder.add_clause(
-                    create_clause(
-                        "destination_total_angular_momentum_nominator", dst_j_n
-                    )
+                    table.c[column] == sqlalchemy.bindparam(name + "_" + column)
                 )
-
+            elif search:
+                builder.add_clause(table.c[column] != None)
             else:
-                builder.add_clause(
-                    table_xray_transition.c["source_principal_quantum_number"] == src_n
-                )
-                builder.add_clause(
-                    table_xray_transition.c["source_azimuthal_quantum_number"] == src_l
-                )
-                builder.add_clause(
-                    table_xray_transition.c["source_total_angular_momentum_nominator"]
-                    == src_j_n
-                )
-                builder.add_clause(
-                    table_xray_transition.c["destination_principal_quantum_number"]
-                    == dst_n
-                )
-                builder.add_clause(
-                    table_xray_transition.c["destination_azimuthal_quantum_number"]
-                    == dst_l
-                )
-                builder.add_clause(
-                    table_xray_transition.c[
-                        "destination_total_angular_momentum_nominator"
-                    ]
-                    == dst_j_n
+                builder.add_clause(table.c[column] == None)
+
+    def _update_packed_key(self, builder, table, dataclass, name, kind, search=False):
+        column = self._get_packed_key(table, dataclass)
+
+        # Keys of the descriptors of a notation, always matched exactly
+        if kind is list:
+            builder.add_clause(
+                column.in_(sqlalchemy.bindparam(name + "_key", expanding=True))
+            )
+            return
+
+        # Undefined quantum numbers are zero in the key, so an exact match
+        # is one equality
+        key = sqlalchemy.bindparam(name + "_key")
+        if kind is int or not search or all(kind):
+            builder.add_clause(column == key)
+            return
+
+        defineds = kind
+
+        # Otherwise only the defined quantum numbers are compared and the
+        # undefined ones must be defined in the matching rows
+        mask = descriptor.pack_quantum_numbers_mask(
+            [0 if defined else None for defined in defineds]
+        )
+        builder.add_clause(column.op("&")(mask) == key)
+
+        for index, defined in enumerate(reversed(defineds)):
+            if not defined:
+                field_mask = ((1 << descriptor.KEY_BITS) - 1) << (
+                    index * descriptor.KEY_BITS
                 )
+                builder.add_clause(column.op("&")(field_mask) != 0)
 
-    def _update_reference(self, builder, table, reference, column="reference_id"):
-        if isinstance(reference, descriptor.Reference):
-            reference = reference.bibtexkey
+    def _update_atomic_subshell(
+        self, builder, table, atomic_subshell_kind, column="atomic_subshell_id"
+    ):
+        table_atomic_subshell = self.require_table(descriptor.AtomicSubshell)
+        builder.add_join(
+            table,
+            table_atomic_subshell,
+            table.c[column] == table_atomic_subshell.c["id"],
+        )
+        self._update_packed_key(
+            builder,
+            table_atomic_subshell,
+            descriptor.AtomicSubshell,
+            "atomic_subshell",
+            atomic_subshell_kind,
+        )
 
+    def _update_xray_transition(
+        self,
+        builder,
+        table,
+        xray_transition_kind,
+        column="xray_transition_id",
+        search=False,
+    ):
+        table_xray_transition = self.require_table(descriptor.XrayTransition)
+        builder.add_join(
+            table,
+            table_xray_transition,
+            table.c[column] == table_xray_transition.c["id"],
+        )
+        self._update_packed_key(
+            builder,
+            table_xray_transition,
+            descriptor.XrayTransition,
+            "xray_transition",
+            xray_transition_kind,
+            search,
+        )
+
+    def _update_nonradiative_transition(
+        self,
+        builder,
+        table,
+        nonradiative_transition_kind,
+        column="nonradiative_transition_id",
+    ):
+        table_nonradiative_transition = self.require_table(
+            descriptor.NonRadiativeTransition
+        )
+        builder.add_join(
+            table,
+            table_nonradiative_transition,
+            table.c[column] == table_nonradiative_transition.c["id"],
+        )
+        self._update_quantum_numbers(
+            builder,
+            table_nonradiative_transition,
+            "nonradiative_transition",
+            NONRADIATIVE_TRANSITION_COLUMNS,
+            nonradiative_transition_kind,
+        )
+
+    def _update_reference(self, builder, table, has_reference, column="reference_id"):
         table_reference = self.require_table(descriptor.Reference)
         builder.add_join(
             table, table_reference, table.c[column] == table_reference.c["id"]
         )
         builder.add_orderby(table_reference.c["year"], ascending=False)  # Newest first
 
-        if reference:
-            builder.add_clause(table_reference.c["bibtexkey"] == reference)
-
-    def _update_language(self, builder, table, language):
-        if isinstance(language, descriptor.Language):
-            language = language.key
+        if has_reference:
+            builder.add_clause(
+                table_reference.c["bibtexkey"] == sqlalchemy.bindparam("reference")
+            )
 
+    def _update_language(self, builder, table):
         table_language = self.require_table(descriptor.Language)
         builder.add_join(
             table, table_language, table.c["language_id"] == table_language.c["id"]
         )
-        builder.add_clause(table_language.c["key"] == language)
-
-    def _update_notation(self, builder, table, notation):
-        if isinstance(notation, descriptor.Notation):
-            notation = notation.key
+        builder.add_clause(table_language.c["key"] == sqlalchemy.bindparam("language"))
 
+    def _update_notation(self, builder, table):
         table_notation = self.require_table(descriptor.Notation)
         builder.add_join(
             table, table_notation, table.c["notation_id"] == table_notation.c["id"]
         )
-        builder.add_clause(table_notation.c["key"] == notation)
+        builder.add_clause(table_notation.c["key"] == sqlalchemy.bindparam("notation"))
+
+    def _require_statement(self, key, create_builder):
+        """
+        Returns the statement cached under *key*.
+        If no statement exists, it is first built from the
+        :class:`StatementBuilder` returned by *create_builder*.
+        """
+        statement = self._statements.get(key)
+
+        if statement is None:
+            statement = create_builder().build()
+            self._statements[key] = statement
 
-    def _execute(self, builder):
-        statement = builder.build()
-        logger.debug(statement.compile())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(statement.compile())
+
+        return statement
+
+    def _execute(self, key, create_builder, params):
+        statement = self._require_statement(key, create_builder)
 
         # Execute
         with self.engine.connect() as conn:
-            row = conn.execute(statement).first()
+            row = conn.execute(statement, params).first()
             if not row:
                 raise NotFound
 
@@ -340,336 +458,702 @@ class SqlDatabase(_DatabaseMixin, SqlBase):
             else:
                 return row
 
-    def _execute_many(self, builder):
-        statement = builder.build()
-        logger.debug(statement.compile())
+    def _execute_many(self, key, create_builder, params):
+        statement = self._require_statement(key, create_builder)
 
         # Execute
         with self.engine.connect() as conn:
-            rows = conn.execute(statement).fetchall()
+            rows = conn.execute(statement, params).fetchall()
             if not rows:
                 raise NotFound
 
             return rows
 
-    def element(self, element):
-        table = self.require_table(descriptor.Element)
+    def _execute_element_property(self, dataclass, column, element, reference):
+        params = {}
+        element_kind = self._bind_element(params, element)
+        has_reference = self._bind_reference(params, reference)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["atomic_number"])
-        self._update_element(builder, table, element, "id")
+        def create_builder():
+            table = self.require_table(dataclass)
 
-        atomic_number = self._execute(builder)
-        return descriptor.Element(atomic_number)
+            builder = StatementBuilder()
+            builder.add_column(table.c[column])
+            self._update_element(builder, table, element_kind)
+            self._update_reference(builder, table, has_reference)
+            return builder
 
-    def element_atomic_number(self, element):
-        table = self.require_table(descriptor.Element)
+        key = (dataclass, element_kind, has_reference)
+        return self._execute(key, create_builder, params)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["atomic_number"])
-        self._update_element(builder, table, element, "id")
+    def _execute_atomic_subshell_property(
+        self, dataclass, column, element, atomic_subshell, reference
+    ):
+        params = {}
+        element_kind = self._bind_element(params, element)
+        atomic_subshell_kind = self._bind_atomic_subshell(params, atomic_subshell)
+        has_reference = self._bind_reference(params, reference)
+
+        def create_builder():
+            table = self.require_table(dataclass)
+
+            builder = StatementBuilder()
+            builder.add_column(table.c[column])
+            self._update_element(builder, table, element_kind)
+            self._update_atomic_subshell(builder, table, atomic_subshell_kind)
+            self._update_reference(builder, table, has_reference)
+            return builder
+
+        key = (dataclass, element_kind, atomic_subshell_kind, has_reference)
+        return self._execute(key, create_builder, params)
+
+    def _execute_xray_transition_property(
+        self, dataclass, column, element, xray_transition, reference
+    ):
+        params = {}
+        element_kind = self._bind_element(params, element)
+        xray_transition_kind = self._bind_xray_transition(params, xray_transition)
+        has_reference = self._bind_reference(params, reference)
+
+        def create_builder():
+            table = self.require_table(dataclass)
+
+            builder = StatementBuilder()
+            builder.add_column(table.c[column])
+            self._update_element(builder, table, element_kind)
+            self._update_xray_transition(builder, table, xray_transition_kind)
+            self._update_reference(builder, table, has_reference)
+            return builder
+
+        key = (dataclass, element_kind, xray_transition_kind, has_reference)
+        return self._execute(key, create_builder, params)
+
+    def _execute_nonradiative_transition_property(
+        self, dataclass, column, element, nonradiative_transition, reference
+    ):
+        params = {}
+        element_kind = self._bind_element(params, element)
+        nonradiative_transition_kind = self._bind_nonradiative_transition(
+            params, nonradiative_transition
+        )
+        has_reference = self._bind_reference(params, reference)
 
-        return self._execute(builder)
+        def create_builder():
+            table = self.require_table(dataclass)
 
-    def element_symbol(self, element, reference=None):
-        table = self.require_table(prop.ElementSymbol)
+            builder = StatementBuilder()
+            builder.add_column(table.c[column])
+            self._update_element(builder, table, element_kind)
+            self._update_nonradiative_transition(
+                builder, table, nonradiative_transition_kind
+            )
+            self._update_reference(builder, table, has_reference)
+            return builder
+
+        key = (dataclass, element_kind, nonradiative_transition_kind, has_reference)
+        return self._execute(key, create_builder, params)
+
+    def _add_xray_transition_columns(self, builder, table_xray):
+        for column in XRAY_TRANSITION_COLUMNS:
+            builder.add_column(table_xray.c[column])
+
+    def _resolve_atomic_numbers(self, elements):
+        """
+        Returns a :class:`dict` of the distinct elements and their atomic
+        number, ``None`` if the element does not exist.
+        """
+        atomic_numbers = {}
+
+        for element in elements:
+            if element in atomic_numbers:
+                continue
+
+            z = getattr(element, "atomic_number", element)
+            if isinstance(z, numbers.Integral):
+                z = int(z)
+            else:
+                try:
+                    z = self.element_atomic_number(z)
+                except NotFound:
+                    z = None
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["value"])
-        self._update_element(builder, table, element)
-        self._update_reference(builder, table, reference)
+            atomic_numbers[element] = z
 
-        return self._execute(builder)
+        return atomic_numbers
 
-    def element_name(self, element, language="en", reference=None):
-        table = self.require_table(prop.ElementName)
+    def _resolve_descriptor_keys(self, values, notation_dataclass, columns, expand):
+        """
+        Returns a :class:`dict` of the distinct values (see :func:`_freeze <pyxray.base._freeze>`)
+        and the list of quantum numbers of the descriptors they refer to.
+        A notation may refer to more than one descriptor.
+        """
+        keys = {}
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["value"])
-        self._update_element(builder, table, element)
-        self._update_language(builder, table, language)
-        self._update_reference(builder, table, reference)
+        for value in map(_freeze, values):
+            if value in keys:
+                continue
 
-        return self._execute(builder)
+            try:
+                if isinstance(value, str):
+                    keys[value] = [
+                        tuple(getattr(found, name) for name in columns)
+                        for found in self._resolve_notation(notation_dataclass, value)
+                    ]
+                else:
+                    keys[value] = [expand(value)]
+            except NotFound:
+                keys[value] = []
+
+        return keys
+
+    def _execute_property_many(
+        self,
+        dataclass,
+        column,
+        atomic_numbers,
+        reference,
+        descriptor_class=None,
+        descriptor_columns=(),
+    ):
+        """
+        Returns the values of a property for all the specified atomic numbers
+        in a single query.
+        The values are returned in a :class:`dict` where the key is the atomic
+        number and the quantum numbers of the descriptor (if any) and
+        the value is a :class:`tuple` of the priority of the row
+        (lowest first) and the value.
+        """
+        params = {"atomic_numbers": sorted(atomic_numbers)}
+        has_reference = self._bind_reference(params, reference)
+
+        def create_builder():
+            table = self.require_table(dataclass)
+            table_element = self.require_table(descriptor.Element)
 
-    def element_atomic_weight(self, element, reference=None):
-        table = self.require_table(prop.ElementAtomicWeight)
+            builder = StatementBuilder()
+            builder.add_column(table_element.c["atomic_number"])
+            builder.add_join(
+                table, table_element, table.c["element_id"] == table_element.c["id"]
+            )
+            builder.add_clause(
+                table_element.c["atomic_number"].in_(
+                    sqlalchemy.bindparam("atomic_numbers", expanding=True)
+                )
+            )
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["value"])
-        self._update_element(builder, table, element)
-        self._update_reference(builder, table, reference)
+            if descriptor_class is not None:
+                table_descriptor = self.require_table(descriptor_class)
+                column_id = self._get_table_name(descriptor_class) + "_id"
+                builder.add_join(
+                    table,
+                    table_descriptor,
+                    table.c[column_id] == table_descriptor.c["id"],
+                )
+                for name in descriptor_columns:
+                    builder.add_column(table_descriptor.c[name])
 
-        return self._execute(builder)
+            builder.add_column(table.c[column])
+            self._update_reference(builder, table, has_reference)
+            builder.add_orderby(table.c["id"])
+            return builder
 
-    def element_mass_density_kg_per_m3(self, element, reference=None):
-        table = self.require_table(prop.ElementMassDensity)
+        key = ("many", dataclass, has_reference)
+        statement = self._require_statement(key, create_builder)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["value_kg_per_m3"])
-        self._update_element(builder, table, element)
-        self._update_reference(builder, table, reference)
+        values = {}
+        with self.engine.connect() as conn:
+            for rank, row in enumerate(conn.execute(statement, params)):
+                values.setdefault(tuple(row[:-1]), (rank, row[-1]))
 
-        return self._execute(builder)
+        return values
 
-    def element_xray_transitions(self, element, xray_transition=None, reference=None):
-        table_xray = self.require_table(descriptor.XrayTransition)
-        table_probability = self.require_table(prop.XrayTransitionProbability)
-
-        builder = StatementBuilder(distinct=True)
-        builder.add_column(table_xray.c["source_principal_quantum_number"])
-        builder.add_column(table_xray.c["source_azimuthal_quantum_number"])
-        builder.add_column(table_xray.c["source_total_angular_momentum_nominator"])
-        builder.add_column(table_xray.c["destination_principal_quantum_number"])
-        builder.add_column(table_xray.c["destination_azimuthal_quantum_number"])
-        builder.add_column(table_xray.c["destination_total_angular_momentum_nominator"])
-        builder.add_join(
-            table_probability,
-            table_xray,
-            table_probability.c["xray_transition_id"] == table_xray.c["id"],
+    def _execute_element_property_many(self, dataclass, column, elements, reference):
+        atomic_numbers = self._resolve_atomic_numbers(elements)
+        found = self._execute_property_many(
+            dataclass, column, set(atomic_numbers.values()) - {None}, reference
         )
-        builder.add_clause(table_probability.c["value"] > 0.0)
-        self._update_element(builder, table_probability, element)
-        self._update_reference(builder, table_probability, reference)
-        if xray_transition is not None:
-            self._update_xray_transition(
-                builder, table_probability, xray_transition, search=True
-            )
 
-        transitions = []
-        try:
-            for src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n in self._execute_many(
-                builder
-            ):
-                transition = descriptor.XrayTransition(
-                    src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n
-                )
-                transitions.append(transition)
-        except NotFound:
-            logger.info("No transition found for {}".format(element))
+        values = numpy.full(len(elements), numpy.nan)
+        for index, element in enumerate(elements):
+            rank_value = found.get((atomic_numbers[element],))
+            if rank_value is not None:
+                values[index] = rank_value[1]
+
+        return values
+
+    def _execute_descriptor_property_many(
+        self,
+        dataclass,
+        column,
+        elements,
+        others,
+        reference,
+        descriptor_class,
+        notation_class,
+        descriptor_columns,
+        expand,
+    ):
+        self._check_same_length(elements, others)
 
-        if len(transitions) == 0:
-            table_relative_weight = self.require_table(
-                prop.XrayTransitionRelativeWeight
-            )
-            builder = StatementBuilder(distinct=True)
-            builder.add_column(table_xray.c["source_principal_quantum_number"])
-            builder.add_column(table_xray.c["source_azimuthal_quantum_number"])
-            builder.add_column(table_xray.c["source_total_angular_momentum_nominator"])
-            builder.add_column(table_xray.c["destination_principal_quantum_number"])
-            builder.add_column(table_xray.c["destination_azimuthal_quantum_number"])
-            builder.add_column(
-                table_xray.c["destination_total_angular_momentum_nominator"]
-            )
-            builder.add_join(
-                table_relative_weight,
-                table_xray,
-                table_relative_weight.c["xray_transition_id"] == table_xray.c["id"],
-            )
-            builder.add_clause(table_relative_weight.c["value"] > 0.0)
-            self._update_element(builder, table_relative_weight, element)
-            self._update_reference(builder, table_relative_weight, reference)
-            if xray_transition is not None:
-                self._update_xray_transition(
-                    builder, table_relative_weight, xray_transition, search=True
+        atomic_numbers = self._resolve_atomic_numbers(elements)
+        keys = self._resolve_descriptor_keys(
+            others, notation_class, descriptor_columns, expand
+        )
+        found = self._execute_property_many(
+            dataclass,
+            column,
+            set(atomic_numbers.values()) - {None},
+            reference,
+            descriptor_class,
+            descriptor_columns,
+        )
+
+        values = numpy.full(len(elements), numpy.nan)
+        for index, (element, other) in enumerate(zip(elements, others)):
+            z = atomic_numbers[element]
+
+            # A notation referring to several descriptors takes
+            # the value with the highest priority
+            candidates = [found.get((z, *key)) for key in keys[_freeze(other)]]
+            candidates = [candidate for candidate in candidates if candidate]
+            if candidates:
+                values[index] = min(candidates)[1]
+
+        return values
+
+    def _execute_atomic_subshell_property_many(
+        self, dataclass, column, elements, atomic_subshells, reference
+    ):
+        return self._execute_descriptor_property_many(
+            dataclass,
+            column,
+            elements,
+            atomic_subshells,
+            reference,
+            descriptor.AtomicSubshell,
+            prop.AtomicSubshellNotation,
+            ATOMIC_SUBSHELL_COLUMNS,
+            self._expand_atomic_subshell,
+        )
+
+    def _execute_xray_transition_property_many(
+        self, dataclass, column, elements, xray_transitions, reference
+    ):
+        return self._execute_descriptor_property_many(
+            dataclass,
+            column,
+            elements,
+            xray_transitions,
+            reference,
+            descriptor.XrayTransition,
+            prop.XrayTransitionNotation,
+            XRAY_TRANSITION_COLUMNS,
+            self._expand_xray_transition,
+        )
+
+    def element(self, element):
+        atomic_number = self.element_atomic_number(element)
+        return descriptor.Element.of(atomic_number)
+
+    def element_atomic_number(self, element):
+        params = {}
+        element_kind = self._bind_element(params, element)
+
+        def create_builder():
+            table = self.require_table(descriptor.Element)
+
+            builder = StatementBuilder()
+            builder.add_column(table.c["atomic_number"])
+            self._update_element(builder, table, element_kind, "id")
+            return builder
+
+        key = ("element_atomic_number", element_kind)
+        return self._execute(key, create_builder, params)
+
+    def element_symbol(self, element, reference=None):
+        return self._execute_element_property(
+            prop.ElementSymbol, "value", element, reference
+        )
+
+    def element_name(self, element, language="en", reference=None):
+        params = {}
+        element_kind = self._bind_element(params, element)
+        self._bind_language(params, language)
+        has_reference = self._bind_reference(params, reference)
+
+        def create_builder():
+            table = self.require_table(prop.ElementName)
+
+            builder = StatementBuilder()
+            builder.add_column(table.c["value"])
+            self._update_element(builder, table, element_kind)
+            self._update_language(builder, table)
+            self._update_reference(builder, table, has_reference)
+            return builder
+
+        key = (prop.ElementName, element_kind, has_reference)
+        return self._execute(key, create_builder, params)
+
+    def element_atomic_weight(self, element, reference=None):
+        return self._execute_element_property(
+            prop.ElementAtomicWeight, "value", element, reference
+        )
+
+    def element_mass_density_kg_per_m3(self, element, reference=None):
+        return self._execute_element_property(
+            prop.ElementMassDensity, "value_kg_per_m3", element, reference
+        )
+
+    def element_xray_transitions(self, element, xray_transition=None, reference=None):
+        params = {}
+        element_kind = self._bind_element(params, element)
+        xray_transition_kind = None
+        if xray_transition is not None:
+            xray_transition_kind = self._bind_xray_transition(params, xray_transition)
+        has_reference = self._bind_reference(params, reference)
+
+        # Transitions with a probability, otherwise with a relative weight
+        for dataclass in [
+            prop.XrayTransitionProbability,
+            prop.XrayTransitionRelativeWeight,
+        ]:
+
+            def create_builder():
+                table_xray = self.require_table(descriptor.XrayTransition)
+                table = self.require_table(dataclass)
+
+                builder = StatementBuilder(distinct=True)
+                self._add_xray_transition_columns(builder, table_xray)
+                builder.add_join(
+                    table,
+                    table_xray,
+                    table.c["xray_transition_id"] == table_xray.c["id"],
                 )
+                builder.add_clause(table.c["value"] > 0.0)
+                self._update_element(builder, table, element_kind)
+                self._update_reference(builder, table, has_reference)
+                if xray_transition_kind is not None:
+                    self._update_xray_transition(
+                        builder, table, xray_transition_kind, search=True
+                    )
+                return builder
+
+            key = (
+                "element_xray_transitions",
+                dataclass,
+                element_kind,
+                xray_transition_kind,
+                has_reference,
+            )
 
-            transitions = []
             try:
-                for src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n in self._execute_many(
-                    builder
-                ):
-                    transition = descriptor.XrayTransition(
-                        src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n
-                    )
-                    transitions.append(transition)
+                rows = self._execute_many(key, create_builder, params)
             except NotFound:
                 logger.info("No transition found for {}".format(element))
+                continue
 
-        if len(transitions) == 0:
-            raise NotFound
+            return tuple(descriptor.XrayTransition.of(*row) for row in rows)
 
-        return tuple(transitions)
+        raise NotFound
 
     def element_xray_transition(self, element, xray_transition, reference=None):
-        table_xray = self.require_table(descriptor.XrayTransition)
-        table_probability = self.require_table(prop.XrayTransitionProbability)
-
-        builder = StatementBuilder()
-        builder.add_column(table_xray.c["source_principal_quantum_number"])
-        builder.add_column(table_xray.c["source_azimuthal_quantum_number"])
-        builder.add_column(table_xray.c["source_total_angular_momentum_nominator"])
-        builder.add_column(table_xray.c["destination_principal_quantum_number"])
-        builder.add_column(table_xray.c["destination_azimuthal_quantum_number"])
-        builder.add_column(table_xray.c["destination_total_angular_momentum_nominator"])
-        builder.add_join(
-            table_probability,
-            table_xray,
-            table_probability.c["xray_transition_id"] == table_xray.c["id"],
-        )
-        builder.add_clause(table_probability.c["value"] > 0.0)
-        self._update_xray_transition(builder, table_xray, xray_transition, "id")
-        self._update_element(builder, table_probability, element)
-        self._update_reference(builder, table_probability, reference)
+        params = {}
+        element_kind = self._bind_element(params, element)
+        xray_transition_kind = self._bind_xray_transition(params, xray_transition)
+        has_reference = self._bind_reference(params, reference)
 
-        src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n = self._execute(builder)
-        return descriptor.XrayTransition(src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n)
+        def create_builder():
+            table_xray = self.require_table(descriptor.XrayTransition)
+            table_probability = self.require_table(prop.XrayTransitionProbability)
+
+            builder = StatementBuilder()
+            self._add_xray_transition_columns(builder, table_xray)
+            builder.add_join(
+                table_probability,
+                table_xray,
+                table_probability.c["xray_transition_id"] == table_xray.c["id"],
+            )
+            builder.add_clause(table_probability.c["value"] > 0.0)
+            self._update_xray_transition(
+                builder, table_xray, xray_transition_kind, "id"
+            )
+            self._update_element(builder, table_probability, element_kind)
+            self._update_reference(builder, table_probability, has_reference)
+            return builder
+
+        key = (
+            "element_xray_transition",
+            element_kind,
+            xray_transition_kind,
+            has_reference,
+        )
+        row = self._execute(key, create_builder, params)
+        return descriptor.XrayTransition.of(*row)
 
     def atomic_shell(self, atomic_shell):
-        table = self.require_table(descriptor.AtomicShell)
+        params = {}
+        atomic_shell_kind = self._bind_atomic_shell(params, atomic_shell)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["principal_quantum_number"])
-        self._update_atomic_shell(builder, table, atomic_shell, "id")
+        def create_builder():
+            table = self.require_table(descriptor.AtomicShell)
 
-        principal_quantum_number = self._execute(builder)
+            builder = StatementBuilder()
+            builder.add_column(table.c["principal_quantum_number"])
+            self._update_atomic_shell(builder, table, atomic_shell_kind, "id")
+            return builder
+
+        key = ("atomic_shell", atomic_shell_kind)
+        principal_quantum_number = self._execute(key, create_builder, params)
         return descriptor.AtomicShell(principal_quantum_number)
 
     def atomic_shell_notation(
         self, atomic_shell, notation, encoding="utf16", reference=None
     ):
-        table = self.require_table(prop.AtomicShellNotation)
+        params = {}
+        atomic_shell_kind = self._bind_atomic_shell(params, atomic_shell)
+        self._bind_notation(params, notation)
+        has_reference = self._bind_reference(params, reference)
+
+        def create_builder():
+            table = self.require_table(prop.AtomicShellNotation)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c[encoding])
-        self._update_atomic_shell(builder, table, atomic_shell, "id")
-        self._update_notation(builder, table, notation)
-        self._update_reference(builder, table, reference)
+            builder = StatementBuilder()
+            builder.add_column(table.c[encoding])
+            self._update_atomic_shell(builder, table, atomic_shell_kind)
+            self._update_notation(builder, table)
+            self._update_reference(builder, table, has_reference)
+            return builder
 
-        return self._execute(builder)
+        key = (prop.AtomicShellNotation, atomic_shell_kind, encoding, has_reference)
+        return self._execute(key, create_builder, params)
 
     def atomic_subshell(self, atomic_subshell):
-        table = self.require_table(descriptor.AtomicSubshell)
+        params = {}
+        atomic_subshell_kind = self._bind_atomic_subshell(params, atomic_subshell)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["principal_quantum_number"])
-        builder.add_column(table.c["azimuthal_quantum_number"])
-        builder.add_column(table.c["total_angular_momentum_nominator"])
-        self._update_atomic_subshell(builder, table, atomic_subshell, "id")
+        def create_builder():
+            table = self.require_table(descriptor.AtomicSubshell)
 
-        n, l, j_n = self._execute(builder)
-        return descriptor.AtomicSubshell(n, l, j_n)
+            builder = StatementBuilder()
+            for column in ATOMIC_SUBSHELL_COLUMNS:
+                builder.add_column(table.c[column])
+            self._update_atomic_subshell(builder, table, atomic_subshell_kind, "id")
+            return builder
+
+        key = ("atomic_subshell", atomic_subshell_kind)
+        n, l, j_n = self._execute(key, create_builder, params)
+        return descriptor.AtomicSubshell.of(n, l, j_n)
 
     def atomic_subshell_notation(
         self, atomic_subshell, notation, encoding="utf16", reference=None
     ):
-        table = self.require_table(prop.AtomicSubshellNotation)
-
-        builder = StatementBuilder()
-        builder.add_column(table.c[encoding])
-        self._update_atomic_subshell(builder, table, atomic_subshell)
-        self._update_notation(builder, table, notation)
-        self._update_reference(builder, table, reference)
-
-        return self._execute(builder)
+        params = {}
+        atomic_subshell_kind = self._bind_atomic_subshell(params, atomic_subshell)
+        self._bind_notation(params, notation)
+        has_reference = self._bind_reference(params, reference)
+
+        def create_builder():
+            table = self.require_table(prop.AtomicSubshellNotation)
+
+            builder = StatementBuilder()
+            builder.add_column(table.c[encoding])
+            self._update_atomic_subshell(builder, table, atomic_subshell_kind)
+            self._update_notation(builder, table)
+            self._update_reference(builder, table, has_reference)
+            return builder
+
+        key = (
+            prop.AtomicSubshellNotation,
+            atomic_subshell_kind,
+            encoding,
+            has_reference,
+        )
+        return self._execute(key, create_builder, params)
 
     def atomic_subshell_binding_energy_eV(
         self, element, atomic_subshell, reference=None
     ):
-        table = self.require_table(prop.AtomicSubshellBindingEnergy)
-
-        builder = StatementBuilder()
-        builder.add_column(table.c["value_eV"])
-        self._update_element(builder, table, element)
-        self._update_atomic_subshell(builder, table, atomic_subshell)
-        self._update_reference(builder, table, reference)
-
-        return self._execute(builder)
+        return self._execute_atomic_subshell_property(
+            prop.AtomicSubshellBindingEnergy,
+            "value_eV",
+            element,
+            atomic_subshell,
+            reference,
+        )
 
     def atomic_subshell_radiative_width_eV(
         self, element, atomic_subshell, reference=None
     ):
-        table = self.require_table(prop.AtomicSubshellRadiativeWidth)
-
-        builder = StatementBuilder()
-        builder.add_column(table.c["value_eV"])
-        self._update_element(builder, table, element)
-        self._update_atomic_subshell(builder, table, atomic_subshell)
-        self._update_reference(builder, table, reference)
-
-        return self._execute(builder)
+        return self._execute_atomic_subshell_property(
+            prop.AtomicSubshellRadiativeWidth,
+            "value_eV",
+            element,
+            atomic_subshell,
+            reference,
+        )
 
     def atomic_subshell_nonradiative_width_eV(
         self, element, atomic_subshell, reference=None
     ):
-        table = self.require_table(prop.AtomicSubshellNonRadiativeWidth)
-
-        builder = StatementBuilder()
-        builder.add_column(table.c["value_eV"])
-        self._update_element(builder, table, element)
-        self._update_atomic_subshell(builder, table, atomic_subshell)
-        self._update_reference(builder, table, reference)
-
-        return self._execute(builder)
+        return self._execute_atomic_subshell_property(
+            prop.AtomicSubshellNonRadiativeWidth,
+            "value_eV",
+            element,
+            atomic_subshell,
+            reference,
+        )
 
     def atomic_subshell_occupancy(self, element, atomic_subshell, reference=None):
-        table = self.require_table(prop.AtomicSubshellOccupancy)
-
-        builder = StatementBuilder()
-        builder.add_column(table.c["value"])
-        self._update_element(builder, table, element)
-        self._update_atomic_subshell(builder, table, atomic_subshell)
-        self._update_reference(builder, table, reference)
-
-        return self._execute(builder)
+        return self._execute_atomic_subshell_property(
+            prop.AtomicSubshellOccupancy, "value", element, atomic_subshell, reference
+        )
 
     def xray_transition(self, xray_transition):
-        table = self.require_table(descriptor.XrayTransition)
+        params = {}
+        xray_transition_kind = self._bind_xray_transition(params, xray_transition)
+
+        def create_builder():
+            table = self.require_table(descriptor.XrayTransition)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["source_principal_quantum_number"])
-        builder.add_column(table.c["source_azimuthal_quantum_number"])
-        builder.add_column(table.c["source_total_angular_momentum_nominator"])
-        builder.add_column(table.c["destination_principal_quantum_number"])
-        builder.add_column(table.c["destination_azimuthal_quantum_number"])
-        builder.add_column(table.c["destination_total_angular_momentum_nominator"])
-        self._update_xray_transition(builder, table, xray_transition, "id")
+            builder = StatementBuilder()
+            self._add_xray_transition_columns(builder, table)
+            self._update_xray_transition(builder, table, xray_transition_kind, "id")
+            return builder
 
-        src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n = self._execute(builder)
-        return descriptor.XrayTransition(src_n, src_l, src_j_n, dst_n, dst_l, dst_j_n)
+        key = ("xray_transition", xray_transition_kind)
+        row = self._execute(key, create_builder, params)
+        return descriptor.XrayTransition.of(*row)
 
     def xray_transition_notation(
         self, xray_transition, notation, encoding="utf16", reference=None
     ):
-        table = self.require_table(prop.XrayTransitionNotation)
+        params = {}
+        xray_transition_kind = self._bind_xray_transition(params, xray_transition)
+        self._bind_notation(params, notation)
+        has_reference = self._bind_reference(params, reference)
+
+        def create_builder():
+            table = self.require_table(prop.XrayTransitionNotation)
+
+            builder = StatementBuilder()
+            builder.add_column(table.c[encoding])
+            self._update_xray_transition(builder, table, xray_transition_kind)
+            self._update_notation(builder, table)
+            self._update_reference(builder, table, has_reference)
+            return builder
+
+        key = (
+            prop.XrayTransitionNotation,
+            xray_transition_kind,
+            encoding,
+            has_reference,
+        )
+        return self._execute(key, create_builder, params)
 
-        builder = StatementBuilder()
-        builder.add_column(table.c[encoding])
-        self._update_xray_transition(builder, table, xray_transition)
-        self._update_notation(builder, table, notation)
-        self._update_reference(builder, table, reference)
+    def xray_transition_energy_eV(self, element, xray_transition, reference=None):
+        return self._execute_xray_transition_property(
+            prop.XrayTransitionEnergy, "value_eV", element, xray_transition, reference
+        )
 
-        return self._execute(builder)
+    def xray_transition_probability(self, element, xray_transition, reference=None):
+        return self._execute_xray_transition_property(
+            prop.XrayTransitionProbability,
+            "value",
+            element,
+            xray_transition,
+            reference,
+        )
 
-    def xray_transition_energy_eV(self, element, xray_transition, reference=None):
-        table = self.require_table(prop.XrayTransitionEnergy)
+    def xray_transition_relative_weight(self, element, xray_transition, reference=None):
+        return self._execute_xray_transition_property(
+            prop.XrayTransitionRelativeWeight,
+            "value",
+            element,
+            xray_transition,
+            reference,
+        )
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["value_eV"])
-        self._update_element(builder, table, element)
-        self._update_xray_transition(builder, table, xray_transition)
-        self._update_reference(builder, table, reference)
+    def nonradiative_transition_energy_eV(
+        self, element, nonradiative_transition, reference=None
+    ):
+        return self._execute_nonradiative_transition_property(
+            prop.NonRadiativeTransitionEnergy,
+            "value_eV",
+            element,
+            nonradiative_transition,
+            reference,
+        )
 
-        return self._execute(builder)
+    def nonradiative_transition_probability(
+        self, element, nonradiative_transition, reference=None
+    ):
+        return self._execute_nonradiative_transition_property(
+            prop.NonRadiativeTransitionProbability,
+            "value",
+            element,
+            nonradiative_transition,
+            reference,
+        )
 
-    def xray_transition_probability(self, element, xray_transition, reference=None):
-        table = self.require_table(prop.XrayTransitionProbability)
+    def element_atomic_weights(self, elements, reference=None):
+        return self._execute_element_property_many(
+            prop.ElementAtomicWeight, "value", elements, reference
+        )
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["value"])
-        self._update_element(builder, table, element)
-        self._update_xray_transition(builder, table, xray_transition)
-        self._update_reference(builder, table, reference)
+    def atomic_subshell_binding_energies_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self._execute_atomic_subshell_property_many(
+            prop.AtomicSubshellBindingEnergy,
+            "value_eV",
+            elements,
+            atomic_subshells,
+            reference,
+        )
 
-        return self._execute(builder)
+    def atomic_subshell_radiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self._execute_atomic_subshell_property_many(
+            prop.AtomicSubshellRadiativeWidth,
+            "value_eV",
+            elements,
+            atomic_subshells,
+            reference,
+        )
 
-    def xray_transition_relative_weight(self, element, xray_transition, reference=None):
-        table = self.require_table(prop.XrayTransitionRelativeWeight)
+    def atomic_subshell_nonradiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self._execute_atomic_subshell_property_many(
+            prop.AtomicSubshellNonRadiativeWidth,
+            "value_eV",
+            elements,
+            atomic_subshells,
+            reference,
+        )
+
+    def xray_transition_energies_eV(self, elements, xray_transitions, reference=None):
+        return self._execute_xray_transition_property_many(
+            prop.XrayTransitionEnergy, "value_eV", elements, xray_transitions, reference
+        )
 
-        builder = StatementBuilder()
-        builder.add_column(table.c["value"])
-        self._update_element(builder, table, element)
-        self._update_xray_transition(builder, table, xray_transition)
-        self._update_reference(builder, table, reference)
+    def xray_transition_probabilities(self, elements, xray_transitions, reference=None):
+        return self._execute_xray_transition_property_many(
+            prop.XrayTransitionProbability,
+            "value",
+            elements,
+            xray_transitions,
+            reference,
+        )
 
-        return self._execute(builder)
+    def xray_transition_relative_weights(
+        self, elements, xray_transitions, reference=None
+    ):
+        return self._execute_xray_transition_property_many(
+            prop.XrayTransitionRelativeWeight,
+            "value",
+            elements,
+            xray_transitions,
+            reference,
+        )
@@ -0,0 +1,667 @@
+"""
+Database loaded once in memory from the SQL database.
+"""
+
+# Standard library modules.
+import dataclasses
+import logging
+import math
+import numbers
+
+# Third party modules.
+import sqlalchemy.sql
+
+# Local modules.
+from pyxray.base import _DatabaseMixin, NotFound, _freeze
+from pyxray.sql.base import SqlBase
+import pyxray.descriptor as descriptor
+import pyxray.property as prop
+
+# Globals and constants variables.
+logger = logging.getLogger(__name__)
+
+DESCRIPTORS = [
+    descriptor.Element,
+    descriptor.AtomicShell,
+    descriptor.AtomicSubshell,
+    descriptor.XrayTransition,
+    descriptor.Language,
+    descriptor.Notation,
+]
+
+PROPERTIES = [
+    prop.ElementSymbol,
+    prop.ElementName,
+    prop.ElementAtomicWeight,
+    prop.ElementMassDensity,
+    prop.AtomicShellNotation,
+    prop.AtomicSubshellNotation,
+    prop.AtomicSubshellBindingEnergy,
+    prop.AtomicSubshellRadiativeWidth,
+    prop.AtomicSubshellNonRadiativeWidth,
+    prop.AtomicSubshellOccupancy,
+    prop.XrayTransitionNotation,
+    prop.XrayTransitionEnergy,
+    prop.XrayTransitionProbability,
+    prop.XrayTransitionRelativeWeight,
+]
+
+#: Non-radiative transitions outnumber all the other rows, so their tables
+#: are only loaded on the first lookup of a non-radiative property
+NONRADIATIVE_DESCRIPTORS = [descriptor.NonRadiativeTransition]
+
+NONRADIATIVE_PROPERTIES = [
+    prop.NonRadiativeTransitionEnergy,
+    prop.NonRadiativeTransitionProbability,
+]
+
+
+def _reference_order(year):
+    # Same order as the SQL query: newest first, references without year last
+    return (year is None, -(year or 0))
+
+
+class MemoryDatabase(_DatabaseMixin, SqlBase):
+    """
+    Database where all the rows of the SQL database are read once and indexed
+    in dictionaries.
+    Every lookup is then a dictionary lookup instead of an SQL query.
+
+    The descriptors are indexed by their quantum numbers (or key) and
+    the properties by a :class:`tuple` of their descriptors
+    (e.g. ``(atomic_number, (n, l, j_n))`` for the binding energy).
+    The values of a property are sorted following the same rule as the SQL
+    database: newest reference first.
+    """
+
+    def __init__(self, engine):
+        super().__init__(engine)
+
+        self._descriptors = {}
+        self._descriptor_keys = {}
+        self._references = {}
+        self._properties = {}
+        self._element_lookup = {}
+        self._notation_lookup = {}
+        self._element_xray_transitions = {}
+        self._nonradiative_loaded = False
+
+        self._load()
+
+    def _reflect_table(self, conn, dataclass):
+        """
+        Returns the table of a dataclass as it exists in the database,
+        ``None`` if the database has no such table.
+        The tables are reflected, not required, so that the database
+        (e.g. the distributed one) is only read.
+        """
+        table_name = self._get_table_name(dataclass)
+        table = self.metadata.tables.get(table_name)
+        if table is not None:
+            return table
+
+        if not sqlalchemy.inspect(conn).has_table(table_name):
+            logger.debug("No table {}, loaded as empty".format(table_name))
+            return None
+
+        return sqlalchemy.Table(table_name, self.metadata, autoload_with=conn)
+
+    def _read_rows(self, conn, dataclass):
+        table = self._reflect_table(conn, dataclass)
+        if table is None:
+            return []
+
+        statement = sqlalchemy.sql.select(table).order_by(table.c["id"])
+        return conn.execute(statement).mappings().all()
+
+    def _load(self):
+        with self.engine.connect() as conn:
+            for row in self._read_rows(conn, descriptor.Reference):
+                self._references[row["id"]] = (
+                    row["bibtexkey"].lower(),
+                    _reference_order(row["year"]),
+                )
+
+            for dataclass in DESCRIPTORS:
+                self._load_descriptor(conn, dataclass)
+
+            for dataclass in PROPERTIES:
+                self._load_property(conn, dataclass)
+
+        self._index_element_lookup()
+        self._index_notation_lookup(prop.AtomicShellNotation)
+        self._index_notation_lookup(prop.AtomicSubshellNotation)
+        self._index_notation_lookup(prop.XrayTransitionNotation)
+        self._index_element_xray_transitions(prop.XrayTransitionProbability)
+        self._index_element_xray_transitions(prop.XrayTransitionRelativeWeight)
+
+        logger.debug(
+            "Loaded {:d} property values in memory".format(
+                sum(len(entries) for entries in self._properties.values())
+            )
+        )
+
+    def _load_descriptor(self, conn, dataclass):
+        names = [field.name for field in dataclasses.fields(dataclass)]
+
+        keys = {}
+        for row in self._read_rows(conn, dataclass):
+            key = tuple(row[name] for name in names)
+            if len(key) == 1:
+                key = key[0]
+            if isinstance(key, str):
+                key = key.lower()
+            keys[row["id"]] = key
+
+        self._descriptors[dataclass] = keys
+        self._descriptor_keys[dataclass] = frozenset(keys.values())
+
+    def _load_property(self, conn, dataclass):
+        key_fields = []
+        value_names = []
+        for field in dataclasses.fields(dataclass):
+            if field.name == "reference":
+                continue
+            if dataclasses.is_dataclass(field.type):
+                key_fields.append(field)
+            else:
+                value_names.append(field.name)
+
+        table = self._reflect_table(conn, dataclass)
+        if table is None:
+            self._properties[dataclass] = {}
+            return
+
+        # Rows are read as plain tuples of the needed columns, in this order:
+        # descriptor ids, reference id and values.
+        # Mappings are much slower for the large non-radiative tables.
+        columns = [table.c[field.name + "_id"] for field in key_fields]
+        columns.append(table.c["reference_id"])
+        columns.extend(table.c[name] for name in value_names)
+        statement = sqlalchemy.sql.select(*columns).order_by(table.c["id"])
+
+        descriptors = [self._descriptors[field.type] for field in key_fields]
+        nkey = len(key_fields)
+        single_value = len(value_names) == 1
+
+        index = {}
+        for row in conn.execute(statement).all():
+            key = tuple([keys[row_id] for keys, row_id in zip(descriptors, row)])
+            bibtexkey, order = self._references[row[nkey]]
+
+            if single_value:
+                value = row[nkey + 1]
+            else:
+                value = dict(zip(value_names, row[nkey + 1 :]))
+
+            entries = index.get(key)
+            if entries is None:
+                index[key] = [(order, bibtexkey, value)]
+            else:
+                entries.append((order, bibtexkey, value))
+
+        for key, entries in index.items():
+            if len(entries) > 1:
+                entries.sort(key=lambda entry: entry[0])  # Stable sort
+            index[key] = [(bibtexkey, value) for _order, bibtexkey, value in entries]
+
+        self._properties[dataclass] = index
+
+    def _load_nonradiative(self):
+        if self._nonradiative_loaded:
+            return
+
+        with self.engine.connect() as conn:
+            for dataclass in NONRADIATIVE_DESCRIPTORS:
+                self._load_descriptor(conn, dataclass)
+
+            for dataclass in NONRADIATIVE_PROPERTIES:
+                self._load_property(conn, dataclass)
+
+        self._nonradiative_loaded = True
+
+    def _index_element_lookup(self):
+        for dataclass in [prop.ElementSymbol, prop.ElementName]:
+            for key, entries in self._properties[dataclass].items():
+                z = key[0]
+                for _bibtexkey, value in entries:
+                    self._element_lookup.setdefault(value, z)
+
+    def _index_notation_lookup(self, dataclass):
+        lookup = {}
+        for (key, _notation), entries in self._properties[dataclass].items():
+            for _bibtexkey, value in entries:
+                for text in (value["ascii"], value["utf16"]):
+                    keys = lookup.setdefault(text.casefold(), [])
+                    if key not in keys:
+                        keys.append(key)
+
+        self._notation_lookup[dataclass] = lookup
+
+    def _index_element_xray_transitions(self, dataclass):
+        index = {}
+        for z, xray_transition in self._properties[dataclass]:
+            index.setdefault(z, []).append(xray_transition)
+        self._element_xray_transitions[dataclass] = index
+
+    def _find(self, dataclass, keys, reference=None):
+        """
+        Returns the value of the first key found in the index of the
+        property *dataclass*.
+        """
+        reference = self._normalize_reference(reference)
+
+        index = self._properties[dataclass]
+        for key in keys:
+            for bibtexkey, value in index.get(key, ()):
+                if not reference or bibtexkey == reference:
+                    return value
+
+        raise NotFound
+
+    def _find_many(self, dataclass, elements, others, resolve, reference):
+        """
+        Returns the values of the property *dataclass* for many elements
+        (and items of *others*) in an array, ``nan`` where no value is found.
+        Each distinct element and item is resolved once, with *resolve*
+        returning the keys of an item, then the values are read from
+        the index of the property.
+        """
+        # NumPy is only imported when needed to keep "import pyxray" fast
+        import numpy
+
+        self._check_same_length(elements, others)
+        if others is None:
+            others = [None] * len(elements)
+
+        reference = self._normalize_reference(reference)
+        index = self._properties[dataclass]
+
+        atomic_numbers = {}
+        keys = {}
+        values = numpy.full(len(elements), numpy.nan)
+
+        for position, (element, other) in enumerate(zip(elements, others)):
+            z = atomic_numbers.get(element)
+            if z is None:
+                try:
+                    if isinstance(element, numbers.Integral):
+                        z = int(element)
+                    else:
+                        z = self._resolve_element(element)
+                except NotFound:
+                    z = -1
+                atomic_numbers[element] = z
+
+            other = _freeze(other)
+            other_keys = keys.get(other)
+            if other_keys is None:
+                try:
+                    other_keys = resolve(other)
+                except NotFound:
+                    other_keys = []
+                keys[other] = other_keys
+
+            values[position] = self._find_first(index, z, other_keys, reference)
+
+        return values
+
+    def _find_first(self, index, z, keys, reference):
+        for key in keys:
+            for bibtexkey, value in index.get((z, *key), ()):
+                if not reference or bibtexkey == reference:
+                    return value
+        return math.nan
+
+    def _normalize_reference(self, reference):
+        if isinstance(reference, descriptor.Reference):
+            reference = reference.bibtexkey
+        if reference:
+            reference = reference.lower()
+        return reference
+
+    def _resolve_atomic_subshell_keys(self, atomic_subshell):
+        return [(key,) for key in self._resolve_atomic_subshells(atomic_subshell)]
+
+    def _resolve_xray_transition_keys(self, xray_transition):
+        return [(key,) for key in self._resolve_xray_transitions(xray_transition)]
+
+    def _resolve_element(self, element):
+        if hasattr(element, "atomic_number"):
+            element = element.atomic_number
+
+        if isinstance(element, str):
+            try:
+                return self._element_lookup[element]
+            except KeyError:
+                raise NotFound("Cannot find element: {}".format(element))
+
+        elif isinstance(element, int):
+            return element
+
+        else:
+            raise NotFound("Cannot parse element: {}".format(element))
+
+    def _resolve_notation(self, dataclass, text):
+        try:
+            return self._notation_lookup[dataclass][text.casefold()]
+        except KeyError:
+            raise NotFound("Cannot find notation: {}".format(text))
+
+    def _resolve_atomic_shells(self, atomic_shell):
+        if hasattr(atomic_shell, "principal_quantum_number"):
+            atomic_shell = atomic_shell.principal_quantum_number
+
+        if isinstance(atomic_shell, str):
+            return self._resolve_notation(prop.AtomicShellNotation, atomic_shell)
+
+        elif isinstance(atomic_shell, int):
+            return [atomic_shell]
+
+        else:
+            raise NotFound("Cannot parse atomic shell: {}".format(atomic_shell))
+
+    def _resolve_atomic_subshells(self, atomic_subshell):
+        if isinstance(atomic_subshell, str):
+            return self._resolve_notation(prop.AtomicSubshellNotation, atomic_subshell)
+
+        return [self._expand_atomic_subshell(atomic_subshell)]
+
+    def _resolve_xray_transitions(self, xray_transition):
+        if isinstance(xray_transition, str):
+            return self._resolve_notation(prop.XrayTransitionNotation, xray_transition)
+
+        return [self._expand_xray_transition(xray_transition)]
+
+    def _create_xray_transition_matcher(self, xray_transition):
+        if xray_transition is None:
+            return lambda key: True
+
+        if isinstance(xray_transition, str):
+            keys = self._resolve_notation(prop.XrayTransitionNotation, xray_transition)
+            return lambda key: key in keys
+
+        # Same as the search mode of the SQL database: a quantum number equal
+        # to None only matches transitions where this quantum number is defined
+        expected = self._expand_xray_transition(xray_transition)
+
+        def matcher(key):
+            for value, expected_value in zip(key, expected):
+                if expected_value is None:
+                    if value is None:
+                        return False
+                elif value != expected_value:
+                    return False
+            return True
+
+        return matcher
+
+    def _has_positive_value(self, dataclass, key, reference):
+        try:
+            return self._find(dataclass, [key], reference) > 0.0
+        except NotFound:
+            return False
+
+    def _normalize_key(self, value):
+        if isinstance(value, (descriptor.Language, descriptor.Notation)):
+            value = value.key
+        return value.lower()
+
+    def element(self, element):
+        return descriptor.Element.of(self.element_atomic_number(element))
+
+    def element_atomic_number(self, element):
+        z = self._resolve_element(element)
+        if z not in self._descriptor_keys[descriptor.Element]:
+            raise NotFound("Cannot find element: {}".format(element))
+        return z
+
+    def element_symbol(self, element, reference=None):
+        z = self._resolve_element(element)
+        return self._find(prop.ElementSymbol, [(z,)], reference)
+
+    def element_name(self, element, language="en", reference=None):
+        z = self._resolve_element(element)
+        language = self._normalize_key(language)
+        return self._find(prop.ElementName, [(z, language)], reference)
+
+    def element_atomic_weight(self, element, reference=None):
+        z = self._resolve_element(element)
+        return self._find(prop.ElementAtomicWeight, [(z,)], reference)
+
+    def element_atomic_weights(self, elements, reference=None):
+        return self._find_many(
+            prop.ElementAtomicWeight, elements, None, lambda _other: [()], reference
+        )
+
+    def element_mass_density_kg_per_m3(self, element, reference=None):
+        z = self._resolve_element(element)
+        return self._find(prop.ElementMassDensity, [(z,)], reference)
+
+    def element_xray_transitions(self, element, xray_transition=None, reference=None):
+        z = self._resolve_element(element)
+        matcher = self._create_xray_transition_matcher(xray_transition)
+
+        for dataclass in [
+            prop.XrayTransitionProbability,
+            prop.XrayTransitionRelativeWeight,
+        ]:
+            transitions = []
+            for key in self._element_xray_transitions[dataclass].get(z, ()):
+                if not matcher(key):
+                    continue
+                if not self._has_positive_value(dataclass, (z, key), reference):
+                    continue
+                transitions.append(descriptor.XrayTransition.of(*key))
+
+            if transitions:
+                return tuple(transitions)
+
+            logger.info("No transition found for {}".format(element))
+
+        raise NotFound
+
+    def element_xray_transition(self, element, xray_transition, reference=None):
+        z = self._resolve_element(element)
+
+        for key in self._resolve_xray_transitions(xray_transition):
+            if self._has_positive_value(
+                prop.XrayTransitionProbability, (z, key), reference
+            ):
+                return descriptor.XrayTransition.of(*key)
+
+        raise NotFound
+
+    def atomic_shell(self, atomic_shell):
+        existing = self._descriptor_keys[descriptor.AtomicShell]
+        for n in self._resolve_atomic_shells(atomic_shell):
+            if n in existing:
+                return descriptor.AtomicShell(n)
+
+        raise NotFound
+
+    def atomic_shell_notation(
+        self, atomic_shell, notation, encoding="utf16", reference=None
+    ):
+        notation = self._normalize_key(notation)
+        keys = [(n, notation) for n in self._resolve_atomic_shells(atomic_shell)]
+        return self._find(prop.AtomicShellNotation, keys, reference)[encoding]
+
+    def atomic_subshell(self, atomic_subshell):
+        existing = self._descriptor_keys[descriptor.AtomicSubshell]
+        for key in self._resolve_atomic_subshells(atomic_subshell):
+            if key in existing:
+                return descriptor.AtomicSubshell.of(*key)
+
+        raise NotFound
+
+    def atomic_subshell_notation(
+        self, atomic_subshell, notation, encoding="utf16", reference=None
+    ):
+        notation = self._normalize_key(notation)
+        keys = [
+            (key, notation) for key in self._resolve_atomic_subshells(atomic_subshell)
+        ]
+        return self._find(prop.AtomicSubshellNotation, keys, reference)[encoding]
+
+    def _find_atomic_subshell_property(
+        self, dataclass, element, atomic_subshell, reference
+    ):
+        z = self._resolve_element(element)
+        keys = [(z, key) for key in self._resolve_atomic_subshells(atomic_subshell)]
+        return self._find(dataclass, keys, reference)
+
+    def atomic_subshell_binding_energy_eV(
+        self, element, atomic_subshell, reference=None
+    ):
+        return self._find_atomic_subshell_property(
+            prop.AtomicSubshellBindingEnergy, element, atomic_subshell, reference
+        )
+
+    def atomic_subshell_radiative_width_eV(
+        self, element, atomic_subshell, reference=None
+    ):
+        return self._find_atomic_subshell_property(
+            prop.AtomicSubshellRadiativeWidth, element, atomic_subshell, reference
+        )
+
+    def atomic_subshell_nonradiative_width_eV(
+        self, element, atomic_subshell, reference=None
+    ):
+        return self._find_atomic_subshell_property(
+            prop.AtomicSubshellNonRadiativeWidth, element, atomic_subshell, reference
+        )
+
+    def atomic_subshell_binding_energies_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self._find_many(
+            prop.AtomicSubshellBindingEnergy,
+            elements,
+            atomic_subshells,
+            self._resolve_atomic_subshell_keys,
+            reference,
+        )
+
+    def atomic_subshell_radiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self._find_many(
+            prop.AtomicSubshellRadiativeWidth,
+            elements,
+            atomic_subshells,
+            self._resolve_atomic_subshell_keys,
+            reference,
+        )
+
+    def atomic_subshell_nonradiative_widths_eV(
+        self, elements, atomic_subshells, reference=None
+    ):
+        return self._find_many(
+            prop.AtomicSubshellNonRadiativeWidth,
+            elements,
+            atomic_subshells,
+            self._resolve_atomic_subshell_keys,
+            reference,
+        )
+
+    def atomic_subshell_occupancy(self, element, atomic_subshell, reference=None):
+        return self._find_atomic_subshell_property(
+            prop.AtomicSubshellOccupancy, element, atomic_subshell, reference
+        )
+
+    def xray_transition(self, xray_transition):
+        existing = self._descriptor_keys[descriptor.XrayTransition]
+        for key in self._resolve_xray_transitions(xray_transition):
+            if key in existing:
+                return descriptor.XrayTransition.of(*key)
+
+        raise NotFound
+
+    def xray_transition_notation(
+        self, xray_transition, notation, encoding="utf16", reference=None
+    ):
+        notation = self._normalize_key(notation)
+        keys = [
+            (key, notation) for key in self._resolve_xray_transitions(xray_transition)
+        ]
+        return self._find(prop.XrayTransitionNotation, keys, reference)[encoding]
+
+    def _find_xray_transition_property(
+        self, dataclass, element, xray_transition, reference
+    ):
+        z = self._resolve_element(element)
+        keys = [(z, key) for key in self._resolve_xray_transitions(xray_transition)]
+        return self._find(dataclass, keys, reference)
+
+    def xray_transition_energy_eV(self, element, xray_transition, reference=None):
+        return self._find_xray_transition_property(
+            prop.XrayTransitionEnergy, element, xray_transition, reference
+        )
+
+    def xray_transition_probability(self, element, xray_transition, reference=None):
+        return self._find_xray_transition_property(
+            prop.XrayTransitionProbability, element, xray_transition, reference
+        )
+
+    def xray_transition_relative_weight(self, element, xray_transition, reference=None):
+        return self._find_xray_transition_property(
+            prop.XrayTransitionRelativeWeight, element, xray_transition, reference
+        )
+
+    def xray_transition_energies_eV(self, elements, xray_transitions, reference=None):
+        return self._find_many(
+            prop.XrayTransitionEnergy,
+            elements,
+            xray_transitions,
+            self._resolve_xray_transition_keys,
+            reference,
+        )
+
+    def xray_transition_probabilities(self, elements, xray_transitions, reference=None):
+        return self._find_many(
+            prop.XrayTransitionProbability,
+            elements,
+            xray_transitions,
+            self._resolve_xray_transition_keys,
+            reference,
+        )
+
+    def xray_transition_relative_weights(
+        self, elements, xray_transitions, reference=None
+    ):
+        return self._find_many(
+            prop.XrayTransitionRelativeWeight,
+            elements,
+            xray_transitions,
+            self._resolve_xray_transition_keys,
+            reference,
+        )
+
+    def _find_nonradiative_transition_property(
+        self, dataclass, element, nonradiative_transition, reference
+    ):
+        self._load_nonradiative()
+        z = self._resolve_element(element)
+        key = self._expand_nonradiative_transition(nonradiative_transition)
+        return self._find(dataclass, [(z, key)], reference)
+
+    def nonradiative_transition_energy_eV(
+        self, element, nonradiative_transition, reference=None
+    ):
+        return self._find_nonradiative_transition_property(
+            prop.NonRadiativeTransitionEnergy,
+            element,
+            nonradiative_transition,
+            reference,
+        )
+
+    def nonradiative_transition_probability(
+        self, element, nonradiative_transition, reference=None
+    ):
+        return self._find_nonradiative_transition_property(
+            prop.NonRadiativeTransitionProbability,
+            element,
+            nonradiative_transition,
+            reference,
+        )
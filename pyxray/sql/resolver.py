@@ -0,0 +1,132 @@
+"""
+Resolution of the notations of atomic shells, atomic subshells and X-ray
+transitions (e.g. ``"L3"``, ``"Ka1"`` or ``"K-L3"``) to their descriptors,
+without SQL query.
+"""
+
+__all__ = ["NotationResolver"]
+
+# Standard library modules.
+import dataclasses
+
+# Third party modules.
+import sqlalchemy.sql
+
+# Local modules.
+from pyxray.base import NotFound
+import pyxray.property as prop
+
+# Globals and constants variables.
+NOTATION_PROPERTIES = [
+    prop.AtomicShellNotation,
+    prop.AtomicSubshellNotation,
+    prop.XrayTransitionNotation,
+]
+
+
+def _get_descriptor_field(dataclass):
+    for field in dataclasses.fields(dataclass):
+        if field.name not in ("reference", "notation") and dataclasses.is_dataclass(
+            field.type
+        ):
+            return field
+    raise ValueError("No descriptor in {}".format(dataclass))
+
+
+class NotationResolver:
+    """
+    Index of the ASCII and UTF-16 notations of all descriptors of the
+    notation properties (:class:`AtomicShellNotation
+    <pyxray.property.AtomicShellNotation>`, :class:`AtomicSubshellNotation
+    <pyxray.property.AtomicSubshellNotation>` and
+    :class:`XrayTransitionNotation <pyxray.property.XrayTransitionNotation>`).
+
+    The notations are case-folded, so the resolution is case insensitive
+    (e.g. ``"ka1"`` and ``"Kα1"`` are the same as ``"KA1"`` and ``"KΑ1"``).
+    A notation may refer to more than one descriptor.
+
+    A resolver is usually loaded once from the SQL database with
+    :meth:`from_sql`.
+
+    :arg notations: :class:`dict` where the keys are the notation properties
+        and the values, iterables of notations and descriptors
+    """
+
+    def __init__(self, notations):
+        self._lookups = {}
+
+        for dataclass, items in notations.items():
+            lookup = {}
+            for text, descriptor in items:
+                descriptors = lookup.setdefault(text.casefold(), [])
+                if descriptor not in descriptors:
+                    descriptors.append(descriptor)
+
+            self._lookups[dataclass] = {
+                text: tuple(descriptors) for text, descriptors in lookup.items()
+            }
+
+    @classmethod
+    def from_sql(cls, base):
+        """
+        Loads the notations of the SQL database, with one query per notation
+        property.
+
+        :arg base: :class:`SqlBase <pyxray.sql.base.SqlBase>` of the database
+        """
+        notations = {}
+
+        with base.engine.connect() as conn:
+            for dataclass in NOTATION_PROPERTIES:
+                field = _get_descriptor_field(dataclass)
+                table = base.require_table(dataclass)
+                table_descriptor = base.require_table(field.type)
+                names = [f.name for f in dataclasses.fields(field.type)]
+
+                statement = (
+                    sqlalchemy.sql.select(
+                        table.c["ascii"],
+                        table.c["utf16"],
+                        *[table_descriptor.c[name] for name in names]
+                    )
+                    .select_from(
+                        table.join(
+                            table_descriptor,
+                            table.c[field.name + "_id"] == table_descriptor.c["id"],
+                        )
+                    )
+                    .order_by(table.c["id"])
+                )
+
+                items = []
+                for row in conn.execute(statement):
+                    descriptor = field.type.of(*row[2:])
+                    items.append((row[0], descriptor))
+                    items.append((row[1], descriptor))
+
+                notations[dataclass] = items
+
+        return cls(notations)
+
+    def __repr__(self):
+        return "<{}({:d} notations)>".format(
+            self.__class__.__name__,
+            sum(len(lookup) for lookup in self._lookups.values()),
+        )
+
+    def resolve(self, dataclass, text):
+        """
+        Returns the descriptors of a notation.
+
+        :arg dataclass: notation property, e.g.
+            :class:`XrayTransitionNotation <pyxray.property.XrayTransitionNotation>`
+        :arg text: notation (ASCII or UTF-16), case insensitive
+
+        :return: :class:`tuple` of descriptors, in the order of the rows of
+            the database
+        :raises NotFound: if no descriptor has this notation
+        """
+        try:
+            return self._lookups[dataclass][text.casefold()]
+        except KeyError:
+            raise NotFound("Cannot find notation: {}".format(text))
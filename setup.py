@@ -25,13 +25,11 @@ class build_py(_build_py.build_py):
         logging.basicConfig()
         logger.setLevel(logging.INFO)
 
+        # Only the parsers whose fingerprint changed are run again
         filepath = BASEDIR.joinpath("pyxray", "data", "pyxray.db").resolve()
-        if filepath.exists():
-            filepath.unlink()
-
         engine = sqlalchemy.create_engine("sqlite:///" + str(filepath))
         builder = pyxray.sql.build.SqlDatabaseBuilder(engine)
-        builder.build()
+        builder.build(max_workers=None)
 
         try:
             del self.data_files  # Force reinitialization of files to copy
@@ -93,6 +91,7 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Natural Language :: English",
         "Programming Language :: Python",
+        "Programming Language :: Python :: 3 :: Only",
         "Operating System :: OS Independent",
         "Topic :: Scientific/Engineering",
         "Topic :: Scientific/Engineering :: Physics",
@@ -101,6 +100,7 @@ setup(
     long_description=LONG_DESCRIPTION,
     long_description_content_type="text/markdown",
     license="MIT license",
+    python_requires=">=3.7",
     packages=PACKAGES,
     package_data=PACKAGE_DATA,
     include_package_data=True,
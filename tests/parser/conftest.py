@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import threading
+import http.server
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pyxray.parser.fetch import get_fetcher, set_fetcher
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def start_http_server():
+    """
+    Returns a function starting a local HTTP server with the specified
+    request handler class.
+    The server URL is ``http://127.0.0.1:<server.server_port>``.
+    """
+    servers = []
+
+    def start(handler_class):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        server.paths = []
+        server.lock = threading.Lock()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def restore_fetcher():
+    previous_fetcher = get_fetcher()
+    yield
+    set_fetcher(previous_fetcher)
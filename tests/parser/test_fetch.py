@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import os
+import http.server
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pyxray.parser.fetch import (
+    OfflineError,
+    DirectoryStore,
+    Fetcher,
+    create_key,
+    fetch,
+    get_fetcher,
+    set_fetcher,
+    prefetch,
+)
+from pyxray.parser.base import _Parser, compute_fingerprint
+
+# Globals and constants variables.
+
+
+class CountingHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path)
+
+        if self.path.startswith("/missing"):
+            self.send_error(404)
+            return
+
+        content = self.path.encode("ascii")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(start_http_server):
+    return start_http_server(CountingHandler)
+
+
+@pytest.fixture
+def url(server):
+    return "http://127.0.0.1:{}/data".format(server.server_port)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DirectoryStore(str(tmp_path / "fetch"))
+
+
+@pytest.fixture
+def fetcher(store, restore_fetcher):
+    fetcher = Fetcher(store)
+    set_fetcher(fetcher)
+    return fetcher
+
+
+def test_create_key():
+    key = create_key("http://a", {"x": 1, "y": "b"})
+    assert key == create_key("http://a", {"y": "b", "x": "1"})
+    assert key != create_key("http://a", {"x": 2, "y": "b"})
+    assert create_key("http://a") == create_key("http://a", {})
+
+
+def test_directory_store(store):
+    key = create_key("http://a")
+    assert key not in store
+    assert store.get(key) is None
+
+    store.put(key, "http://a", None, b"abc")
+    store.put(create_key("http://b"), "http://b", None, b"abc")
+
+    assert key in store
+    assert store.get(key) == b"abc"
+
+    # Same content is stored once
+    objects = [
+        filenames for _, _, filenames in os.walk(os.path.join(store.dirpath, "objects"))
+    ]
+    assert sum(map(len, objects)) == 1
+
+
+def test_directory_store_digests(store):
+    assert store.digests("http://a") == []
+
+    store.put(create_key("http://a", {"q": 1}), "http://a", {"q": 1}, b"abc")
+    store.put(create_key("http://a", {"q": 2}), "http://a", {"q": 2}, b"def")
+    store.put(create_key("http://b"), "http://b", None, b"abc")
+
+    digests = store.digests("http://a")
+    assert len(digests) == 2
+    assert store.digests("http://b")[0] in digests
+    assert store.digests("http://c") == []
+
+
+def test_directory_store_corrupted(store):
+    key = create_key("http://a")
+    store.put(key, "http://a", None, b"abc")
+
+    for dirpath, _, filenames in os.walk(os.path.join(store.dirpath, "objects")):
+        for filename in filenames:
+            with open(os.path.join(dirpath, filename), "wb") as fp:
+                fp.write(b"xyz")
+
+    assert store.get(key) is None
+
+
+def test_fetcher(server, url, store):
+    fetcher = Fetcher(store)
+    assert fetcher.fetch(url, {"q": 1}) == b"/data?q=1"
+    assert fetcher.fetch(url, {"q": 1}) == b"/data?q=1"
+    assert fetcher.fetch(url, {"q": 2}) == b"/data?q=2"
+
+    assert server.paths == ["/data?q=1", "/data?q=2"]
+
+    # Replayed without network
+    fetcher = Fetcher(store, offline=True)
+    assert fetcher.fetch(url, {"q": 1}) == b"/data?q=1"
+    assert len(server.paths) == 2
+
+
+def test_fetcher_offline(server, url, store):
+    fetcher = Fetcher(store, offline=True)
+
+    with pytest.raises(OfflineError):
+        fetcher.fetch(url)
+
+    assert server.paths == []
+
+
+def test_fetcher_error(server, url, store):
+    import requests
+
+    fetcher = Fetcher(store)
+    missing_url = url.replace("/data", "/missing")
+
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch(missing_url)
+
+    # Errors are not stored
+    assert create_key(missing_url) not in store
+
+
+class MockNetworkParser(_Parser):
+    def __init__(self, url):
+        self.DATA_URLS = (url,)
+
+    def __iter__(self):
+        for q in range(3):
+            yield fetch(self.DATA_URLS[0], {"q": q})
+
+
+class MockLocalParser(_Parser):
+    def __iter__(self):
+        raise AssertionError("Local parsers are not run")
+
+
+def test_compute_fingerprint_stored_content(fetcher):
+    parser = MockNetworkParser("http://a")
+    fingerprint = compute_fingerprint(parser)
+
+    key = create_key("http://a", {"q": 0})
+    fetcher.store.put(key, "http://a", {"q": 0}, b"abc")
+    fingerprint_abc = compute_fingerprint(parser)
+    assert fingerprint_abc != fingerprint
+
+    # Same URL, but new content upstream
+    fetcher.store.put(key, "http://a", {"q": 0}, b"def")
+    assert compute_fingerprint(parser) != fingerprint_abc
+
+
+def test_prefetch(server, url, fetcher):
+    fetcher.offline = True
+
+    parsers = [("network", MockNetworkParser(url)), ("local", MockLocalParser())]
+    prefetch(parsers)
+
+    assert len(server.paths) == 3
+    assert get_fetcher() is fetcher
+
+    assert list(parsers[0][1]) == [b"/data?q=0", b"/data?q=1", b"/data?q=2"]
+    assert len(server.paths) == 3
+
+
+class FlakyHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path)
+
+        if len(self.server.paths) < 3:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        content = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_fetcher_retry(start_http_server):
+    server = start_http_server(FlakyHandler)
+    url = "http://127.0.0.1:{}/data".format(server.server_port)
+
+    assert Fetcher(backoff=0.0).fetch(url) == b"ok"
+    assert len(server.paths) == 3
+
+
+def test_fetcher_retry_exhausted(start_http_server):
+    import requests
+
+    server = start_http_server(FlakyHandler)
+    url = "http://127.0.0.1:{}/data".format(server.server_port)
+
+    with pytest.raises(requests.HTTPError):
+        Fetcher(retries=1, backoff=0.0).fetch(url)
+
+    assert len(server.paths) == 2
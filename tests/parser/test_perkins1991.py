@@ -2,15 +2,126 @@
 """ """
 
 # Standard library modules.
+import os
 
 # Third party modules.
+import pytest
 
 # Local modules.
-from pyxray.parser.perkins1991 import Perkins1991Parser
+from pyxray.parser.perkins1991 import (
+    Perkins1991Parser,
+    EADL_URL,
+    float_,
+    parse_fields,
+)
+from pyxray.parser.fetch import Fetcher, create_key, set_fetcher
+from pyxray.descriptor import Element, XrayTransition, NonRadiativeTransition
+from pyxray.property import (
+    ElementAtomicWeight,
+    AtomicSubshellOccupancy,
+    AtomicSubshellBindingEnergy,
+    AtomicSubshellNonRadiativeWidth,
+    XrayTransitionEnergy,
+    NonRadiativeTransitionEnergy,
+    NonRadiativeTransitionProbability,
+)
+import pyxray.parser.base as base
 
 # Globals and constants variables.
 
 
 def test_perkins1991():
     parser = Perkins1991Parser()
-    assert len(list(parser)) == 19189
+    nonradiative_types = (
+        AtomicSubshellNonRadiativeWidth,
+        NonRadiativeTransitionEnergy,
+        NonRadiativeTransitionProbability,
+    )
+    props = [prop for prop in parser if not isinstance(prop, nonradiative_types)]
+    assert len(props) == 19189
+
+
+@pytest.fixture
+def filepath(testdatadir):
+    return os.path.join(testdatadir, "eadl_sample.all")
+
+
+def test_perkins1991_local(filepath):
+    props = list(Perkins1991Parser(filepath))
+    assert len(props) == 24
+
+    fluorine = Element(9)
+    assert ElementAtomicWeight(props[0].reference, fluorine, 18.9984) in props
+
+    occupancies = [prop for prop in props if isinstance(prop, AtomicSubshellOccupancy)]
+    assert [prop.value for prop in occupancies] == [1, 2, 2, 1, 3]
+
+    energies = [prop for prop in props if isinstance(prop, AtomicSubshellBindingEnergy)]
+    assert len(energies) == 5
+    assert energies[1].atomic_subshell == base.K
+    assert energies[1].value_eV == pytest.approx(696.68)
+
+    energies = [prop for prop in props if isinstance(prop, XrayTransitionEnergy)]
+    assert [prop.xray_transition for prop in energies] == [
+        XrayTransition(base.L2, base.K),
+        XrayTransition(base.L3, base.K),
+    ]
+    assert energies[1].value_eV == pytest.approx(679.98)
+
+
+def test_perkins1991_local_nonradiative(filepath):
+    props = list(Perkins1991Parser(filepath))
+
+    widths = [
+        prop for prop in props if isinstance(prop, AtomicSubshellNonRadiativeWidth)
+    ]
+    assert len(widths) == 1
+    assert widths[0].atomic_subshell == base.K
+    assert widths[0].value_eV == pytest.approx(0.198)
+
+    probabilities = [
+        prop for prop in props if isinstance(prop, NonRadiativeTransitionProbability)
+    ]
+    assert [prop.nonradiative_transition for prop in probabilities] == [
+        NonRadiativeTransition(base.L1, base.K, base.L1),
+        NonRadiativeTransition(base.L1, base.K, base.L2),
+        NonRadiativeTransition(base.L2, base.K, base.L3),
+    ]
+    assert probabilities[2].value == pytest.approx(0.596)
+
+    energies = [
+        prop for prop in props if isinstance(prop, NonRadiativeTransitionEnergy)
+    ]
+    assert energies[1].value_eV == pytest.approx(620.0)
+
+
+def test_perkins1991_fetch(filepath, restore_fetcher):
+    with open(filepath, "rb") as fp:
+        content = fp.read()
+
+    class Store:
+        def get(self, key):
+            return content if key == create_key(EADL_URL) else None
+
+    set_fetcher(Fetcher(Store(), offline=True))
+
+    assert list(Perkins1991Parser()) == list(Perkins1991Parser(filepath))
+
+
+@pytest.mark.parametrize(
+    "field", [" 1.00790+ 0", " 4.60000- 5", " 6.79980-10", " 1.00000+12"]
+)
+def test_parse_fields(field):
+    line = (field * 3).encode("ascii")
+    values = parse_fields([line, line], 3)
+
+    assert values.shape == (2, 3)
+    assert values.tolist() == [[float_(field)] * 3] * 2
+
+
+def test_parse_fields_fallback():
+    # Mantissa with fewer digits than usual
+    lines = [b" 1.0079+ 0  2.0000- 1 ", b" 1.00790+ 0 2.00000- 1 "]
+    values = parse_fields(lines, 2)
+
+    assert values.tolist() == [[float_("1.0079+ 0"), 0.2]] * 2
@@ -2,11 +2,16 @@
 """ """
 
 # Standard library modules.
+import json
+import time
+import http.server
+import urllib.parse
 
 # Third party modules.
 
 # Local modules.
 from pyxray.parser.wikipedia import WikipediaElementNameParser
+from pyxray.parser.fetch import Fetcher, set_fetcher
 
 # Globals and constants variables.
 
@@ -14,3 +19,70 @@ from pyxray.parser.wikipedia import WikipediaElementNameParser
 def test_wikipedia():
     parser = WikipediaElementNameParser()
     assert len(list(parser)) > 0
+
+
+class WikipediaHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Stand-in for the MediaWiki API, failing the first query of each title
+    and answering the other queries after a delay.
+    """
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        (title,) = query["titles"]
+
+        with self.server.lock:
+            first_query = title not in self.server.paths
+            self.server.paths.append(title)
+            self.server.inflight += 1
+            self.server.max_inflight = max(
+                self.server.max_inflight, self.server.inflight
+            )
+
+        try:
+            if first_query:
+                self.send_error(503)
+                return
+
+            time.sleep(0.01)
+            langlinks = [
+                {"lang": "fr", "*": title + " (fr)"},
+                {"lang": "xx", "*": title + " (xx)"},
+            ]
+            out = {"query": {"pages": {"1": {"title": title, "langlinks": langlinks}}}}
+            content = json.dumps(out).encode("utf8")
+
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        finally:
+            with self.server.lock:
+                self.server.inflight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_wikipedia_local(start_http_server, restore_fetcher):
+    server = start_http_server(WikipediaHandler)
+    server.inflight = server.max_inflight = 0
+    set_fetcher(Fetcher(backoff=0.0))
+
+    parser = WikipediaElementNameParser(max_workers=4)
+    parser.DATA_URLS = ("http://127.0.0.1:{}/w/api.php".format(server.server_port),)
+    parser.NAMES_EN = parser.NAMES_EN[:12]
+
+    props = list(parser)
+
+    # Yielded in the order of the elements, without the unknown languages
+    assert [(prop.element.z, prop.language.key, prop.value) for prop in props] == [
+        item
+        for z, name in enumerate(parser.NAMES_EN, 1)
+        for item in [(z, "en", name), (z, "fr", name + " (fr)")]
+    ]
+
+    # Retried once per title, queried concurrently
+    assert len(server.paths) == 2 * 12
+    assert 1 < server.max_inflight <= 4
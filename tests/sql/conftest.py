@@ -81,6 +81,17 @@ class MockParser(_Parser):
             reference, element, transitionset, 0.006
         )
 
+        nonradiative_transition = descriptor.NonRadiativeTransition(L2, K, L3)
+        yield property.NonRadiativeTransitionEnergy(
+            reference, element, nonradiative_transition, 0.8
+        )
+        yield property.NonRadiativeTransitionProbability(
+            reference, element, nonradiative_transition, 0.08
+        )
+        yield property.NonRadiativeTransitionProbability(
+            reference2, element, nonradiative_transition, 0.09
+        )
+
 
 class MockBadParser(_Parser):
     def __iter__(self):
@@ -7,8 +7,13 @@ import sqlite3
 
 # Third party modules.
 import pytest
+import sqlalchemy
 
 # Local modules.
+from pyxray.sql.build import SqlDatabaseBuilder
+from pyxray.parser.base import _Parser, compute_fingerprint
+import pyxray.descriptor as descriptor
+import pyxray.property as property
 
 # Globals and constants variables.
 
@@ -17,9 +22,9 @@ def test_database_build(builder):
     assert os.path.exists(builder.engine.url.database)
 
     conn = sqlite3.connect(builder.engine.url.database)
-    command = "SELECT count(*) FROM sqlite_master WHERE type = 'table'"
+    command = "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
     (ntable,) = conn.execute(command).fetchone()
-    assert ntable == 21
+    assert ntable == 26
 
 
 def test_database_fail(builder):
@@ -27,3 +32,294 @@ def test_database_fail(builder):
 
     with pytest.raises(Exception):
         builder.build()
+
+
+class MockElementParser(_Parser):
+    def __iter__(self):
+        reference = descriptor.Reference("lee1966", year=1966)
+        for z in range(1, 11):
+            yield property.ElementAtomicWeight(reference, descriptor.Element(z), z)
+
+
+class MockBadParser(_Parser):
+    def __iter__(self):
+        raise Exception
+
+
+class MockBuilder(SqlDatabaseBuilder):
+    def __init__(self, engine, parsers):
+        super().__init__(engine)
+        self.parsers = parsers
+
+    def _find_parsers(self):
+        return self.parsers
+
+
+def count_rows(engine, table_name):
+    with engine.connect() as conn:
+        command = "SELECT count(*) FROM {}".format(table_name)
+        return conn.exec_driver_sql(command).scalar()
+
+
+def test_insert_many(tmp_path):
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "pyxray.sql"))
+    builder = SqlDatabaseBuilder(engine)
+
+    reference = descriptor.Reference("lee1966", year=1966)
+    properties = [
+        property.ElementAtomicWeight(reference, descriptor.Element(z), z * 2.0)
+        for z in range(1, 11)
+    ]
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    builder.insert_many(properties)
+    builder.insert_many(properties)
+
+    assert count_rows(engine, "reference") == 1
+    assert count_rows(engine, "element") == 10
+    assert count_rows(engine, "element_atomic_weight") == 20
+
+    # Descriptors are only inserted once, in one batch per table
+    inserts = [statement for statement in statements if statement.startswith("INSERT")]
+    assert len(inserts) == 4
+
+
+def test_insert_many_existing(tmp_path):
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "pyxray.sql"))
+
+    properties = [
+        property.XrayTransitionEnergy(
+            descriptor.Reference("lee1966", year=1966),
+            descriptor.Element(118),
+            descriptor.XrayTransition(2, 1, 3, 1, 0, 1),
+            0.2,
+        )
+    ]
+
+    SqlDatabaseBuilder(engine).insert_many(properties)
+
+    # Descriptors already in the database are not inserted again
+    SqlDatabaseBuilder(engine).insert_many(properties)
+
+    assert count_rows(engine, "reference") == 1
+    assert count_rows(engine, "element") == 1
+    assert count_rows(engine, "xray_transition") == 1
+    assert count_rows(engine, "xray_transition_energy") == 2
+
+
+def test_insert_packed_key(tmp_path):
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "pyxray.sql"))
+    builder = SqlDatabaseBuilder(engine)
+
+    transition = descriptor.XrayTransition(2, 1, 3, 1, 0, 1)
+    transitionset = descriptor.XrayTransition(2, 1, None, 1, 0, 1)
+    builder.insert_many([transition, transitionset])
+
+    with engine.connect() as conn:
+        command = "SELECT key FROM xray_transition ORDER BY id"
+        keys = conn.exec_driver_sql(command).scalars().all()
+    assert keys == [transition.key, transitionset.key]
+
+    # Existing row is found from its key
+    row_id = SqlDatabaseBuilder(engine).insert(transitionset, check_duplicate=True)
+    assert row_id == 2
+    assert count_rows(engine, "xray_transition") == 2
+
+    indexes = sqlalchemy.inspect(engine).get_indexes("xray_transition")
+    assert ["key"] in [index["column_names"] for index in indexes]
+
+
+def test_database_build_transaction(tmp_path):
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "pyxray.sql"))
+    builder = MockBuilder(
+        engine, [("element", MockElementParser()), ("element2", MockElementParser())]
+    )
+
+    commits = []
+    sqlalchemy.event.listen(engine, "commit", lambda conn: commits.append(conn))
+    builder.build()
+
+    assert count_rows(engine, "element_atomic_weight") == 20
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 2  # FULL
+
+    # Bulk load settings, transaction of the build, default settings
+    assert len(commits) == 3
+
+
+def test_database_build_rollback(tmp_path):
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "pyxray.sql"))
+    builder = MockBuilder(
+        engine, [("element", MockElementParser()), ("bad", MockBadParser())]
+    )
+
+    with pytest.raises(Exception):
+        builder.build()
+
+    assert count_rows(engine, "sqlite_master") == 0
+
+    # Tables and identity map are cleared with the rollback
+    builder.parsers = [("element", MockElementParser())]
+    builder.build()
+
+    assert count_rows(engine, "element") == 10
+    assert count_rows(engine, "element_atomic_weight") == 10
+
+
+def dump_tables(engine):
+    with engine.connect() as conn:
+        command = "SELECT name FROM sqlite_master WHERE type = 'table'"
+        table_names = conn.exec_driver_sql(command).scalars().all()
+
+        return {
+            table_name: conn.exec_driver_sql(
+                "SELECT * FROM {} ORDER BY rowid".format(table_name)
+            ).fetchall()
+            for table_name in table_names
+            if not table_name.startswith("sqlite_")
+        }
+
+
+class MockProgressParser(_Parser):
+    def __init__(self, zs):
+        self.zs = zs
+
+    def __iter__(self):
+        reference = descriptor.Reference("doe2016", year=2016)
+        for i, z in enumerate(self.zs):
+            self.update(int(i / len(self.zs) * 100.0))
+            yield property.ElementMassDensity(reference, descriptor.Element(z), z)
+
+
+def test_database_build_parallel(tmp_path):
+    def create_parsers():
+        return [
+            ("element", MockElementParser()),
+            ("progress", MockProgressParser(range(20, 5, -1))),
+            ("progress2", MockProgressParser(range(30, 40))),
+        ]
+
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "seq.sql"))
+    MockBuilder(engine, create_parsers()).build()
+
+    engine_parallel = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "par.sql"))
+    parsers = create_parsers()
+    MockBuilder(engine_parallel, parsers).build(max_workers=3)
+
+    assert dump_tables(engine_parallel) == dump_tables(engine)
+
+    # Progress hooks are removed after the build
+    for _name, parser in parsers:
+        assert not getattr(parser, "_reporthooks", set())
+
+
+def test_database_build_parallel_fail(tmp_path):
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "pyxray.sql"))
+    builder = MockBuilder(
+        engine,
+        [
+            ("element", MockElementParser()),
+            ("bad", MockBadParser()),
+            ("progress", MockProgressParser(range(1, 10))),
+        ],
+    )
+
+    with pytest.raises(Exception):
+        builder.build(max_workers=2)
+
+    assert count_rows(engine, "sqlite_master") == 0
+
+
+def test_database_build_incremental(tmp_path):
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "pyxray.sql"))
+    element_parser = MockElementParser()
+    builder = MockBuilder(
+        engine,
+        [("element", element_parser), ("progress", MockProgressParser(range(1, 5)))],
+    )
+    builder.build()
+    expected = dump_tables(engine)
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+    # Unchanged parsers are skipped
+    builder.build()
+
+    inserts = [statement for statement in statements if statement.startswith("INSERT")]
+    assert inserts == [
+        "INSERT INTO build_fingerprint (name, fingerprint, position) VALUES (?, ?, ?)"
+    ]
+    assert dump_tables(engine) == expected
+
+    # The rows of the changed parser and the following ones are replaced
+    element_parser.VERSION = 2
+    builder.build()
+
+    assert count_rows(engine, "element_atomic_weight") == 10
+    assert count_rows(engine, "element_mass_density") == 4
+    assert count_rows(engine, "element") == 10
+
+    # Rows of removed parsers and their orphan descriptors are deleted
+    builder.parsers = [("progress", MockProgressParser(range(1, 5)))]
+    builder.build()
+
+    assert count_rows(engine, "element_atomic_weight") == 0
+    assert count_rows(engine, "element_mass_density") == 4
+    assert count_rows(engine, "element") == 4
+    assert count_rows(engine, "reference") == 1
+
+
+def test_database_build_incremental_order(tmp_path):
+    # Both parsers have rows for the same elements and reference
+    def create_parsers():
+        return [
+            ("first", MockProgressParser(range(1, 5))),
+            ("second", MockProgressParser(range(3, 8))),
+        ]
+
+    engine = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "inc.sql"))
+    parsers = create_parsers()
+    builder = MockBuilder(engine, parsers)
+    builder.build()
+
+    parsers[0][1].VERSION = 2
+    builder.build()
+
+    # Same rows, in the same order, as a database built from scratch
+    engine_clean = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "clean.sql"))
+    parsers = create_parsers()
+    parsers[0][1].VERSION = 2
+    MockBuilder(engine_clean, parsers).build()
+
+    assert dump_tables(engine) == dump_tables(engine_clean)
+
+    # Parsers in another order
+    builder.parsers = builder.parsers[::-1]
+    builder.build()
+
+    engine_clean = sqlalchemy.create_engine("sqlite:///" + str(tmp_path / "rev.sql"))
+    MockBuilder(engine_clean, parsers[::-1]).build()
+
+    assert dump_tables(engine) == dump_tables(engine_clean)
+
+
+def test_compute_fingerprint():
+    parser = MockElementParser()
+    fingerprint = compute_fingerprint(parser)
+    assert fingerprint == compute_fingerprint(MockElementParser())
+    assert fingerprint != compute_fingerprint(MockBadParser())
+
+    parser.VERSION = 2
+    assert fingerprint != compute_fingerprint(parser)
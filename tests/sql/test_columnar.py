@@ -0,0 +1,110 @@
+""""""
+
+# Standard library modules.
+import shutil
+
+# Third party modules.
+import numpy
+import pytest
+import sqlalchemy
+
+# Local modules.
+from pyxray.sql.columnar import export_columnar, load_columnar
+
+# Globals and constants variables.
+
+
+@pytest.fixture(scope="module")
+def dirpath(builder, tmp_path_factory):
+    dirpath = tmp_path_factory.mktemp("columnar")
+    export_columnar(builder.engine, str(dirpath))
+    return str(dirpath)
+
+
+def _decode(tables, table_name, column, codes):
+    table = tables[table_name]
+    return table[column][numpy.searchsorted(table["id"], codes)]
+
+
+def test_export_columnar(builder, tmp_path):
+    lengths = export_columnar(builder.engine, str(tmp_path))
+    assert len(lengths) == 24
+    assert lengths["element"] == 1
+    assert lengths["xray_transition_energy"] == 3
+    assert lengths["non_radiative_transition_probability"] == 2
+    assert tmp_path.joinpath("manifest.json").exists()
+    assert tmp_path.joinpath("element", "atomic_number.npy").exists()
+
+
+def test_export_columnar_missing_table(builder, tmp_path):
+    filepath = tmp_path.joinpath("pyxray.sql")
+    shutil.copyfile(builder.engine.url.database, filepath)
+
+    engine = sqlalchemy.create_engine("sqlite:///" + str(filepath))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE non_radiative_transition_probability")
+    table_names = sqlalchemy.inspect(engine).get_table_names()
+
+    dirpath = tmp_path.joinpath("columnar")
+    lengths = export_columnar(engine, str(dirpath))
+    assert len(lengths) == 24
+    assert lengths["non_radiative_transition_probability"] == 0
+
+    # No table is created in the database
+    assert sqlalchemy.inspect(engine).get_table_names() == table_names
+
+    tables = load_columnar(str(dirpath), ["non_radiative_transition_probability"])
+    probabilities = tables["non_radiative_transition_probability"]
+    assert len(probabilities["value"]) == 0
+
+
+def test_load_columnar(dirpath):
+    tables = load_columnar(dirpath)
+    assert len(tables) == 24
+
+    energies = tables["xray_transition_energy"]
+    assert set(energies) == {
+        "id",
+        "reference_id",
+        "element_id",
+        "xray_transition_id",
+        "value_eV",
+    }
+    assert isinstance(energies["value_eV"], numpy.memmap)
+    assert sorted(energies["value_eV"]) == pytest.approx([0.2, 0.4, 0.6])
+
+    zs = _decode(tables, "element", "atomic_number", energies["element_id"])
+    assert list(zs) == [118, 118, 118]
+
+
+def test_load_columnar_references(dirpath):
+    tables = load_columnar(dirpath)
+    probabilities = tables["non_radiative_transition_probability"]
+    bibtexkeys = _decode(
+        tables, "reference", "bibtexkey", probabilities["reference_id"]
+    )
+    assert dict(zip(bibtexkeys, probabilities["value"])) == pytest.approx(
+        {"lee1966": 0.08, "doe2016": 0.09}
+    )
+
+
+def test_load_columnar_missing_values(dirpath):
+    tables = load_columnar(dirpath, ["reference", "xray_transition"])
+    assert set(tables) == {"reference", "xray_transition"}
+
+    # Transition set K-L2,3
+    j_ns = tables["xray_transition"]["source_total_angular_momentum_nominator"]
+    assert sorted(j_ns) == [-1, 1, 3]
+
+    assert set(tables["reference"]["author"]) == {""}
+    assert sorted(tables["reference"]["year"]) == [1966, 2016]
+
+
+def test_load_columnar_in_memory(dirpath):
+    tables = load_columnar(dirpath, ["element"], mmap_mode=None)
+    assert not isinstance(tables["element"]["atomic_number"], numpy.memmap)
+
+
+def test_load_columnar_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_columnar(str(tmp_path))
@@ -2,13 +2,21 @@
 """ """
 
 # Standard library modules.
+import logging
+import shutil
 
 # Third party modules.
+import numpy
 import pytest
+import sqlalchemy
 
 # Local modules.
 import pyxray.descriptor as descriptor
 from pyxray.sql.data import SqlDatabase, NotFound
+from pyxray.sql.memory import MemoryDatabase
+from pyxray.cache import CachedDatabase
+from pyxray.composition import Composition
+import pyxray
 import pyxray.data
 
 # Globals and constants variables.
@@ -17,9 +25,15 @@ L3 = descriptor.AtomicSubshell(2, 1, 3)
 L2 = descriptor.AtomicSubshell(2, 1, 1)
 
 
-@pytest.fixture(scope="session")
-def database(builder):
-    return SqlDatabase(builder.engine)
+def create_cached_database(engine):
+    return CachedDatabase(SqlDatabase(engine))
+
+
+@pytest.fixture(
+    scope="session", params=[SqlDatabase, MemoryDatabase, create_cached_database]
+)
+def database(builder, request):
+    return request.param(builder.engine)
 
 
 @pytest.fixture
@@ -264,6 +278,18 @@ def test_xray_transition_notation(database, encoding, expected):
     )
 
 
+def test_xray_transition_notation_from_notation(database):
+    assert database.xray_transition_notation("a", "iupac", "ascii") == "aa"
+    assert database.xray_transition_notation("BB", "mock", "ascii") == "a"
+
+
+@pytest.mark.parametrize("xray_transition", ["A", "B", "Aa"])
+def test_xray_transition_energy_eV_case_insensitive(database, xray_transition):
+    assert database.xray_transition_energy_eV(118, xray_transition) == pytest.approx(
+        0.2
+    )
+
+
 @pytest.mark.parametrize(
     "xray_transition",
     ["a", ((2, 1, 3), (1, 0, 1)), (L3, K), descriptor.XrayTransition(L3, K)],
@@ -304,6 +330,39 @@ def test_xray_transition_relative_weight(database, xray_transition):
     ) == pytest.approx(0.002, abs=1e-4)
 
 
+@pytest.mark.parametrize(
+    "nonradiative_transition",
+    [
+        ((2, 1, 1), (1, 0, 1), (2, 1, 3)),
+        (L2, K, L3),
+        descriptor.NonRadiativeTransition(L2, K, L3),
+    ],
+)
+def test_nonradiative_transition_energy_eV(database, nonradiative_transition):
+    assert database.nonradiative_transition_energy_eV(
+        "Vi", nonradiative_transition
+    ) == pytest.approx(0.8, abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "reference, expected", [(None, 0.09), ("doe2016", 0.09), ("lee1966", 0.08)]
+)
+def test_nonradiative_transition_probability(database, reference, expected):
+    assert database.nonradiative_transition_probability(
+        118, (L2, K, L3), reference
+    ) == pytest.approx(expected, abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "nonradiative_transition", [(L3, K, L2), (K, K, K), (L2, K), "a"]
+)
+def test_nonradiative_transition_probability_notfound(
+    database, nonradiative_transition
+):
+    with pytest.raises(NotFound):
+        database.nonradiative_transition_probability(118, nonradiative_transition)
+
+
 def test_xray_line(database):
     xrayline = database.xray_line(118, "aa")
 
@@ -311,3 +370,318 @@ def test_xray_line(database):
     assert xrayline.iupac == "Vi bb"
     assert xrayline.siegbahn == "Vi bb"
     assert xrayline.energy_eV == pytest.approx(0.2, abs=1e-3)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"elements": [118]},
+        {"elements": ["Vi", descriptor.Element(118)]},
+        {"reference": "lee1966"},
+        {"min_probability": 0.02},
+    ],
+)
+def test_xray_lines_in_energy_range(database, kwargs):
+    xraylines = database.xray_lines_in_energy_range(0.1, 0.3, **kwargs)
+    assert xraylines == [
+        descriptor.XrayLine(118, descriptor.XrayTransition(L3, K), "", "", 0.2)
+    ]
+
+    xrayline = xraylines[0]
+    assert xrayline.iupac == "Vi bb"
+    assert xrayline.energy_eV == pytest.approx(0.2, abs=1e-4)
+    assert xrayline.probability == pytest.approx(0.02, abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "emin_eV, emax_eV, kwargs",
+    [
+        (0.3, 1.0, {}),
+        (0.1, 0.3, {"elements": [1]}),
+        (0.1, 0.3, {"elements": []}),
+        (0.1, 0.3, {"min_probability": 0.05}),
+        (0.1, 0.3, {"reference": "doe2016"}),
+    ],
+)
+def test_xray_lines_in_energy_range_empty(database, emin_eV, emax_eV, kwargs):
+    assert database.xray_lines_in_energy_range(emin_eV, emax_eV, **kwargs) == []
+
+
+def test_identify_peaks(database):
+    xrayline = descriptor.XrayLine(118, descriptor.XrayTransition(L3, K), "", "", 0.2)
+
+    assert database.identify_peaks([0.21, 1.0], 0.1) == [[xrayline], []]
+    assert database.identify_peaks([0.21], 0.1, ["Vibranium"], k=1) == [[xrayline]]
+    assert database.identify_peaks([0.21], 0.1, [1]) == [[]]
+    assert database.identify_peaks([], 0.1) == []
+
+
+def test_element_atomic_weights(database):
+    values = database.element_atomic_weights([118, "Vi", 1, numpy.int64(118)])
+    assert values == pytest.approx([111.1, 111.1, numpy.nan, 111.1], nan_ok=True)
+
+
+def test_element_atomic_weights_lee1966(database):
+    values = database.element_atomic_weights([118], "lee1966")
+    assert values == pytest.approx([999.1])
+
+
+def test_atomic_subshell_binding_energies_eV(database):
+    values = database.atomic_subshell_binding_energies_eV(
+        [118, "Vibranium", 118, 1], [K, "a", L3, K]
+    )
+    assert values == pytest.approx([0.1, 0.1, numpy.nan, numpy.nan], nan_ok=True)
+
+
+def test_atomic_subshell_radiative_widths_eV(database):
+    values = database.atomic_subshell_radiative_widths_eV([118], [(1, 0, 1)])
+    assert values == pytest.approx([0.01])
+
+
+def test_atomic_subshell_nonradiative_widths_eV(database):
+    values = database.atomic_subshell_nonradiative_widths_eV([118], ["b"])
+    assert values == pytest.approx([0.001])
+
+
+def test_xray_transition_energies_eV(database):
+    values = database.xray_transition_energies_eV(
+        [118, 118, 118, 118, 1], ["a", (L2, K), "unknown", (L3, K), (L3, K)]
+    )
+    assert values == pytest.approx([0.2, 0.4, numpy.nan, 0.2, numpy.nan], nan_ok=True)
+
+
+def test_xray_transition_energies_eV_lists(database):
+    values = database.xray_transition_energies_eV(
+        [118, 118], [[[2, 1, 3], [1, 0, 1]], [[2, 1, 3], [1, 0, 1]]]
+    )
+    assert values == pytest.approx([0.2, 0.2])
+
+
+def test_atomic_subshell_binding_energies_eV_lists(database):
+    values = database.atomic_subshell_binding_energies_eV([118], [[1, 0, 1]])
+    assert values == pytest.approx([0.1])
+
+
+def test_memory_database_many_without_scalar_lookups(builder, monkeypatch):
+    database = MemoryDatabase(builder.engine)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Scalar lookup")
+
+    monkeypatch.setattr(database, "xray_transition_energy_eV", fail)
+    monkeypatch.setattr(database, "element_atomic_weight", fail)
+
+    values = database.xray_transition_energies_eV(
+        numpy.array([118, 118, 118, 1]), ["a", (L2, K), "A", "a"]
+    )
+    assert values == pytest.approx([0.2, 0.4, 0.2, numpy.nan], nan_ok=True)
+
+    values = database.element_atomic_weights(["Vi", 118, 1], "lee1966")
+    assert values == pytest.approx([999.1, 999.1, numpy.nan], nan_ok=True)
+
+
+def test_xray_transition_probabilities(database):
+    values = database.xray_transition_probabilities([118, 118], [(L3, K), "e"])
+    assert values == pytest.approx([0.02, 0.04])
+
+
+def test_xray_transition_relative_weights(database):
+    values = database.xray_transition_relative_weights(
+        [118], [descriptor.XrayTransition(L3, K)]
+    )
+    assert values == pytest.approx([0.002])
+
+
+def test_xray_transition_energies_eV_empty(database):
+    assert database.xray_transition_energies_eV([], []).shape == (0,)
+
+
+def test_xray_transition_energies_eV_length_mismatch(database):
+    with pytest.raises(ValueError):
+        database.xray_transition_energies_eV([118, 118], ["a"])
+
+
+@pytest.mark.parametrize(
+    "method, args",
+    [
+        ("element_symbol", (118,)),
+        ("element_atomic_number", ("Vi",)),
+        ("element_atomic_weight", (118, "lee1966")),
+        ("atomic_subshell_binding_energy_eV", (118, (1, 0, 1))),
+        ("atomic_subshell_binding_energy_eV", (118, "a")),
+        ("xray_transition_energy_eV", (118, (L3, K))),
+        ("xray_transition_energy_eV", ("Vibranium", "a")),
+        ("xray_transition_notation", ((L3, K), "mock")),
+        ("element_xray_transitions", (118,)),
+        ("nonradiative_transition_probability", (118, (L2, K, L3))),
+    ],
+)
+def test_query_plan(builder, tmp_path, method, args):
+    # The statistics of the (tiny) test database are removed, so that
+    # the query planner uses its default estimates of large tables
+    filepath = tmp_path.joinpath("pyxray.sql")
+    shutil.copyfile(builder.engine.url.database, filepath)
+
+    engine = sqlalchemy.create_engine("sqlite:///" + str(filepath))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM sqlite_stat1")
+    engine.dispose()  # Statistics are loaded when a connection is opened
+
+    database = SqlDatabase(engine)
+
+    # The notations are read once, in full, on the first lookup of a notation
+    getattr(database, method)(*args)
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    getattr(database, method)(*args)
+
+    assert statements
+
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            details = [row[-1] for row in rows]
+            assert not [detail for detail in details if detail.startswith("SCAN")]
+
+
+@pytest.fixture
+def outdated_engine(builder, tmp_path):
+    # Database built before the packed keys were added
+    filepath = tmp_path.joinpath("pyxray.sql")
+    shutil.copyfile(builder.engine.url.database, filepath)
+
+    engine = sqlalchemy.create_engine("sqlite:///" + str(filepath))
+    with engine.begin() as conn:
+        for table_name in ["atomic_subshell", "xray_transition"]:
+            conn.exec_driver_sql("DROP INDEX ix_{}_key".format(table_name))
+            conn.exec_driver_sql("ALTER TABLE {} DROP COLUMN key".format(table_name))
+
+    return engine
+
+
+@pytest.mark.parametrize(
+    "create", [SqlDatabase, MemoryDatabase, create_cached_database]
+)
+def test_outdated_database(outdated_engine, create, caplog):
+    with caplog.at_level(logging.WARNING, logger="pyxray.sql.base"):
+        database = create(outdated_engine)
+
+        assert database.atomic_subshell_binding_energy_eV(118, "a") == pytest.approx(
+            0.1
+        )
+        assert database.atomic_subshell_binding_energy_eV(
+            118, (1, 0, 1)
+        ) == pytest.approx(0.1)
+        assert database.xray_transition_energy_eV(118, "a") == pytest.approx(0.2)
+        assert database.xray_transition_energy_eV(118, (L2, K)) == pytest.approx(0.4)
+        assert database.xray_transition_energy_eV(
+            118, descriptor.XrayTransition(2, 1, None, K)
+        ) == pytest.approx(0.6)
+
+        transitions = database.element_xray_transitions(
+            118, descriptor.XrayTransition(2, 1, None, K)
+        )
+        assert len(transitions) == 2
+
+        energies = database.xray_transition_energies_eV([118, 118], ["a", (L2, K)])
+        assert energies == pytest.approx([0.2, 0.4])
+
+    # The memory database only reads the rows, without packed key
+    if create is not MemoryDatabase:
+        assert "outdated" in caplog.text
+
+
+def test_memory_database_missing_table(builder, tmp_path):
+    filepath = tmp_path.joinpath("pyxray.sql")
+    shutil.copyfile(builder.engine.url.database, filepath)
+
+    engine = sqlalchemy.create_engine("sqlite:///" + str(filepath))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE atomic_subshell_occupancy")
+    table_names = sqlalchemy.inspect(engine).get_table_names()
+
+    database = MemoryDatabase(engine)
+    assert database.atomic_subshell_binding_energy_eV(118, K) == pytest.approx(0.1)
+
+    with pytest.raises(NotFound):
+        database.atomic_subshell_occupancy(118, K)
+
+    # No table is created in the database
+    assert sqlalchemy.inspect(engine).get_table_names() == table_names
+
+
+def test_statement_cache(builder):
+    database = SqlDatabase(builder.engine)
+
+    assert database.element_atomic_weight(118, "lee1966") == pytest.approx(999.1)
+    assert database.element_atomic_weight(118, "doe2016") == pytest.approx(111.1)
+    assert database.element_atomic_weight(118) == pytest.approx(111.1)
+    assert database.element_atomic_weight("Vi") == pytest.approx(111.1)
+
+    # Shapes: (int, reference), (int, no reference), (str, no reference)
+    assert len(database._statements) == 3
+
+
+def test_statement_cache_debug(builder, caplog):
+    database = SqlDatabase(builder.engine)
+
+    with caplog.at_level(logging.DEBUG, logger="pyxray.sql.data"):
+        assert database.element_symbol(118) == "Vi"
+
+    assert "SELECT" in caplog.text
+
+
+def test_element_table(database):
+    table = database.element_table()
+    assert table.atomic_weight(118) == pytest.approx(111.1)
+    assert table.symbol(118) == "Vi"
+    assert table.atomic_number("Vi") == 118
+    assert database.element_table() is table
+
+    table = database.element_table("LEE1966")
+    assert table.atomic_weight(118) == pytest.approx(999.1)
+
+    with pytest.raises(NotFound):
+        table.atomic_weight(1)
+
+
+def test_set_database_composition(builder):
+    previous_database = pyxray.data.database
+    database = MemoryDatabase(builder.engine)
+
+    try:
+        pyxray.data.set_database(database)
+        composition = Composition.from_atomic_fractions({118: 1.0})
+        assert composition.formula == "Vi"
+        assert composition.mass_fractions[118] == pytest.approx(1.0)
+
+        with pytest.raises(NotFound):
+            Composition.from_pure(26)
+    finally:
+        pyxray.data.set_database(previous_database)
+
+    # The table of the previous database is used again
+    assert Composition.from_pure(26).formula == "Fe"
+
+
+def test_set_database(builder):
+    previous_database = pyxray.data.database
+    database = MemoryDatabase(builder.engine)
+
+    try:
+        pyxray.data.set_database(database)
+        assert pyxray.data.database is database
+        assert pyxray.database is database
+        assert pyxray.element_symbol(118) == "Vi"
+        assert pyxray.data.element_symbol(118) == "Vi"
+    finally:
+        pyxray.data.set_database(previous_database)
+
+    assert pyxray.database is previous_database
@@ -0,0 +1,125 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import numpy
+import pytest
+
+# Local modules.
+from pyxray.dense import (
+    ATOMIC_SUBSHELLS,
+    DenseTables,
+    atomic_subshell_index,
+    xray_transition_index,
+    load_dense_tables,
+)
+from pyxray.sql.data import SqlDatabase
+from pyxray.sql.memory import MemoryDatabase
+import pyxray.descriptor as descriptor
+
+# Globals and constants variables.
+K = descriptor.AtomicSubshell(1, 0, 1)
+L2 = descriptor.AtomicSubshell(2, 1, 1)
+L3 = descriptor.AtomicSubshell(2, 1, 3)
+
+
+@pytest.fixture(scope="module", params=[SqlDatabase, MemoryDatabase])
+def database(builder, request):
+    return request.param(builder.engine)
+
+
+def test_atomic_subshell_index():
+    assert len(ATOMIC_SUBSHELLS) == 49
+    assert atomic_subshell_index(K) == 0
+    assert atomic_subshell_index(L3) == 3
+    assert atomic_subshell_index((3, 2, 5)) == 8
+    assert ATOMIC_SUBSHELLS[8] == descriptor.AtomicSubshell(3, 2, 5)
+
+    with pytest.raises(ValueError):
+        atomic_subshell_index((8, 0, 1))
+
+
+def test_xray_transition_index():
+    assert xray_transition_index(descriptor.XrayTransition(L3, K)) == 3 * 49
+    assert xray_transition_index(descriptor.XrayTransition(K, L2)) == 2
+
+    with pytest.raises(ValueError):
+        xray_transition_index(descriptor.XrayTransition(2, 1, None, K))
+
+
+def test_dense_tables(database):
+    tables = DenseTables.from_database(database)
+    assert tables.references == (None,)
+
+    assert tables.binding_energies_eV.shape == (119, 49)
+    assert tables.binding_energies_eV[118, 0] == pytest.approx(0.1)
+    assert tables.radiative_widths_eV[118, 0] == pytest.approx(0.01)
+    assert tables.nonradiative_widths_eV[118, 0] == pytest.approx(0.001)
+    assert tables.fluorescence_yields[118, 0] == pytest.approx(0.01 / 0.011)
+    assert numpy.isfinite(tables.binding_energies_eV).sum() == 1
+
+    index = xray_transition_index(descriptor.XrayTransition(L3, K))
+    assert tables.xray_transition_energies_eV.shape == (119, 49 * 49)
+    assert tables.xray_transition_energies_eV[118, index] == pytest.approx(0.2)
+    assert tables.xray_transition_probabilities[118, index] == pytest.approx(0.02)
+    assert tables.xray_transition_relative_weights[118, index] == pytest.approx(0.002)
+
+    # Transition set is excluded
+    assert numpy.isfinite(tables.xray_transition_energies_eV).sum() == 2
+
+
+def test_dense_tables_references(database):
+    tables = DenseTables.from_database(database, "doe2016")
+    assert numpy.isnan(tables.binding_energies_eV).all()
+
+    # Values of lee1966 are used when not found in doe2016
+    tables = DenseTables.from_database(database, ["DOE2016", "lee1966"])
+    assert tables.references == ("doe2016", "lee1966")
+    assert tables.binding_energies_eV[118, 0] == pytest.approx(0.1)
+
+
+def test_dense_tables_save_load(database, tmp_path):
+    tables = DenseTables.from_database(database)
+    filepath = str(tmp_path.joinpath("dense.npz"))
+    tables.save(filepath)
+
+    other = DenseTables.load(filepath)
+    assert other.references == (None,)
+    numpy.testing.assert_array_equal(
+        other.xray_transition_energies_eV, tables.xray_transition_energies_eV
+    )
+    numpy.testing.assert_array_equal(
+        other.fluorescence_yields, tables.fluorescence_yields
+    )
+
+
+def test_load_dense_tables(database, tmp_path, monkeypatch):
+    tables = load_dense_tables(database=database, dirpath=str(tmp_path))
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    # Second call is loaded from the cache
+    def from_database(database, references=None):
+        raise AssertionError("Not cached")
+
+    monkeypatch.setattr(DenseTables, "from_database", from_database)
+
+    cached = load_dense_tables(database=database, dirpath=str(tmp_path))
+    assert cached.binding_energies_eV[118, 0] == tables.binding_energies_eV[118, 0]
+
+
+def test_load_dense_tables_references(database, tmp_path):
+    load_dense_tables(None, database=database, dirpath=str(tmp_path))
+    load_dense_tables("lee1966", database=database, dirpath=str(tmp_path))
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+
+
+def test_load_dense_tables_default_dirpath(database, tmp_path, monkeypatch):
+    monkeypatch.delenv("PYXRAY_DENSE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    load_dense_tables(database=database)
+    assert len(list(tmp_path.glob("cache/pyxray/dense/*.npz"))) == 1
+
+    monkeypatch.setenv("PYXRAY_DENSE_DIR", str(tmp_path / "dense"))
+    load_dense_tables(database=database)
+    assert len(list(tmp_path.glob("dense/*.npz"))) == 1
@@ -0,0 +1,66 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pyxray.base import NotFound
+from pyxray.sql.base import SqlBase
+from pyxray.sql.resolver import NotationResolver
+import pyxray.descriptor as descriptor
+import pyxray.property as prop
+
+# Globals and constants variables.
+K = descriptor.AtomicSubshell(1, 0, 1)
+L3 = descriptor.AtomicSubshell(2, 1, 3)
+
+
+@pytest.fixture(scope="module")
+def resolver(builder):
+    return NotationResolver.from_sql(SqlBase(builder.engine))
+
+
+def test_resolve(resolver):
+    assert resolver.resolve(prop.AtomicShellNotation, "a") == (
+        descriptor.AtomicShell(1),
+    )
+    assert resolver.resolve(prop.AtomicSubshellNotation, "b") == (K,)
+
+    (xray_transition,) = resolver.resolve(prop.XrayTransitionNotation, "aa")
+    assert xray_transition is descriptor.XrayTransition.of(L3, K)
+
+
+def test_resolve_case_insensitive(resolver):
+    assert resolver.resolve(prop.XrayTransitionNotation, "AA") == resolver.resolve(
+        prop.XrayTransitionNotation, "aA"
+    )
+
+
+def test_resolve_many():
+    transition = descriptor.XrayTransition(L3, K)
+    transitionset = descriptor.XrayTransition(2, 1, None, K)
+    resolver = NotationResolver(
+        {
+            prop.XrayTransitionNotation: [
+                ("Ka", transitionset),
+                ("Kα", transitionset),
+                ("KA", transition),
+            ]
+        }
+    )
+
+    assert resolver.resolve(prop.XrayTransitionNotation, "ka") == (
+        transitionset,
+        transition,
+    )
+    assert resolver.resolve(prop.XrayTransitionNotation, "KΑ") == (transitionset,)
+
+
+def test_resolve_notfound(resolver):
+    with pytest.raises(NotFound):
+        resolver.resolve(prop.XrayTransitionNotation, "zz")
+
+    with pytest.raises(NotFound):
+        resolver.resolve(prop.AtomicShellNotation, "aa")
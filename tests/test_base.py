@@ -91,6 +91,16 @@ class MockDatabase(_DatabaseMixin):
     def xray_transition_relative_weight(self, element, xraytransition, reference=None):
         pass
 
+    def nonradiative_transition_energy_eV(
+        self, element, nonradiative_transition, reference=None
+    ):
+        pass
+
+    def nonradiative_transition_probability(
+        self, element, nonradiative_transition, reference=None
+    ):
+        pass
+
     def xray_transitionset(self, xraytransitionset):
         pass
 
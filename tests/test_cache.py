@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import collections
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pyxray.cache import CachedDatabase
+from pyxray.base import NotFound
+import pyxray.descriptor as descriptor
+
+# Globals and constants variables.
+
+
+class CountingDatabase:
+    def __init__(self):
+        self.calls = collections.Counter()
+
+    def element_atomic_number(self, element):
+        self.calls["element_atomic_number"] += 1
+        if element in ["Fe", "iron", 26]:
+            return 26
+        raise NotFound
+
+    def element_symbol(self, element, reference=None):
+        self.calls["element_symbol"] += 1
+        if element == 26:
+            return "Fe"
+        raise NotFound
+
+    def atomic_subshell(self, atomic_subshell):
+        self.calls["atomic_subshell"] += 1
+        if atomic_subshell == "K":
+            return descriptor.AtomicSubshell(1, 0, 1)
+        raise NotFound
+
+    def atomic_subshell_binding_energy_eV(
+        self, element, atomic_subshell, reference=None
+    ):
+        self.calls["atomic_subshell_binding_energy_eV"] += 1
+        return 7112.0
+
+
+@pytest.fixture
+def database():
+    return CachedDatabase(CountingDatabase())
+
+
+def test_element_symbol(database):
+    for element in [26, descriptor.Element(26), "Fe", "iron"]:
+        assert database.element_symbol(element) == "Fe"
+
+    assert database.database.calls["element_symbol"] == 1
+    assert database.database.calls["element_atomic_number"] == 2  # Fe, iron
+
+
+def test_atomic_subshell_binding_energy_eV(database):
+    for atomic_subshell in [descriptor.AtomicSubshell(1, 0, 1), (1, 0, 1), "K"]:
+        assert database.atomic_subshell_binding_energy_eV(
+            26, atomic_subshell
+        ) == pytest.approx(7112.0)
+
+    assert database.database.calls["atomic_subshell_binding_energy_eV"] == 1
+
+
+def test_notfound(database):
+    for _ in range(3):
+        with pytest.raises(NotFound):
+            database.element_symbol("Vibranium")
+
+    assert database.database.calls["element_atomic_number"] == 1
+
+
+def test_reference(database):
+    database.element_symbol(26, "Lee1966")
+    database.element_symbol(26, descriptor.Reference("lee1966"))
+    database.element_symbol(26)
+
+    assert database.database.calls["element_symbol"] == 2
+
+
+def test_cache_info(database):
+    database.element_symbol(26)
+    database.element_symbol(26)
+    database.element_symbol("Fe")
+
+    info = database.cache_info()
+    assert info.hits == 2
+    assert info.misses == 2
+    assert info.evictions == 0
+    assert info.currsize == 2
+
+
+def test_cache_clear(database):
+    database.element_symbol(26)
+    database.cache_clear()
+
+    assert database.cache_info() == (0, 0, 0, database.maxsize, 0)
+
+    database.element_symbol(26)
+    assert database.database.calls["element_symbol"] == 2
+
+
+def test_eviction():
+    database = CachedDatabase(CountingDatabase(), maxsize=2)
+
+    database.element_symbol(26)
+    database.element_symbol(26, "a")
+    database.element_symbol(26)  # Most recently used
+    database.element_symbol(26, "b")  # Evicts reference "a"
+
+    info = database.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+
+    database.element_symbol(26)
+    assert database.database.calls["element_symbol"] == 3
+
+    database.element_symbol(26, "a")
+    assert database.database.calls["element_symbol"] == 4
@@ -44,3 +44,15 @@ def test_progress_report_update(progress_report, progress):
 
     assert progress_report.progress == 50
     assert progress.progress == 50
+
+
+def test_progress_report_remove_reporthook(progress):
+    report = MockProgressReport()
+    hook = lambda p: progress.update(p)
+    report.add_reporthook(hook)
+    report.remove_reporthook(hook)
+
+    report.update(50)
+
+    assert report.progress == 50
+    assert progress.progress == 0
@@ -5,6 +5,7 @@ import pickle
 import copy
 
 # Third party modules.
+import numpy
 import pytest
 
 # Local modules.
@@ -13,6 +14,11 @@ from pyxray.composition import (
     Composition,
     convert_atomic_to_mass_fractions,
     convert_mass_to_atomic_fractions,
+    convert_atomic_to_mass_fractions_batch,
+    convert_mass_to_atomic_fractions_batch,
+    convert_formula_to_atomic_fractions,
+    parse_formula,
+    CHEMICAL_FORMULA_PATTERN,
 )
 
 # Globals and constants variables.
@@ -35,6 +41,60 @@ def test_convert_al2o3(al2o3):
     assert atomic_fractions2[8] == pytest.approx(atomic_fractions2[8], 1e-4)
 
 
+def test_convert_batch():
+    zs = [8, 13, 26]
+    mass_fractions = numpy.array([[0.47075, 0.52925, 0.0], [0.2, 0.3, 0.5], [0, 0, 0]])
+
+    atomic_fractions = convert_mass_to_atomic_fractions_batch(zs, mass_fractions)
+    assert atomic_fractions.shape == (3, 3)
+    for row, expected in zip(atomic_fractions[:2], mass_fractions[:2]):
+        expected = convert_mass_to_atomic_fractions(dict(zip(zs, expected)))
+        assert row == pytest.approx([expected[z] for z in zs])
+    assert atomic_fractions[0] == pytest.approx([0.6, 0.4, 0.0], abs=1e-4)
+    assert list(atomic_fractions[2]) == [0.0, 0.0, 0.0]
+
+    mass_fractions2 = convert_atomic_to_mass_fractions_batch(zs, atomic_fractions)
+    assert mass_fractions2 == pytest.approx(mass_fractions)
+
+
+def test_convert_batch_exception():
+    with pytest.raises(ValueError):
+        convert_mass_to_atomic_fractions_batch([8, 13], [0.5, 0.5])
+    with pytest.raises(ValueError):
+        convert_mass_to_atomic_fractions_batch([8, 13], [[0.2, 0.3, 0.5]])
+
+
+def test_from_mass_fractions_batch(al2o3):
+    row = [al2o3.mass_fractions[13], al2o3.mass_fractions[8]]
+    mass_fractions = [row, [0.2, 0.8], row]
+    compositions = Composition.from_mass_fractions_batch([13, 8], mass_fractions)
+
+    assert len(compositions) == 3
+    assert compositions[0] == al2o3
+    assert compositions[0].formula == "Al2O3"
+    assert compositions[1] == Composition.from_mass_fractions({13: 0.2, 8: 0.8})
+    assert compositions[1].formula == (
+        Composition.from_mass_fractions({13: 0.2, 8: 0.8}).formula
+    )
+
+    # Identical rows share the same composition
+    assert compositions[2] is compositions[0]
+
+
+def test_from_atomic_fractions_batch(al2o3):
+    compositions = Composition.from_atomic_fractions_batch(
+        [13, 8], numpy.array([[0.4, 0.6], [1.0, 0.0]]), ["alumina", "aluminium"]
+    )
+
+    assert compositions[0] == al2o3
+    assert compositions[0].formula == "alumina"
+    assert compositions[1].mass_fractions == {13: 1.0, 8: 0.0}
+    assert compositions[1].formula == "aluminium"
+
+    with pytest.raises(ValueError):
+        Composition.from_atomic_fractions_batch([13, 8], [[0.4, 0.6]], ["a", "b"])
+
+
 @pytest.mark.parametrize("z", [5, 26, 92])
 def test_from_pure(z):
     comp = Composition.from_pure(z)
@@ -45,6 +105,15 @@ def test_from_pure(z):
     assert comp.is_normalized()
 
 
+@pytest.mark.parametrize("element", [pyxray.Element(26), "Fe", "Iron"])
+def test_from_pure_element(element):
+    comp = Composition.from_pure(element)
+
+    assert comp.mass_fractions == {26: pytest.approx(1.0)}
+    assert comp.atomic_fractions == {26: pytest.approx(1.0)}
+    assert comp.formula == "Fe"
+
+
 @pytest.mark.parametrize("formula", ["Al2Na3B12", "Al2 Na3 B12", "Al2.0 Na3.0 B12.0"])
 def test_from_formula(formula):
     comp = Composition.from_formula(formula)
@@ -79,6 +148,58 @@ def test_from_formula_symbol(z):
     assert comp.formula == formula
 
 
+@pytest.mark.parametrize(
+    "formula, expected",
+    [
+        ("Al2O3", {"Al": 2, "O": 3}),
+        ("CH3COOH", {"C": 2, "H": 4, "O": 2}),
+        ("Ca3(PO4)2", {"Ca": 3, "P": 2, "O": 8}),
+        ("K4[Fe(CN)6]", {"K": 4, "Fe": 1, "C": 6, "N": 6}),
+        ("((CH3)3C)2O", {"C": 8, "H": 18, "O": 1}),
+        ("CuSO4\u00b75H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}),
+        ("CaSO4*0.5H2O", {"Ca": 1, "S": 1, "O": 4.5, "H": 1}),
+        ("CuSO4.5H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}),
+        ("Na2CO3.10H2O", {"Na": 2, "C": 1, "O": 13, "H": 20}),
+        ("Ca3(PO4)2.2(H2O)", {"Ca": 3, "P": 2, "O": 10, "H": 4}),
+        ("La0.7Sr0.3MnO3", {"La": 0.7, "Sr": 0.3, "Mn": 1, "O": 3}),
+        ("Fe1.5 Ni0.5", {"Fe": 1.5, "Ni": 0.5}),
+        ("Al2.0 Na3.0", {"Al": 2, "Na": 3}),
+        ("Fe0.5Ni.5", {"Fe": 0.5, "Ni": 0.5}),
+        (" Mg3 Si4 O10 (OH)2 ", {"Mg": 3, "Si": 4, "O": 12, "H": 2}),
+    ],
+)
+def test_parse_formula(formula, expected):
+    assert parse_formula(formula) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "formula", ["", "2", "Ca3(PO4", "Ca3PO4)2", "(H2O]", "H2O*", "H2O!", "h2o"]
+)
+def test_parse_formula_exception(formula):
+    with pytest.raises(ValueError):
+        parse_formula(formula)
+
+
+def test_chemical_formula_pattern():
+    matches = CHEMICAL_FORMULA_PATTERN.findall("Al2O3")
+    assert matches == [("Al", "2"), ("O", "3")]
+
+
+def test_convert_formula_to_atomic_fractions():
+    atomic_fractions = convert_formula_to_atomic_fractions("Ca3(PO4)2")
+    assert atomic_fractions == pytest.approx({20: 3 / 13, 15: 2 / 13, 8: 8 / 13})
+
+    # Cached result is not modified
+    atomic_fractions[20] = 1.0
+    assert convert_formula_to_atomic_fractions("Ca3(PO4)2")[20] == pytest.approx(3 / 13)
+
+
+def test_from_formula_hydrate():
+    comp = Composition.from_formula("CuSO4\u00b75H2O")
+    assert comp.atomic_fractions[1] == pytest.approx(10 / 21)
+    assert comp.atomic_fractions[29] == pytest.approx(1 / 21)
+
+
 def test_from_formula_exception():
     with pytest.raises(Exception):
         Composition.from_formula("Aq2 Na3 B12")
@@ -3,18 +3,23 @@
 
 # Standard library modules.
 import dataclasses
+import pickle
+import copy
 
 # Third party modules.
 import pytest
 
 # Local modules.
 from pyxray.descriptor import (
+    pack_quantum_numbers,
+    pack_quantum_numbers_mask,
     Element,
     AtomicShell,
     AtomicSubshell,
     Reference,
     XrayLine,
     XrayTransition,
+    NonRadiativeTransition,
     Language,
     Notation,
 )
@@ -63,6 +68,18 @@ def test_element_frozen(element):
         element.abc = 7
 
 
+def test_element_of(element):
+    assert Element.of(6) is Element.of(6)
+    assert Element.of(6) == element
+    assert not hasattr(Element.of(6), "__dict__")
+
+
+def test_element_pickle(element):
+    assert pickle.loads(pickle.dumps(element)) == element
+    assert pickle.loads(pickle.dumps(element)) is Element.of(6)
+    assert copy.deepcopy(Element.of(6)) is Element.of(6)
+
+
 @pytest.fixture
 def atomicshell():
     return AtomicShell(3)
@@ -154,6 +171,26 @@ def test_atomicsubshell_frozen(atomicsubshell):
         atomicsubshell.abc = 7
 
 
+def test_atomicsubshell_of(atomicsubshell):
+    assert AtomicSubshell.of(3, 0, 1) is AtomicSubshell.of(3, 0, 1)
+    assert AtomicSubshell.of(AtomicShell(3), 0, 1) is AtomicSubshell.of(3, 0, 1)
+    assert AtomicSubshell.of(3, 0, 1) == atomicsubshell
+    assert atomicsubshell.atomic_shell is AtomicShell.of(3)
+
+
+def test_atomicsubshell_pickle(atomicsubshell):
+    assert pickle.loads(pickle.dumps(atomicsubshell)) is AtomicSubshell.of(3, 0, 1)
+
+
+def test_atomicsubshell_key(atomicsubshell):
+    assert atomicsubshell.key == 0x040102
+    assert atomicsubshell.key == AtomicSubshell(3, 0, 1).key
+    assert atomicsubshell.key != AtomicSubshell(3, 1, 1).key
+    assert AtomicSubshell(3, None, None).key == 0x040000
+    assert AtomicSubshell(3, None, None).matches(atomicsubshell)
+    assert not atomicsubshell.matches(AtomicSubshell(3, None, None))
+
+
 @pytest.fixture(
     params=[
         (AtomicSubshell(2, 0, 1), AtomicSubshell(1, 0, 1)),
@@ -211,6 +248,26 @@ def test_xraytransition_frozen(xraytransition):
         xraytransition.abc = 7
 
 
+def test_xraytransition_of(xraytransition):
+    transition = XrayTransition.of(2, 0, 1, 1, 0, 1)
+    assert XrayTransition.of((2, 0, 1), (1, 0, 1)) is transition
+    assert XrayTransition.of([2, 0, 1], AtomicSubshell(1, 0, 1)) is transition
+    assert transition == xraytransition
+    assert not hasattr(transition, "__dict__")
+
+
+def test_xraytransition_subshells(xraytransition):
+    assert xraytransition.source_subshell is AtomicSubshell.of(2, 0, 1)
+    assert xraytransition.destination_subshell is xraytransition.destination_subshell
+
+
+def test_xraytransition_pickle(xraytransition):
+    other = pickle.loads(pickle.dumps(xraytransition))
+    assert other == xraytransition
+    assert hash(other) == hash(xraytransition)
+    assert other is XrayTransition.of(2, 0, 1, 1, 0, 1)
+
+
 @pytest.fixture
 def xraytransitionset():
     return XrayTransition(
@@ -234,6 +291,82 @@ def test_xraytransitionset_repr(xraytransitionset):
     )
 
 
+def test_xraytransitionset_of(xraytransitionset):
+    assert XrayTransition.of(2, 1, None, 1, 0, 1) == xraytransitionset
+    assert pickle.loads(pickle.dumps(xraytransitionset)) == xraytransitionset
+
+
+def test_xraytransitionset_key(xraytransitionset):
+    l3k = XrayTransition(2, 1, 3, 1, 0, 1)
+    assert xraytransitionset.key == 0x030200020102
+    assert xraytransitionset.key_mask == 0xFFFF00FFFFFF
+    assert l3k.key == (l3k.source_subshell.key << 24) | l3k.destination_subshell.key
+    assert xraytransitionset.matches(l3k)
+    assert xraytransitionset.matches(XrayTransition(2, 1, 1, 1, 0, 1))
+    assert not xraytransitionset.matches(XrayTransition(2, 0, 1, 1, 0, 1))
+    assert not l3k.matches(xraytransitionset)
+
+
+@pytest.fixture
+def nonradiativetransition():
+    return NonRadiativeTransition((2, 1, 1), (1, 0, 1), (2, 1, 3))  # K-L2L3
+
+
+def test_nonradiativetransition(nonradiativetransition):
+    assert nonradiativetransition.source_subshell == AtomicSubshell(2, 1, 1)
+    assert nonradiativetransition.destination_subshell == AtomicSubshell(1, 0, 1)
+    assert nonradiativetransition.secondary_destination_subshell == AtomicSubshell(
+        2, 1, 3
+    )
+    assert not nonradiativetransition.is_coster_kronig
+
+
+def test_nonradiativetransition_eq(nonradiativetransition):
+    assert nonradiativetransition == NonRadiativeTransition(2, 1, 1, 1, 0, 1, 2, 1, 3)
+    assert nonradiativetransition == NonRadiativeTransition(
+        AtomicSubshell(2, 1, 1), AtomicSubshell(1, 0, 1), AtomicSubshell(2, 1, 3)
+    )
+    assert nonradiativetransition != NonRadiativeTransition(
+        (2, 1, 3), (1, 0, 1), (2, 1, 1)
+    )
+
+
+def test_nonradiativetransition_hash(nonradiativetransition):
+    assert hash(nonradiativetransition) == hash(
+        NonRadiativeTransition(2, 1, 1, 1, 0, 1, 2, 1, 3)
+    )
+
+
+def test_nonradiativetransition_repr(nonradiativetransition):
+    assert (
+        repr(nonradiativetransition)
+        == "NonRadiativeTransition([n=2, l=1, j=0.5] -> [n=1, l=0, j=0.5], [n=2, l=1, j=1.5])"
+    )
+
+
+def test_nonradiativetransition_coster_kronig():
+    assert NonRadiativeTransition((2, 1, 3), (2, 0, 1), (3, 0, 1)).is_coster_kronig
+
+
+@pytest.mark.parametrize(
+    "args", [((2, 1, 1), (1, 0, 1)), (2, 1, 1, 1, 0, 1), ((2, 1, None), (1, 0, 1), 7)]
+)
+def test_nonradiativetransition_invalid(args):
+    with pytest.raises(ValueError):
+        NonRadiativeTransition(*args)
+
+
+def test_nonradiativetransition_frozen(nonradiativetransition):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        nonradiativetransition.source_principal_quantum_number = 3
+
+
+def test_nonradiativetransition_pickle(nonradiativetransition):
+    other = pickle.loads(pickle.dumps(nonradiativetransition))
+    assert other == nonradiativetransition
+    assert other is NonRadiativeTransition.of(2, 1, 1, 1, 0, 1, 2, 1, 3)
+
+
 @pytest.fixture
 def xrayline():
     return XrayLine(
@@ -410,3 +543,15 @@ def test_reference_frozen(reference):
 
     with pytest.raises(dataclasses.FrozenInstanceError):
         reference.abc = 7
+
+
+def test_pack_quantum_numbers():
+    assert pack_quantum_numbers([]) == 0
+    assert pack_quantum_numbers([2, None, 0]) == 0x030001
+    assert pack_quantum_numbers_mask([2, None, 0]) == 0xFF00FF
+
+    with pytest.raises(ValueError):
+        pack_quantum_numbers([-1])
+
+    with pytest.raises(ValueError):
+        pack_quantum_numbers([255])
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import numpy
+import pytest
+
+# Local modules.
+from pyxray.elementtable import ElementTable
+from pyxray.base import NotFound
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def table():
+    return ElementTable({8: 15.999, 26: 55.845}, {8: "O", 26: "Fe", 92: "U"})
+
+
+def test_table(table):
+    assert table.atomic_weight(26) == pytest.approx(55.845)
+    assert table.atomic_weight(numpy.int64(8)) == pytest.approx(15.999)
+    assert table.symbol(92) == "U"
+    assert table.atomic_number("Fe") == 26
+    assert repr(table) == "<ElementTable(3 elements)>"
+
+
+def test_table_arrays(table):
+    assert table.atomic_weights.shape == (119,)
+    assert table.atomic_weights[[8, 26]] == pytest.approx([15.999, 55.845])
+    assert numpy.isnan(table.atomic_weights[92])
+    assert table.symbols[26] == "Fe"
+    assert table.symbols[1] == ""
+
+    with pytest.raises(ValueError):
+        table.atomic_weights[26] = 1.0
+
+
+@pytest.mark.parametrize(
+    "method, arg",
+    [
+        ("atomic_weight", 92),
+        ("atomic_weight", 0),
+        ("atomic_weight", [26]),
+        ("symbol", 1),
+        ("atomic_number", "FE"),
+    ],
+)
+def test_table_notfound(table, method, arg):
+    with pytest.raises(NotFound):
+        getattr(table, method)(arg)
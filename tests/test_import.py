@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import sys
+import subprocess
+
+# Third party modules.
+import pytest
+
+# Local modules.
+import pyxray
+import pyxray.data
+from pyxray.data import _LazyDatabase, _EmptyDatabase
+from pyxray.base import NotFound
+
+# Globals and constants variables.
+HEAVY_MODULES = ["sqlalchemy", "numpy", "tabulate"]
+
+
+def parse_importtime(stderr):
+    """
+    Returns a :class:`dict` of the modules imported and their cumulative
+    import time (in us), from the output of ``python -X importtime``.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _self, cumulative, name = line[len("import time:") :].split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:  # Header
+            pass
+
+    return times
+
+
+def test_import_importtime():
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pyxray"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = parse_importtime(process.stderr)
+
+    assert "pyxray" in times
+    for name in HEAVY_MODULES:
+        assert name not in times, "{} imported with pyxray ({:.1f} ms)".format(
+            name, times["pyxray"] / 1e3
+        )
+
+
+def test_import_no_database():
+    code = "import sys, pyxray; pyxray.xray_transition_energy_eV; print(sorted(sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    for name in HEAVY_MODULES:
+        assert "'{}'".format(name) not in process.stdout
+    assert "'pyxray.sql.data'" not in process.stdout
+
+
+class CountingFactory:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return _EmptyDatabase()
+
+
+@pytest.fixture
+def factory():
+    previous_database = pyxray.data.database
+    factory = CountingFactory()
+
+    try:
+        pyxray.data.set_database(_LazyDatabase(factory))
+        yield factory
+    finally:
+        pyxray.data.set_database(previous_database)
+
+
+def test_lazy_database(factory):
+    method = pyxray.element_symbol
+    assert factory.count == 0
+    assert method.__doc__ == pyxray.base._DatabaseMixin.element_symbol.__doc__
+
+    with pytest.raises(NotFound):
+        method(118)
+    assert factory.count == 1
+
+    # Proxy is replaced by the database
+    assert isinstance(pyxray.data.database, _EmptyDatabase)
+    assert isinstance(pyxray.database, _EmptyDatabase)
+    assert pyxray.element_symbol.__self__ is pyxray.database
+
+    with pytest.raises(NotFound):
+        method(118)
+    assert factory.count == 1
+
+
+def test_lazy_database_replaced(factory):
+    lazy_database = pyxray.data.database
+    database = _EmptyDatabase()
+    pyxray.data.set_database(database)
+
+    with pytest.raises(NotFound):
+        lazy_database.element_symbol(118)
+    assert factory.count == 1
+
+    # Proxy does not replace a database which was set afterwards
+    assert pyxray.data.database is database
+
+
+def test_lazy_database_missing():
+    def factory():
+        raise RuntimeError("Cannot find SQL database")
+
+    database = _LazyDatabase(factory)
+    assert isinstance(database._load(), _EmptyDatabase)
+
+
+class FailingLock:
+    def __enter__(self):
+        raise AssertionError("Lock taken")
+
+    def __exit__(self, *args):
+        pass
+
+
+def test_lazy_database_loaded_without_lock():
+    database = _LazyDatabase(_EmptyDatabase)
+    loaded = database._load()
+
+    # Once loaded, the database is returned without taking the lock
+    database._lock = FailingLock()
+    assert database._load() is loaded
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import numpy
+import pytest
+
+# Local modules.
+from pyxray.lineindex import XrayLineIndex, resolve_atomic_numbers
+from pyxray.descriptor import Element, XrayLine, XrayTransition
+
+# Globals and constants variables.
+KL3 = XrayTransition((2, 1, 3), (1, 0, 1))
+KL2 = XrayTransition((2, 1, 1), (1, 0, 1))
+L3M5 = XrayTransition((3, 2, 5), (2, 1, 3))
+KL23 = XrayTransition((2, 1, None), (1, 0, 1))
+
+
+@pytest.fixture
+def index():
+    return XrayLineIndex(
+        [
+            XrayLine(74, L3M5, "W L3-M5", "W La1", 8398.0, 0.07, 1.0),
+            XrayLine(14, KL3, "Si K-L3", "Si Ka1", 1740.0, 0.03, 1.0),
+            XrayLine(14, KL2, "Si K-L2", "Si Ka2", 1739.4, 0.015, 0.5),
+            XrayLine(26, KL3, "Fe K-L3", "Fe Ka1", 6404.0, None, 1.0),
+        ]
+    )
+
+
+def test_index(index):
+    assert len(index) == 4
+    assert [xrayline.iupac for xrayline in index] == [
+        "Si K-L2",
+        "Si K-L3",
+        "Fe K-L3",
+        "W L3-M5",
+    ]
+    assert index.energies_eV == pytest.approx([1739.4, 1740.0, 6404.0, 8398.0])
+    assert list(index.atomic_numbers) == [14, 14, 26, 74]
+    assert index.probabilities == pytest.approx(
+        [0.015, 0.03, numpy.nan, 0.07], nan_ok=True
+    )
+    assert index.relative_weights == pytest.approx([0.5, 1.0, 1.0, 1.0])
+
+
+@pytest.mark.parametrize(
+    "emin_eV, emax_eV, expected",
+    [
+        (1739.4, 1740.0, (0, 2)),
+        (1739.5, 1740.0, (1, 2)),
+        (0.0, 1000.0, (0, 0)),
+        (9000.0, 10000.0, (4, 4)),
+        (6000.0, 5000.0, (2, 2)),
+    ],
+)
+def test_index_bounds(index, emin_eV, emax_eV, expected):
+    assert index.bounds(emin_eV, emax_eV) == expected
+
+
+def test_index_find(index):
+    assert index.find(1700.0, 6500.0) == [
+        XrayLine(14, KL2, "", "", 0.0),
+        XrayLine(14, KL3, "", "", 0.0),
+        XrayLine(26, KL3, "", "", 0.0),
+    ]
+    assert index.find(1700.0, 9000.0, [26, 74]) == [
+        XrayLine(26, KL3, "", "", 0.0),
+        XrayLine(74, L3M5, "", "", 0.0),
+    ]
+    assert index.find(1700.0, 9000.0, [], 0.0) == []
+
+
+def test_index_find_min_probability(index):
+    # Lines without probability are excluded
+    assert index.find(1700.0, 9000.0, min_probability=0.02) == [
+        XrayLine(14, KL3, "", "", 0.0),
+        XrayLine(74, L3M5, "", "", 0.0),
+    ]
+
+
+def test_index_transition_sets():
+    index = XrayLineIndex(
+        [
+            XrayLine(14, KL3, "Si K-L3", "Si Ka1", 1740.0),
+            XrayLine(14, KL23, "Si K-L2,3", "Si Ka", 1739.8),
+        ]
+    )
+    assert list(index.transition_sets) == [True, False]
+
+
+def test_index_nearest(index):
+    candidates = index.nearest([1740.1, 6400.0, 100.0, 8000.0], 500.0, k=2)
+    assert candidates.tolist() == [[1, 0], [2, -1], [-1, -1], [3, -1]]
+
+
+def test_index_nearest_atomic_numbers(index):
+    candidates = index.nearest([1740.1, 6400.0], 7000.0, [26, 74], k=3)
+    assert candidates.tolist() == [[2, 3, -1], [2, 3, -1]]
+
+
+def test_index_nearest_relative_weight():
+    # Same distance: the line with the highest relative weight comes first
+    index = XrayLineIndex(
+        [
+            XrayLine(14, KL2, "Si K-L2", "Si Ka2", 1000.0, None, 0.5),
+            XrayLine(26, KL3, "Fe K-L3", "Fe Ka1", 1000.0, None, 1.0),
+            XrayLine(14, KL23, "Si K-L2,3", "Si Ka", 1000.0, None, 1.0),
+        ]
+    )
+    candidates = index.nearest([1000.0], 1.0, k=3)
+    assert [index.xraylines[i].atomic_number for i in candidates[0] if i >= 0] == [
+        26,
+        14,
+    ]
+
+
+@pytest.mark.parametrize("k, expected", [(1, [0.9]), (2, [0.9, 0.2])])
+def test_index_nearest_tied_energies(k, expected):
+    # Lines tied with the k-th nearest line are beyond the k lines on each side
+    index = XrayLineIndex(
+        [
+            XrayLine(14, KL3, "", "", 1000.0, None, 0.1),
+            XrayLine(15, KL3, "", "", 1000.0, None, 0.2),
+            XrayLine(16, KL3, "", "", 1000.0, None, 0.9),
+        ]
+    )
+    candidates = index.nearest([1000.0], 5.0, k=k)
+    assert index.relative_weights[candidates[0]] == pytest.approx(expected)
+
+
+def test_index_nearest_brute_force_tied_energies():
+    random = numpy.random.default_rng(1)
+    energies = random.integers(0, 100, 300).astype(float)
+    weights = random.uniform(0.0, 1.0, 300)
+    index = XrayLineIndex(
+        [
+            XrayLine(1 + i % 100, KL3, "", "", energy, None, weight)
+            for i, (energy, weight) in enumerate(zip(energies, weights))
+        ]
+    )
+
+    peaks = random.integers(-5, 105, 50).astype(float)
+    candidates = index.nearest(peaks, 2.0, k=3)
+
+    for peak, positions in zip(peaks, candidates):
+        distances = numpy.abs(index.energies_eV - peak)
+        order = numpy.lexsort((-index.relative_weights, distances))[:3]
+        expected = [i for i in order if distances[i] <= 2.0]
+        assert positions[positions >= 0].tolist() == expected
+
+
+def test_index_nearest_brute_force():
+    random = numpy.random.default_rng(0)
+    energies = random.uniform(0.0, 1000.0, 300)
+    weights = random.choice([0.1, 0.5, 1.0], 300)
+    index = XrayLineIndex(
+        [
+            XrayLine(1 + i % 100, KL3, "", "", energy, None, weight)
+            for i, (energy, weight) in enumerate(zip(energies, weights))
+        ]
+    )
+
+    peaks = random.uniform(-10.0, 1010.0, 100)
+    candidates = index.nearest(peaks, 5.0, k=4)
+
+    for peak, positions in zip(peaks, candidates):
+        distances = numpy.abs(index.energies_eV - peak)
+        order = numpy.lexsort((-index.relative_weights, distances))[:4]
+        expected = [i for i in order if distances[i] <= 5.0]
+        assert positions[positions >= 0].tolist() == expected
+
+
+def test_index_empty():
+    index = XrayLineIndex([])
+    assert len(index) == 0
+    assert index.energies_eV.shape == (0,)
+    assert index.find(0.0, 1e6) == []
+    assert index.nearest([1.0, 2.0], 1.0, k=3).tolist() == [[-1] * 3] * 2
+
+
+class SymbolDatabase:
+    def element_atomic_number(self, element):
+        return {"Si": 14, "iron": 26}[element]
+
+
+def test_resolve_atomic_numbers():
+    elements = [14, numpy.int64(74), Element(26), "Si", "iron"]
+    assert resolve_atomic_numbers(SymbolDatabase(), elements) == [14, 74, 26, 14, 26]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import numpy
+import pytest
+
+# Local modules.
+from pyxray.overlap import (
+    ConstantResolution,
+    EdsResolution,
+    find_overlapping_pairs,
+    find_overlaps,
+)
+from pyxray.lineindex import XrayLineIndex
+from pyxray.composition import Composition
+from pyxray.descriptor import XrayLine, XrayTransition
+
+# Globals and constants variables.
+KL3 = XrayTransition((2, 1, 3), (1, 0, 1))
+KL2 = XrayTransition((2, 1, 1), (1, 0, 1))
+KL23 = XrayTransition((2, 1, None), (1, 0, 1))
+M5N7 = XrayTransition((4, 3, 7), (3, 2, 5))
+L3M5 = XrayTransition((3, 2, 5), (2, 1, 3))
+
+
+class LineDatabase:
+    def __init__(self):
+        self.index = XrayLineIndex(
+            [
+                XrayLine(16, KL3, "S K-L3", "S Ka1", 2307.8, 0.05, 1.0),
+                XrayLine(16, KL2, "S K-L2", "S Ka2", 2306.6, 0.025, 0.5),
+                XrayLine(16, KL23, "S K-L2,3", "S Ka", 2307.4, 0.075, 1.0),
+                XrayLine(82, M5N7, "Pb M5-N7", "Pb Ma1", 2345.5, 0.03, 1.0),
+                XrayLine(82, L3M5, "Pb L3-M5", "Pb La1", 10551.5, 0.1, 1.0),
+                XrayLine(42, L3M5, "Mo L3-M5", "Mo La1", 2293.2, 0.02, None),
+            ]
+        )
+
+    def xray_line_index(self, reference=None):
+        return self.index
+
+    def element_atomic_number(self, element):
+        return {"S": 16, "Pb": 82, "Mo": 42}[element]
+
+
+@pytest.fixture
+def database():
+    return LineDatabase()
+
+
+def test_constant_resolution():
+    resolution = ConstantResolution(10.0)
+    assert resolution([1000.0, 2000.0]) == pytest.approx([10.0, 10.0])
+
+
+def test_eds_resolution():
+    resolution = EdsResolution(130.0)
+    fwhms = resolution([5898.7, 1000.0, 10000.0])
+    assert fwhms[0] == pytest.approx(130.0)
+    assert fwhms[1] < fwhms[0] < fwhms[2]
+
+    # Minimum at low energies
+    assert EdsResolution(70.0)([10.0]) == pytest.approx([30.0])
+
+
+def test_find_overlapping_pairs():
+    random = numpy.random.default_rng(0)
+    energies = numpy.sort(random.uniform(0.0, 1000.0, 200))
+    fwhms = random.uniform(1.0, 20.0, 200)
+
+    firsts, seconds = find_overlapping_pairs(energies, fwhms, 1.5)
+
+    expected = set()
+    for j in range(len(energies)):
+        for i in range(j):
+            if energies[j] - energies[i] <= 1.5 * fwhms[j]:
+                expected.add((i, j))
+
+    assert set(zip(firsts.tolist(), seconds.tolist())) == expected
+    assert len(firsts) == len(expected)
+
+
+def test_find_overlapping_pairs_empty():
+    firsts, seconds = find_overlapping_pairs([], [], 1.0)
+    assert firsts.shape == seconds.shape == (0,)
+
+
+def test_find_overlaps(database):
+    overlaps = find_overlaps(["S", "Pb"], ConstantResolution(50.0), database=database)
+
+    # Transition sets and pairs of the same element are excluded
+    assert [(o.xrayline1.iupac, o.xrayline2.iupac) for o in overlaps] == [
+        ("S K-L2", "Pb M5-N7"),
+        ("S K-L3", "Pb M5-N7"),
+    ]
+
+    overlap = overlaps[1]
+    assert overlap.separation_eV == pytest.approx(37.7)
+    assert overlap.fwhm_eV == pytest.approx(50.0)
+    assert overlap.weight == pytest.approx(1.0)
+    assert overlaps.weights == pytest.approx([0.5, 1.0])
+
+
+def test_find_overlaps_nfwhm(database):
+    resolution = ConstantResolution(50.0)
+    assert len(find_overlaps(["S", "Pb"], resolution, 0.5, database=database)) == 0
+    assert len(find_overlaps(["S", "Pb"], resolution, 0.76, database=database)) == 1
+
+
+def test_find_overlaps_same_element(database):
+    overlaps = find_overlaps(
+        [16], ConstantResolution(50.0), same_element=True, database=database
+    )
+    assert [(o.xrayline1.iupac, o.xrayline2.iupac) for o in overlaps] == [
+        ("S K-L2", "S K-L3")
+    ]
+
+
+def test_find_overlaps_composition(database):
+    composition = Composition.from_mass_fractions({16: 0.2, 82: 0.8}, "PbS")
+    overlaps = find_overlaps(composition, ConstantResolution(50.0), database=database)
+    assert overlaps.weights == pytest.approx([0.5 * 0.2 * 0.8, 0.2 * 0.8])
+
+
+def test_find_overlaps_min_weight(database):
+    resolution = ConstantResolution(60.0)
+
+    # Mo L3-M5 has no relative weight
+    overlaps = find_overlaps(None, resolution, database=database)
+    assert len(overlaps) == 5
+    assert sorted(overlaps.weights) == pytest.approx([0.0, 0.0, 0.0, 0.5, 1.0])
+
+    overlaps = find_overlaps(None, resolution, min_weight=0.6, database=database)
+    assert len(overlaps) == 1
+
+
+def test_find_overlaps_unknown_element(database):
+    overlaps = find_overlaps([1], ConstantResolution(50.0), database=database)
+    assert len(overlaps) == 0
+    assert list(overlaps) == []